@@ -0,0 +1,47 @@
+"""Cold archive command.
+
+Moves the attendance, results and settled fees of academic sessions that
+ended before a date to compressed columnar files (see
+``app.services.cold_archive``). Run from the backend directory, e.g. from
+cron after the school year closes:
+
+    python -m app.archive --before 2025-04-01 [--dry-run]
+
+Prints the archive report as JSON.
+"""
+import argparse
+import json
+import logging
+import sys
+from datetime import date
+
+from app.core.database import SessionLocal
+from app.services.cold_archive import archive_history
+
+logger = logging.getLogger("app.archive")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--before", type=date.fromisoformat, required=True,
+        help="Archive sessions whose last day is before this date (YYYY-MM-DD)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only count the rows")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    db = SessionLocal()
+    try:
+        report = archive_history(db, args.before, dry_run=args.dry_run)
+    except (RuntimeError, ValueError) as error:
+        logger.error("%s", error)
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Application boot helpers, including the opt-in lightweight boot mode.
+
+In the default mode every router is imported and the database is prepared
+before the server accepts connections. With ``LIGHTWEIGHT_BOOT`` the
+process only imports what ``/health`` needs, binds the port, and then
+imports the routers and prepares the database in a background thread.
+``LazyBootMiddleware`` holds every other request until that has finished.
+"""
+import importlib
+import logging
+import threading
+from typing import Callable, Iterable, Optional
+
+import anyio
+
+logger = logging.getLogger(__name__)
+
+ROUTER_MODULES = (
+    "app.routes.auth",
+    "app.routes.admin",
+    "app.routes.attendance",
+    "app.routes.calendar",
+    "app.routes.sessions",
+    "app.routes.fees",
+    "app.routes.dashboard",
+    "app.routes.results",
+    "app.routes.pdfs",
+    "app.routes.jobs",
+    "app.routes.student",
+    "app.routes.public",
+    "app.routes.test",
+)
+
+# Paths answered without waiting for the background boot.
+EAGER_PATHS = frozenset({"/health", "/ready", "/metrics"})
+
+
+def import_routers(modules: Iterable[str] = ROUTER_MODULES) -> list:
+    """
+    Import router modules.
+
+    Args:
+        modules: Dotted module paths each defining ``router``
+
+    Returns:
+        List of APIRouter instances in registration order
+    """
+    return [importlib.import_module(module).router for module in modules]
+
+
+def include_routers(app, modules: Iterable[str] = ROUTER_MODULES) -> None:
+    """
+    Import router modules and register them on the application.
+
+    Args:
+        app: FastAPI application
+        modules: Dotted module paths each defining ``router``
+    """
+    for router in import_routers(modules):
+        app.include_router(router)
+    # Routes changed after startup; rebuild the OpenAPI document on demand
+    app.openapi_schema = None
+
+
+class BackgroundBoot:
+    """
+    Runs the deferred part of startup in a daemon thread.
+
+    ``task`` prepares the database; router modules are imported in the same
+    thread so the event loop stays free to answer ``/health``. Registering
+    the routers on the app is left to the first request, on the event loop.
+    """
+
+    def __init__(self, task: Callable[[], None]):
+        self.task = task
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.routers: list = []
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="background-boot", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            self.routers = import_routers()
+            self.task()
+        except BaseException as exc:  # surfaced on the first request
+            logger.exception("Background boot failed")
+            self.error = exc
+        finally:
+            self.done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self.done.wait(timeout)
+
+
+class LazyBootMiddleware:
+    """
+    ASGI middleware that completes a lightweight boot on the first request.
+
+    Requests for ``EAGER_PATHS`` pass straight through. Any other request
+    waits for the ``BackgroundBoot`` started by the lifespan, then the
+    imported routers are registered once and the request proceeds.
+    """
+
+    def __init__(self, app, fastapi_app, boot_ref: Callable[[], Optional[BackgroundBoot]]):
+        self.app = app
+        self.fastapi_app = fastapi_app
+        self.boot_ref = boot_ref
+        self._ready = False
+        self._lock = anyio.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if self._ready or scope["type"] != "http" or scope["path"] in EAGER_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        async with self._lock:
+            if not self._ready:
+                await self._finish_boot()
+        await self.app(scope, receive, send)
+
+    async def _finish_boot(self) -> None:
+        boot = self.boot_ref()
+        if boot is None:
+            raise RuntimeError("Lightweight boot requested but the lifespan did not start it")
+
+        if not boot.done.is_set():
+            await anyio.to_thread.run_sync(boot.wait)
+        if boot.error is not None:
+            raise RuntimeError("Application failed to boot") from boot.error
+
+        for router in boot.routers:
+            self.fastapi_app.include_router(router)
+        self.fastapi_app.openapi_schema = None
+        self._ready = True
@@ -0,0 +1,301 @@
+"""Caching utilities with pluggable backends.
+
+Services create their caches with ``get_cache(namespace)`` and call the
+same small API whatever the backend:
+
+- ``local``: an in-process LRU per namespace. Right for a single worker.
+- ``redis``: a Redis-compatible server shared by every worker process, so
+  an invalidation in one worker is seen by all of them.
+- ``none``: caching disabled; every lookup misses.
+
+``CACHE_BACKEND=auto`` (the default) picks ``redis`` when ``CACHE_URL`` is
+set, ``local`` for a single worker and ``none`` when ``WEB_CONCURRENCY``
+says several workers share the load without a shared cache, since
+per-worker caches would diverge after an invalidation. Job workers
+(``python -m app.worker``) change data from another process, so they only
+start with a shared (``redis``) or disabled (``none``) cache.
+
+Counters (``incr``/``counter``) back versioned keys: bumping a version
+invalidates every entry stored under the old one.
+"""
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Small thread-safe least-recently-used cache.
+
+    Intended for hot lookups that are cheap to recompute but frequent,
+    such as identifier -> primary key maps. Callers are responsible for
+    invalidating entries when the underlying rows change.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value (marking it recently used) or None."""
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend:
+    """Interface shared by all cache backends."""
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: Hashable, value: Any) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: Hashable) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def incr(self, key: Hashable) -> int:
+        """Atomically increment a counter and return its new value."""
+        raise NotImplementedError
+
+    def counter(self, key: Hashable) -> int:
+        """Current value of a counter (0 if never incremented)."""
+        raise NotImplementedError
+
+
+class LocalCacheBackend(CacheBackend):
+    """In-process LRU with optional expiry, for a single worker."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.ttl = ttl
+        self._entries = LRUCache(maxsize=maxsize)
+        self._counters: Dict[Hashable, int] = {}
+        self._counters_lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            self._entries.delete(key)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._entries.set(key, (expires_at, value))
+
+    def delete(self, key: Hashable) -> None:
+        self._entries.delete(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        with self._counters_lock:
+            self._counters.clear()
+
+    def incr(self, key: Hashable) -> int:
+        with self._counters_lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def counter(self, key: Hashable) -> int:
+        with self._counters_lock:
+            return self._counters.get(key, 0)
+
+
+class NullCacheBackend(CacheBackend):
+    """Backend that stores nothing; every lookup misses."""
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        pass
+
+    def delete(self, key: Hashable) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def incr(self, key: Hashable) -> int:
+        return 0
+
+    def counter(self, key: Hashable) -> int:
+        return 0
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared by all workers through a Redis-compatible server.
+
+    Values are stored as JSON, so tuples come back as lists. Entries expire
+    after ``ttl`` seconds, which also bounds staleness if an invalidation
+    is lost while the server is unreachable. Server errors are logged and
+    treated as cache misses; they never fail the request.
+    """
+
+    def __init__(self, client, namespace: str, ttl: Optional[float] = None):
+        self.client = client
+        self.prefix = f"sms:{namespace}:"
+        self.ttl = ttl
+
+    def _key(self, key: Hashable) -> str:
+        if isinstance(key, tuple):
+            key = ":".join(str(part) for part in key)
+        return f"{self.prefix}{key}"
+
+    def _counter_key(self, key: Hashable) -> str:
+        return self._key(("counter",) + (key if isinstance(key, tuple) else (key,)))
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        try:
+            raw = self.client.get(self._key(key))
+        except Exception:
+            logger.warning("Cache get failed for %s", self._key(key), exc_info=True)
+            return None
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        try:
+            self.client.set(self._key(key), json.dumps(value), ex=int(self.ttl) if self.ttl else None)
+        except Exception:
+            logger.warning("Cache set failed for %s", self._key(key), exc_info=True)
+
+    def delete(self, key: Hashable) -> None:
+        try:
+            self.client.delete(self._key(key))
+        except Exception:
+            logger.warning("Cache delete failed for %s", self._key(key), exc_info=True)
+
+    def clear(self) -> None:
+        try:
+            keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+            if keys:
+                self.client.delete(*keys)
+        except Exception:
+            logger.warning("Cache clear failed for %s*", self.prefix, exc_info=True)
+
+    def incr(self, key: Hashable) -> int:
+        try:
+            return int(self.client.incr(self._counter_key(key)))
+        except Exception:
+            logger.warning("Cache incr failed for %s", self._counter_key(key), exc_info=True)
+            return 0
+
+    def counter(self, key: Hashable) -> int:
+        try:
+            raw = self.client.get(self._counter_key(key))
+        except Exception:
+            logger.warning("Cache counter read failed for %s", self._counter_key(key), exc_info=True)
+            return 0
+        return int(raw) if raw is not None else 0
+
+
+_redis_client = None
+_redis_lock = Lock()
+
+
+def _get_redis_client(url: str):
+    global _redis_client
+    with _redis_lock:
+        if _redis_client is None:
+            try:
+                import redis
+            except ImportError as exc:
+                raise RuntimeError("CACHE_BACKEND=redis requires the redis package") from exc
+            _redis_client = redis.Redis.from_url(
+                url,
+                socket_timeout=0.25,
+                socket_connect_timeout=0.25,
+            )
+        return _redis_client
+
+
+def resolve_backend_name(backend: str, cache_url: Optional[str], workers: int) -> str:
+    """
+    Resolve the configured cache backend name.
+
+    Args:
+        backend: CACHE_BACKEND setting (auto, local, redis or none)
+        cache_url: CACHE_URL setting
+        workers: Number of worker processes serving the app
+
+    Returns:
+        One of ``local``, ``redis`` or ``none``
+    """
+    backend = backend.lower()
+    if backend != "auto":
+        return backend
+    if cache_url:
+        return "redis"
+    return "local" if workers <= 1 else "none"
+
+
+def configured_backend_name() -> str:
+    """Backend name this process resolves from settings and WEB_CONCURRENCY."""
+    from app.core.config import settings
+
+    workers = int(os.getenv("WEB_CONCURRENCY", "1") or 1)
+    return resolve_backend_name(settings.CACHE_BACKEND, settings.CACHE_URL, workers)
+
+
+def get_cache(namespace: str, maxsize: int = 1024) -> CacheBackend:
+    """
+    Create the cache for a namespace using the configured backend.
+
+    Args:
+        namespace: Name of the cache, used to prefix shared keys
+        maxsize: Entry limit for the in-process backend
+
+    Returns:
+        CacheBackend instance
+    """
+    from app.core.config import settings
+
+    backend = configured_backend_name()
+    ttl = settings.CACHE_TTL_SECONDS or None
+
+    if backend == "redis":
+        if not settings.CACHE_URL:
+            raise RuntimeError("CACHE_BACKEND=redis requires CACHE_URL")
+        return RedisCacheBackend(_get_redis_client(settings.CACHE_URL), namespace, ttl=ttl)
+    if backend == "none":
+        return NullCacheBackend()
+    if backend == "local":
+        return LocalCacheBackend(maxsize=maxsize, ttl=ttl)
+    raise RuntimeError(f"Unknown CACHE_BACKEND {settings.CACHE_BACKEND!r}")
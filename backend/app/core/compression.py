@@ -0,0 +1,203 @@
+"""Response compression and conditional GET middleware.
+
+JSON and text responses are buffered, tagged with a weak ETag computed
+from a hash of the payload (GET only) and compressed with brotli or gzip
+when the client accepts it and the body is at least ``minimum_size``
+bytes. A request whose ``If-None-Match`` matches the ETag gets an empty
+304 instead of the payload.
+
+Brotli is optional: it is used only when the ``brotli`` package is
+installed. File downloads and other non-text responses pass through
+unbuffered, as do HEAD responses: their body is empty, so neither its
+hash nor its length describes the GET representation.
+"""
+import gzip
+import hashlib
+from typing import List, Optional, Tuple
+
+import anyio
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (b"application/json", b"text/")
+
+# Bodies larger than this are compressed in a worker thread so a whole
+# school's export doesn't stall the event loop.
+THREAD_THRESHOLD = 256 * 1024
+
+# Headers that describe the uncompressed body and must not reach a 304.
+_ENTITY_HEADERS = {b"content-length", b"content-type", b"content-encoding"}
+
+
+def weak_etag(body: bytes) -> str:
+    """
+    Compute a weak ETag for a response body.
+
+    Weak because the same tag is served for the gzip, brotli and identity
+    encodings of the payload.
+
+    Args:
+        body: Uncompressed response body
+
+    Returns:
+        ETag header value, e.g. ``W/"5d41402abc4b2a76"``
+    """
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware adding weak ETags, 304s and gzip/brotli compression.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        etag: bool = True,
+        compress: bool = True,
+    ):
+        self.app = app
+        self.compress = compress
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.etag = etag
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope.get("headers", []))
+        accepted = _accepted_encodings(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if_none_match = request_headers.get(b"if-none-match", b"").decode("latin-1")
+        conditional = self.etag and scope["method"] == "GET"
+
+        start_message: Optional[dict] = None
+        chunks: List[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                content_type = _header(headers, b"content-type") or b""
+                if _header(headers, b"content-encoding") or not content_type.startswith(COMPRESSIBLE_TYPES):
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                await self._send_buffered(
+                    send, start_message, b"".join(chunks), accepted, if_none_match, conditional
+                )
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_buffered(
+        self,
+        send,
+        start_message: dict,
+        body: bytes,
+        accepted: set,
+        if_none_match: str,
+        conditional: bool,
+    ) -> None:
+        status = start_message["status"]
+        headers = [
+            (name, value) for name, value in start_message.get("headers", [])
+            if name.lower() != b"content-length"
+        ]
+
+        if conditional and status == 200 and _header(headers, b"etag") is None:
+            etag = weak_etag(body)
+            headers.append((b"etag", etag.encode("latin-1")))
+            if if_none_match and _etag_matches(if_none_match, etag):
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [
+                        (name, value) for name, value in headers
+                        if name.lower() not in _ENTITY_HEADERS
+                    ],
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        if self.compress and len(body) >= self.minimum_size:
+            if len(body) > THREAD_THRESHOLD:
+                encoding, encoded = await anyio.to_thread.run_sync(self._compress, body, accepted)
+            else:
+                encoding, encoded = self._compress(body, accepted)
+            if encoding is not None:
+                body = encoded
+                headers.append((b"content-encoding", encoding))
+            headers.append((b"vary", b"Accept-Encoding"))
+
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def _compress(self, body: bytes, accepted: set) -> Tuple[Optional[bytes], bytes]:
+        if brotli is not None and "br" in accepted:
+            return b"br", brotli.compress(body, quality=self.brotli_quality)
+        if "gzip" in accepted:
+            return b"gzip", gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        return None, body
+
+
+def _header(headers, name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
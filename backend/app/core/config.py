@@ -1,4 +1,6 @@
 """Application configuration"""
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -7,7 +9,28 @@ class Settings(BaseSettings):
     
     DATABASE_URL: str
     SECRET_KEY: str
-    
+
+    # Read Replica Settings
+    # Comma-separated replica URLs serving read-only routes; see
+    # app.core.replicas. Empty sends every read to DATABASE_URL.
+    DATABASE_REPLICA_URLS: str = ""
+    # Reads of a client that wrote within this many seconds go to the primary
+    REPLICA_STICKY_SECONDS: float = 5.0
+    # An unreachable replica is skipped for this many seconds
+    REPLICA_RETRY_SECONDS: float = 30.0
+
+    # SQLite Settings (single-node deployments without PostgreSQL)
+    # Tuned profile for SQLite databases; see app.core.database
+    SQLITE_TUNING: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KIB: int = 64 * 1024
+    # How long a write waits for another writer before "database is locked"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    # Pooled connections kept open; more are opened under load
+    SQLITE_POOL_SIZE: int = 20
+
     # JWT Settings
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -22,6 +45,70 @@ class Settings(BaseSettings):
         "http://127.0.0.1:5173"
     )
     CORS_ALLOW_ORIGIN_REGEX: str = r"https://.*\.onrender\.com"
+
+    # Observability Settings
+    METRICS_ENABLED: bool = True
+    METRICS_SERVER_TIMING: bool = False
+    # Bearer token a scraper sends to read /metrics. Without one /metrics is
+    # not served (metrics are still collected, e.g. for Server-Timing).
+    METRICS_TOKEN: Optional[str] = None
+
+    # Response Compression Settings
+    # gzip (or brotli, when the brotli package is installed) for JSON and
+    # text bodies of at least COMPRESSION_MIN_SIZE bytes, plus weak ETags
+    # on GET responses so unchanged payloads return 304.
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+    ETAG_ENABLED: bool = True
+
+    # Cache Settings
+    # auto, local, redis or none; see app.core.cache. CACHE_URL points at a
+    # Redis-compatible server shared by all workers (redis://host:6379/0).
+    CACHE_BACKEND: str = "auto"
+    CACHE_URL: Optional[str] = None
+    CACHE_TTL_SECONDS: int = 300
+
+    # Academic Session Settings
+    # Month (1-12) in which a school year starts; sessions are named
+    # "2025-26" and cover e.g. 2025-04-01 to 2026-03-31
+    ACADEMIC_SESSION_START_MONTH: int = 4
+    # PostgreSQL only: list-partition attendance and results by session
+    DATABASE_PARTITIONING: bool = True
+    # Cold archive of old sessions' history (requires pyarrow).
+    # Default directory: "archive" next to the uploads directory
+    ARCHIVE_DIR: Optional[str] = None
+    # "parquet" (zstd-compressed) or "arrow" (Arrow IPC, zstd-compressed)
+    ARCHIVE_FORMAT: str = "parquet"
+
+    # School Calendar Settings
+    # Comma-separated weekly days off (MON..SUN), excluded from working days
+    SCHOOL_WEEKLY_OFF_DAYS: str = "SUN"
+
+    # Keep month bitmaps (attendance_months) alongside the attendance rows
+    # for monthly summaries and streaks; see app.services.attendance_bitmap
+    ATTENDANCE_BITMAP_ENABLED: bool = False
+
+    # Background Job Settings (python -m app.worker; needs CACHE_URL or
+    # CACHE_BACKEND=none, see app.core.cache)
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_HEARTBEAT_SECONDS: float = 30.0
+    # Running jobs without a heartbeat for this long are re-queued
+    JOB_STALE_SECONDS: int = 300
+
+    # Startup Settings
+    # Create tables and run startup migrations in the lifespan. The gunicorn
+    # config does this once in the master and turns it off for the workers.
+    DATABASE_INIT_ON_STARTUP: bool = True
+    # Defer router imports and database preparation until after the port
+    # is bound; /health answers immediately. Useful where the service
+    # sleeps when idle and cold start is user-visible.
+    LIGHTWEIGHT_BOOT: bool = False
+    # Open pool connections and run representative queries before /ready
+    # reports ready, so the first requests after a deploy are not slow.
+    WARMUP_ENABLED: bool = False
+    WARMUP_POOL_CONNECTIONS: int = 5
     
     class Config:
         env_file = ".env"
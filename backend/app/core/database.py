@@ -1,21 +1,214 @@
 """Database configuration and session management"""
-from sqlalchemy import create_engine
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.core.config import settings
 
-# Render/managed providers may provide postgres:// URLs.
-# SQLAlchemy expects postgresql:// for the psycopg2 dialect.
-database_url = settings.DATABASE_URL
-if database_url.startswith("postgres://"):
-    database_url = database_url.replace("postgres://", "postgresql://", 1)
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Key of the PostgreSQL advisory lock held while the database is prepared
+DATABASE_INIT_LOCK_KEY = 727001
+
+
+def normalize_database_url(url: str) -> str:
+    """
+    Render/managed providers may provide postgres:// URLs.
+    SQLAlchemy expects postgresql:// for the psycopg2 dialect.
+    """
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+def sqlite_engine_options(url: str) -> dict:
+    """
+    create_engine options for SQLite databases.
+
+    Sessions may be opened in one thread and used in another (FastAPI runs
+    sync dependencies in a threadpool), so connections are not tied to the
+    thread that opened them; the pool hands each session its own. Routes
+    check connections out on the event loop while sessions are closed in
+    the threadpool, so checkouts must never wait for a free connection:
+    the pool keeps SQLITE_POOL_SIZE connections and opens more as needed,
+    which for a local file costs well under a millisecond. The driver
+    timeout is SQLite's busy timeout.
+    """
+    options = {
+        "connect_args": {
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        },
+    }
+    if make_url(url).database not in (None, "", ":memory:"):
+        options.update(pool_size=settings.SQLITE_POOL_SIZE, max_overflow=-1)
+    return options
+
+
+database_url = normalize_database_url(settings.DATABASE_URL)
 
 # Create database engine
 engine = create_engine(
     database_url,
     echo=False,  # Set to True for SQL query logging
+    **(sqlite_engine_options(database_url) if database_url.startswith("sqlite") and settings.SQLITE_TUNING else {}),
 )
 
+_SQLITE_WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def install_sqlite_pragmas(sqlite_engine, tuned: Optional[bool] = None) -> None:
+    """
+    Set per-connection pragmas on every new connection of a SQLite engine.
+
+    SQLite ignores foreign keys, including ON DELETE CASCADE, unless they
+    are switched on per connection. With the tuned profile
+    (``SQLITE_TUNING``) connections also use write-ahead logging, so
+    readers never block the writer or each other, ``synchronous=NORMAL``
+    (durable at checkpoints rather than every commit, safe with WAL), a
+    memory-mapped database file, a larger page cache and a busy timeout,
+    and writers in the process queue on ``install_sqlite_write_lock``.
+
+    Args:
+        sqlite_engine: Engine using the sqlite dialect
+        tuned: Apply the tuned profile (default: SQLITE_TUNING)
+    """
+    if tuned is None:
+        tuned = settings.SQLITE_TUNING
+
+    pragmas = ["PRAGMA foreign_keys=ON"]
+    if tuned:
+        pragmas += [
+            f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+            f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+            f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+            # Negative sizes are in KiB rather than pages
+            f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KIB}",
+            f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+            "PRAGMA temp_store=MEMORY",
+        ]
+
+    @event.listens_for(sqlite_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    if tuned:
+        install_sqlite_write_lock(sqlite_engine, settings.SQLITE_BUSY_TIMEOUT_MS / 1000)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def install_sqlite_write_lock(sqlite_engine, timeout: float) -> None:
+    """
+    Queue the writing transactions of this process on one lock.
+
+    SQLite has a single writer; other writers wait in its busy handler,
+    which polls with sleeps of up to 100ms. Writers in the same process
+    instead wait on a lock taken at a transaction's first write statement
+    and handed over as soon as it commits or rolls back. A writer that
+    waits longer than ``timeout`` goes ahead and leaves the wait to
+    SQLite's busy timeout, so the lock cannot deadlock.
+
+    Routes are ``async def`` and call the services on the event loop, so
+    a writer there only takes the lock if it is free: waiting for it
+    would stall every request on the loop, including the one holding it
+    across an ``await``. A writer that finds it taken goes straight to
+    SQLite's busy timeout, which still blocks the loop while another
+    connection holds the write lock; writes that may wait for long
+    belong in the threadpool or the job worker.
+
+    Args:
+        sqlite_engine: Engine using the sqlite dialect
+        timeout: Seconds to wait for the lock
+    """
+    lock = threading.Lock()
+
+    def _release(info) -> None:
+        if info.pop("sqlite_write_lock", False):
+            lock.release()
+
+    @event.listens_for(sqlite_engine, "before_cursor_execute")
+    def _acquire_for_write(conn, cursor, statement, parameters, context, executemany):
+        if "sqlite_write_lock" not in conn.info and statement.lstrip()[:7].upper().startswith(
+            _SQLITE_WRITE_STATEMENTS
+        ):
+            if _on_event_loop():
+                conn.info["sqlite_write_lock"] = lock.acquire(blocking=False)
+            else:
+                conn.info["sqlite_write_lock"] = lock.acquire(timeout=timeout)
+
+    @event.listens_for(sqlite_engine, "commit")
+    def _release_on_commit(conn):
+        _release(conn.info)
+
+    @event.listens_for(sqlite_engine, "rollback")
+    def _release_on_rollback(conn):
+        _release(conn.info)
+
+    @event.listens_for(sqlite_engine, "checkin")
+    def _release_on_checkin(dbapi_connection, connection_record):
+        _release(connection_record.info)
+
+
+if engine.dialect.name == "sqlite":
+    install_sqlite_pragmas(engine)
+
+
+@contextmanager
+def database_init_lock(lock_engine=None):
+    """
+    Hold a database-wide lock while the database is prepared at startup.
+
+    Processes that start together (e.g. gunicorn workers booting in the
+    background with LIGHTWEIGHT_BOOT) then run create_all and the startup
+    migrations one after another instead of racing through them. PostgreSQL
+    uses a session advisory lock; a SQLite file uses an exclusive lock on
+    a file next to it. Other databases are not locked.
+
+    Args:
+        lock_engine: Engine of the database (default: the primary engine)
+    """
+    lock_engine = lock_engine or engine
+    if lock_engine.dialect.name == "postgresql":
+        with lock_engine.connect() as conn:
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": DATABASE_INIT_LOCK_KEY})
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": DATABASE_INIT_LOCK_KEY})
+        return
+
+    database = lock_engine.url.database if lock_engine.dialect.name == "sqlite" else None
+    if fcntl is None or database in (None, "", ":memory:"):
+        yield
+        return
+
+    with open(f"{database}.init-lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
 # Create session factory
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -0,0 +1,260 @@
+"""Request and database instrumentation.
+
+A pure ASGI middleware times every HTTP request and records, per route
+template, latency, response size, and the number and duration of SQL
+statements executed while handling it. SQL statements are attributed to
+the current request through SQLAlchemy cursor events and a context
+variable. Metrics are rendered in the Prometheus text exposition format.
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestStats:
+    """Database work attributed to a single request."""
+    __slots__ = ("query_count", "db_seconds")
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_seconds = 0.0
+
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (not thread-safe; guarded by the registry)."""
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> Iterable[Tuple[str, int]]:
+        running = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            running += bucket_count
+            yield _format_number(bound), running
+        yield "+Inf", running + self.counts[-1]
+
+
+class MetricsRegistry:
+    """Thread-safe store of per-route request metrics."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._requests: Dict[Tuple[str, str, str], int] = {}
+        self._histograms: Dict[str, Dict[Tuple[str, str], Histogram]] = {
+            "http_request_duration_seconds": {},
+            "http_response_size_bytes": {},
+            "http_request_db_queries": {},
+            "http_request_db_seconds": {},
+        }
+        self._buckets = {
+            "http_request_duration_seconds": LATENCY_BUCKETS,
+            "http_response_size_bytes": SIZE_BUCKETS,
+            "http_request_db_queries": QUERY_COUNT_BUCKETS,
+            "http_request_db_seconds": LATENCY_BUCKETS,
+        }
+
+    def record(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        duration: float,
+        response_size: int,
+        stats: RequestStats
+    ) -> None:
+        """Record one completed request."""
+        labels = (method, route)
+        observations = (
+            ("http_request_duration_seconds", duration),
+            ("http_response_size_bytes", response_size),
+            ("http_request_db_queries", stats.query_count),
+            ("http_request_db_seconds", stats.db_seconds),
+        )
+        with self._lock:
+            key = (method, route, str(status_code))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            for name, value in observations:
+                histograms = self._histograms[name]
+                histogram = histograms.get(labels)
+                if histogram is None:
+                    histogram = histograms[labels] = Histogram(self._buckets[name])
+                histogram.observe(value)
+
+    def reset(self) -> None:
+        """Drop all recorded metrics."""
+        with self._lock:
+            self._requests.clear()
+            for histograms in self._histograms.values():
+                histograms.clear()
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = [
+            "# HELP http_requests_total Total HTTP requests by route and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        with self._lock:
+            for (method, route, status_code), value in sorted(self._requests.items()):
+                lines.append(
+                    f'http_requests_total{{method="{method}",route="{_escape(route)}",'
+                    f'status="{status_code}"}} {value}'
+                )
+
+            for name, histograms in self._histograms.items():
+                lines.append(f"# HELP {name} {_HELP[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for (method, route), histogram in sorted(histograms.items()):
+                    label_text = f'method="{method}",route="{_escape(route)}"'
+                    for bound, value in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {value}')
+                    lines.append(f"{name}_sum{{{label_text}}} {_format_number(histogram.total)}")
+                    lines.append(f"{name}_count{{{label_text}}} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+_HELP = {
+    "http_request_duration_seconds": "HTTP request latency in seconds.",
+    "http_response_size_bytes": "HTTP response body size in bytes.",
+    "http_request_db_queries": "SQL statements executed per HTTP request.",
+    "http_request_db_seconds": "Time spent in SQL statements per HTTP request.",
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """
+    Attribute SQL statements executed on an engine to the current request.
+
+    Statements run outside of an instrumented request are ignored.
+    """
+    if getattr(engine, "_request_metrics_installed", False):
+        return
+    engine._request_metrics_installed = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and _current_request.get() is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_request.get()
+        if stats is None:
+            return
+        started = getattr(context, "_metrics_started", None)
+        if started is not None:
+            stats.db_seconds += time.perf_counter() - started
+        stats.query_count += 1
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route request metrics.
+
+    Routes are labelled by their path template (``/admin/fees/{fee_id}``),
+    never by the concrete URL, to keep label cardinality bounded.
+    """
+
+    def __init__(self, app, server_timing: bool = False, registry: MetricsRegistry = registry):
+        self.app = app
+        self.server_timing = server_timing
+        self.registry = registry
+        self._templates: Dict[object, str] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    header = (
+                        f"app;dur={elapsed_ms:.1f}, "
+                        f"db;dur={stats.db_seconds * 1000:.1f};desc=\"{stats.query_count} queries\""
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", header.encode("latin-1"))
+                    ]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_request.reset(token)
+            self.registry.record(
+                scope["method"],
+                self._route_template(scope),
+                status_code,
+                time.perf_counter() - started,
+                response_size,
+                stats,
+            )
+
+    def _route_template(self, scope) -> str:
+        """Map the matched endpoint back to its route path template."""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+
+        template = self._templates.get(endpoint)
+        if template is None:
+            app = scope.get("app")
+            # Prefer documented paths when an endpoint is mounted twice
+            routes = sorted(
+                getattr(app, "routes", ()),
+                key=lambda route: not getattr(route, "include_in_schema", True)
+            )
+            for route in routes:
+                route_endpoint = getattr(route, "endpoint", None) or getattr(route, "app", None)
+                self._templates.setdefault(route_endpoint, route.path)
+            template = self._templates.get(endpoint, UNMATCHED_ROUTE)
+
+        return template
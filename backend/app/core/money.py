@@ -0,0 +1,43 @@
+"""Money conversion helpers.
+
+Fee amounts are stored as integer paise so that arithmetic and SQL
+aggregates are exact. Rupee values only exist at the API boundary.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Union
+
+PAISE_PER_RUPEE = 100
+
+_ONE_PAISA = Decimal("0.01")
+
+
+def to_paise(rupees: Union[Decimal, float, int, str]) -> int:
+    """Convert a rupee amount to integer paise.
+
+    Floats are converted through their shortest string form so that
+    values such as 0.1 map to exactly 10 paise.
+
+    Args:
+        rupees: Amount in rupees
+
+    Returns:
+        Amount in paise, rounded half-up to the nearest paisa
+    """
+    if not isinstance(rupees, Decimal):
+        rupees = Decimal(str(rupees))
+    return int(rupees.quantize(_ONE_PAISA, rounding=ROUND_HALF_UP) * PAISE_PER_RUPEE)
+
+
+def from_paise(paise: int) -> float:
+    """Convert integer paise to a rupee float for serialization.
+
+    Any two-decimal rupee value is the closest float to ``paise / 100``,
+    so the JSON output carries exactly the stored amount.
+
+    Args:
+        paise: Amount in paise
+
+    Returns:
+        Amount in rupees
+    """
+    return paise / PAISE_PER_RUPEE
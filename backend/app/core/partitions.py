@@ -0,0 +1,183 @@
+"""PostgreSQL list partitioning of history tables by academic session.
+
+Attendance and results are declared as plain tables in the models, so
+SQLite and other databases work unchanged. On PostgreSQL, with
+``DATABASE_PARTITIONING`` on, startup rebuilds them as
+``PARTITION BY LIST (session_id)`` tables with one partition per academic
+session and a default partition. Queries filtered on ``session_id`` then
+only touch one session's partition, and archiving a session detaches its
+partitions instead of deleting rows.
+
+A partitioned table's primary key must include the partition key, so
+there it is ``(id, session_id)``; ids still come from a single sequence
+and stay unique.
+"""
+import re
+from typing import Iterable, List
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.core.config import settings
+from app.core.database import Base
+
+PARTITIONED_TABLES = ("attendances", "results")
+
+
+def partitioning_enabled(bind) -> bool:
+    """Whether history tables are partitioned on this database."""
+    return bind.dialect.name == "postgresql" and settings.DATABASE_PARTITIONING
+
+
+def partition_name(table_name: str, session_id: int) -> str:
+    """Name of a session's partition of a history table."""
+    return f"{table_name}_s{int(session_id)}"
+
+
+def is_partitioned(conn: Connection, table_name: str) -> bool:
+    """Whether a table is a partitioned (parent) table."""
+    return conn.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+        ),
+        {"name": table_name},
+    ).first() is not None
+
+
+def create_session_partitions(conn: Connection, session_id: int) -> List[str]:
+    """
+    Create a session's partitions of the partitioned history tables.
+
+    Safe to run repeatedly.
+
+    Args:
+        conn: PostgreSQL connection
+        session_id: Academic session database ID
+
+    Returns:
+        Names of the partitions
+    """
+    partitions = []
+    for table_name in PARTITIONED_TABLES:
+        if not is_partitioned(conn, table_name):
+            continue
+        partition = partition_name(table_name, session_id)
+        conn.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {partition} "
+            f"PARTITION OF {table_name} FOR VALUES IN ({int(session_id)})"
+        )
+        partitions.append(partition)
+    return partitions
+
+
+def detach_session_partitions(conn: Connection, session_id: int) -> List[str]:
+    """
+    Detach a session's partitions from the history tables.
+
+    The partitions stay in the database as standalone tables, out of
+    every query on the parent tables, until they are dumped or dropped.
+
+    Args:
+        conn: PostgreSQL connection
+        session_id: Academic session database ID
+
+    Returns:
+        Names of the detached tables
+    """
+    detached = []
+    for table_name in PARTITIONED_TABLES:
+        partition = partition_name(table_name, session_id)
+        attached = conn.execute(
+            text(
+                "SELECT 1 FROM pg_inherits i "
+                "JOIN pg_class child ON child.oid = i.inhrelid "
+                "JOIN pg_class parent ON parent.oid = i.inhparent "
+                "WHERE child.relname = :partition AND parent.relname = :parent"
+            ),
+            {"partition": partition, "parent": table_name},
+        ).first()
+        if attached is None:
+            continue
+        conn.exec_driver_sql(f"ALTER TABLE {table_name} DETACH PARTITION {partition}")
+        detached.append(partition)
+    return detached
+
+
+def _partitioned_ddl(conn: Connection, table) -> str:
+    ddl = str(CreateTable(table).compile(dialect=conn.dialect)).strip()
+    ddl, replaced = re.subn(r"PRIMARY KEY \(id\)", "PRIMARY KEY (id, session_id)", ddl)
+    if replaced != 1:
+        raise RuntimeError(f"Unexpected primary key in DDL for {table.name}")
+    return f"{ddl} PARTITION BY LIST (session_id)"
+
+
+def convert_to_partitioned(conn: Connection, session_ids: Iterable[int]) -> List[str]:
+    """
+    Rebuild plain history tables as session-partitioned tables.
+
+    The plain table is renamed, the partitioned table and its indexes,
+    default partition and session partitions are created, rows are copied
+    across and the new id sequence is moved past the copied ids. Every row
+    must already have a session_id. Tables that are already partitioned
+    are left alone, so this is safe to run repeatedly.
+
+    Args:
+        conn: PostgreSQL connection, inside a transaction
+        session_ids: Sessions to create partitions for
+
+    Returns:
+        Names of the converted tables
+    """
+    session_ids = list(session_ids)
+    converted = []
+
+    for table_name in PARTITIONED_TABLES:
+        if is_partitioned(conn, table_name):
+            continue
+
+        table = Base.metadata.tables[table_name]
+        legacy = f"{table_name}__unpartitioned"
+        legacy_columns = {column["name"] for column in inspect(conn).get_columns(table_name)}
+        columns = ", ".join(
+            column.name for column in table.columns if column.name in legacy_columns
+        )
+        primary_key = conn.execute(
+            text(
+                "SELECT conname FROM pg_constraint "
+                "WHERE conrelid = CAST(:table AS regclass) AND contype = 'p'"
+            ),
+            {"table": table_name},
+        ).scalar()
+
+        sequence = conn.execute(
+            text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table_name}
+        ).scalar()
+
+        # Free the names the partitioned table's SERIAL id, primary key and
+        # indexes are created with
+        conn.exec_driver_sql(f"ALTER TABLE {table_name} RENAME TO {legacy}")
+        if primary_key:
+            conn.exec_driver_sql(f"ALTER TABLE {legacy} RENAME CONSTRAINT {primary_key} TO {legacy}_pkey")
+        if sequence:
+            conn.exec_driver_sql(f"ALTER SEQUENCE {sequence} RENAME TO {legacy}_id_seq")
+        for index in table.indexes:
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index.name}")
+
+        conn.exec_driver_sql(_partitioned_ddl(conn, table))
+        for index in table.indexes:
+            conn.execute(CreateIndex(index))
+        conn.exec_driver_sql(f"CREATE TABLE {table_name}_default PARTITION OF {table_name} DEFAULT")
+        for session_id in session_ids:
+            create_session_partitions(conn, session_id)
+
+        conn.exec_driver_sql(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {legacy}")
+        conn.exec_driver_sql(
+            f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table_name}), 0) + 1, false)"
+        )
+        conn.exec_driver_sql(f"DROP TABLE {legacy}")
+        converted.append(table_name)
+
+    return converted
@@ -0,0 +1,121 @@
+"""SQL statement counting for tests and benchmarks.
+
+``QueryCounter`` listens to an engine while active and records every
+statement sent to the database. It can enforce a query budget and points
+out N+1 candidates: the same statement shape executed repeatedly inside
+one unit of work, which usually means a query is being issued from a
+Python loop.
+"""
+import re
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|:\w+|\$\d+|%s|\?")
+_IN_LIST = re.compile(r"IN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a unit of work issues more statements than allowed."""
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a SQL statement so repeated executions compare equal.
+    
+    Literals and bind placeholders become ``?`` and IN-lists of any
+    length collapse to ``IN (...)``.
+    
+    Args:
+        statement: SQL text as sent to the DBAPI
+        
+    Returns:
+        Normalized statement shape
+    """
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryCounter:
+    """
+    Context manager recording the statements executed on an engine.
+
+    Example:
+        with QueryCounter(engine) as counter:
+            mark_attendance_bulk(db, 5, today, rows)
+        counter.assert_budget(4)
+    """
+
+    def __init__(self, engine: Engine, label: Optional[str] = None):
+        self.engine = engine
+        self.label = label
+        self.statements: List[str] = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+
+    @property
+    def count(self) -> int:
+        """Number of statements executed (an executemany counts once)."""
+        return len(self.statements)
+
+    def shapes(self) -> Counter:
+        """Count executions per normalized statement shape."""
+        return Counter(statement_shape(statement) for statement in self.statements)
+
+    def n_plus_one_candidates(self, threshold: int = 3) -> List[Tuple[str, int]]:
+        """
+        Get statement shapes executed at least ``threshold`` times.
+        
+        Args:
+            threshold: Minimum repetitions to report
+            
+        Returns:
+            List of (shape, executions), most repeated first
+        """
+        return [
+            (shape, executions)
+            for shape, executions in self.shapes().most_common()
+            if executions >= threshold
+        ]
+
+    def assert_budget(self, max_statements: int, n_plus_one_threshold: Optional[int] = None) -> None:
+        """
+        Fail if the budget is exceeded or N+1 candidates were seen.
+        
+        Args:
+            max_statements: Maximum number of statements allowed
+            n_plus_one_threshold: If given, also fail on shapes repeated
+                at least this many times
+            
+        Raises:
+            QueryBudgetExceeded: With the offending statements listed
+        """
+        problems = []
+        if self.count > max_statements:
+            problems.append(f"{self.count} statements issued, budget is {max_statements}")
+
+        if n_plus_one_threshold is not None:
+            for shape, executions in self.n_plus_one_candidates(n_plus_one_threshold):
+                problems.append(f"possible N+1 ({executions}x): {shape}")
+
+        if problems:
+            label = f"{self.label}: " if self.label else ""
+            detail = "\n  ".join(problems + [f"[{i}] {s}" for i, s in enumerate(self.statements, 1)])
+            raise QueryBudgetExceeded(f"{label}{detail}")
@@ -0,0 +1,204 @@
+"""Read replica routing.
+
+With ``DATABASE_REPLICA_URLS`` set, routes that only read take their
+session from ``get_read_db`` instead of ``get_db``:
+
+- Replicas are picked round-robin. One that cannot be connected to is
+  skipped for ``REPLICA_RETRY_SECONDS`` and the next healthy one is
+  used; with none healthy, the read goes to the primary.
+- Read-your-writes: ``ReadYourWritesMiddleware`` records when a client
+  (its Authorization header, or its address when there is none) sends
+  a write, and that client's reads stay on the primary for
+  ``REPLICA_STICKY_SECONDS`` so a lagging replica never hides its own
+  change. The record lives in the cache, so several workers need a
+  shared one (``CACHE_URL``) for stickiness to follow a client across
+  them; otherwise it holds per worker.
+
+Replica sessions are flagged (``reads_from_replica``) so services do not
+fill shared caches from data that may lag the primary.
+
+Without replicas ``get_read_db`` is ``get_db`` with no extra work.
+"""
+import hashlib
+import itertools
+import logging
+import time
+from threading import Lock
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.cache import LocalCacheBackend, NullCacheBackend, get_cache
+from app.core.config import settings
+from app.core.database import (
+    SessionLocal,
+    install_sqlite_pragmas,
+    normalize_database_url,
+    sqlite_engine_options,
+)
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReplicaRouter:
+    """Round-robin choice among the replicas that are currently healthy."""
+
+    def __init__(self, engines: List[Engine], retry_seconds: float, clock=time.monotonic):
+        self.engines = list(engines)
+        self.retry_seconds = retry_seconds
+        self._clock = clock
+        self._turn = itertools.count()
+        self._down_until: Dict[int, float] = {}
+        self._lock = Lock()
+
+    def candidates(self) -> List[Engine]:
+        """Healthy replicas, starting with the one whose turn it is."""
+        with self._lock:
+            now = self._clock()
+            healthy = [
+                engine for index, engine in enumerate(self.engines)
+                if self._down_until.get(index, 0) <= now
+            ]
+            if not healthy:
+                return []
+            start = next(self._turn) % len(healthy)
+            return healthy[start:] + healthy[:start]
+
+    def mark_down(self, engine: Engine) -> None:
+        """Skip a replica until ``retry_seconds`` have passed."""
+        with self._lock:
+            self._down_until[self.engines.index(engine)] = self._clock() + self.retry_seconds
+
+
+def _create_replica_engine(url: str) -> Engine:
+    url = normalize_database_url(url)
+    options = sqlite_engine_options(url) if url.startswith("sqlite") and settings.SQLITE_TUNING else {}
+    replica_engine = create_engine(url, pool_pre_ping=True, **options)
+    if replica_engine.dialect.name == "sqlite":
+        install_sqlite_pragmas(replica_engine)
+    return replica_engine
+
+
+replica_engines = [
+    _create_replica_engine(url.strip())
+    for url in settings.DATABASE_REPLICA_URLS.split(",")
+    if url.strip()
+]
+router = ReplicaRouter(replica_engines, settings.REPLICA_RETRY_SECONDS)
+ReplicaSession = sessionmaker(autocommit=False, autoflush=False)
+
+_writes = get_cache("replica_sticky", maxsize=4096)
+if isinstance(_writes, NullCacheBackend):
+    # Without a shared cache, stickiness still holds within each worker
+    _writes = LocalCacheBackend(maxsize=4096, ttl=settings.REPLICA_STICKY_SECONDS)
+
+
+def client_key(authorization: Optional[str], client_host: Optional[str]) -> str:
+    """Identify a client for read-your-writes without storing its token."""
+    if authorization:
+        return hashlib.sha256(authorization.encode("latin-1")).hexdigest()
+    return f"host:{client_host}"
+
+
+def record_write(key: str) -> None:
+    """Keep a client's reads on the primary for REPLICA_STICKY_SECONDS."""
+    _writes.set(key, time.time())
+
+
+def wrote_recently(key: str) -> bool:
+    """Whether a client wrote within REPLICA_STICKY_SECONDS."""
+    written_at = _writes.get(key)
+    return written_at is not None and time.time() - written_at < settings.REPLICA_STICKY_SECONDS
+
+
+def reads_from_replica(db: Session) -> bool:
+    """Whether a session reads from a replica (and may lag the primary)."""
+    return db.info.get("read_replica", False)
+
+
+def open_read_session(key: Optional[str] = None) -> Session:
+    """
+    Open a session for read-only work.
+
+    Args:
+        key: Client key from ``client_key``; a client that wrote recently
+            reads from the primary
+
+    Returns:
+        Session bound to a healthy replica, or to the primary
+    """
+    if not replica_engines or (key is not None and wrote_recently(key)):
+        return SessionLocal()
+
+    for replica_engine in router.candidates():
+        db = ReplicaSession(bind=replica_engine)
+        try:
+            # Check out a connection now so an unreachable replica is
+            # skipped instead of failing the request
+            db.connection()
+        except DBAPIError:
+            db.close()
+            router.mark_down(replica_engine)
+            logger.warning(
+                "Replica %s is unreachable; skipping it for %.0fs",
+                replica_engine.url.render_as_string(hide_password=True),
+                router.retry_seconds,
+            )
+            continue
+        db.info["read_replica"] = True
+        return db
+    return SessionLocal()
+
+
+def get_read_db(request: Request):
+    """Dependency to get a database session for read-only routes."""
+    if replica_engines:
+        client = request.client
+        db = open_read_session(
+            client_key(request.headers.get("authorization"), client.host if client else None)
+        )
+    else:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware recording writes for read-your-writes stickiness.
+
+    Any request with a method other than GET/HEAD/OPTIONS counts as a
+    write. It is recorded when its response starts, after the request's
+    transaction has committed, so a read sent after the response sees it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        authorization = None
+        for name, value in scope.get("headers", []):
+            if name == b"authorization":
+                authorization = value.decode("latin-1")
+                break
+        client = scope.get("client")
+        key = client_key(authorization, client[0] if client else None)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                record_write(key)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,10 +1,11 @@
-"""Security utilities for password hashing and JWT token management"""
+"""Security utilities for password hashing and JWT token management
+
+bcrypt and jose (with its cryptography backend) are imported on first use
+so that importing the application stays cheap on cold start.
+"""
 from datetime import datetime, timedelta
 from typing import Optional
 
-import bcrypt
-from jose import JWTError, jwt
-
 from app.core.config import settings
 
 
@@ -17,6 +18,8 @@ def hash_password(password: str) -> str:
     Returns:
         Bcrypt hashed password
     """
+    import bcrypt
+
     return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
 
@@ -30,6 +33,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
+    import bcrypt
+
     return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
 
@@ -46,6 +51,8 @@ def create_access_token(
     Returns:
         JWT token string
     """
+    from jose import jwt
+
     to_encode = data.copy()
     
     if expires_delta:
@@ -75,6 +82,8 @@ def verify_token(token: str) -> Optional[dict]:
     Returns:
         Decoded token payload or None if invalid
     """
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             token,
@@ -0,0 +1,107 @@
+"""Fast JSON serialization for large list responses.
+
+The default FastAPI path builds a Pydantic model per ORM row and then
+validates the list against ``response_model`` a second time before
+encoding it. For list endpoints that return whole classes or a student's
+full history this dominates CPU time.
+
+The helpers here serialize plain dicts built from labelled column tuples
+(see the ``*_rows`` service functions) straight to JSON bytes with orjson,
+and return them in a ``Response`` that FastAPI passes through untouched.
+Routes keep ``response_model`` for the OpenAPI schema. Rows that need
+coercion can be validated once through a cached Pydantic ``TypeAdapter``
+instead. Without orjson installed, encoding falls back to ``json``.
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Iterable, List, Mapping, Optional, Type
+
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode types the JSON encoders don't handle natively."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value as compact JSON bytes.
+
+    Args:
+        value: JSON-compatible value; dates, enums and decimals are allowed
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class FastJSONResponse(Response):
+    """JSON response that accepts pre-encoded bytes or encodes with ``dumps``."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """
+    Get a cached ``TypeAdapter`` for a list of ``schema``.
+
+    Args:
+        schema: Pydantic response model
+
+    Returns:
+        TypeAdapter for ``List[schema]``
+    """
+    return TypeAdapter(List[schema])
+
+
+def rows_response(
+    rows: Iterable[Mapping[str, Any]],
+    schema: Optional[Type[BaseModel]] = None,
+    status_code: int = 200,
+) -> FastJSONResponse:
+    """
+    Serialize row dicts into a JSON array response.
+
+    Row keys must already match the JSON field names (aliases included).
+    With ``schema`` the rows are validated once via a ``TypeAdapter`` and
+    dumped by Pydantic, for rows whose values need coercion; without it
+    they are encoded directly.
+
+    Args:
+        rows: Dicts keyed by JSON field name
+        schema: Optional response model to validate against
+        status_code: HTTP status code
+
+    Returns:
+        Response carrying the encoded JSON array
+    """
+    if schema is None:
+        body = dumps(rows if isinstance(rows, list) else list(rows))
+    else:
+        adapter = list_adapter(schema)
+        body = adapter.dump_json(adapter.validate_python(rows), by_alias=True)
+    return FastJSONResponse(content=body, status_code=status_code)
@@ -0,0 +1,215 @@
+"""Startup warmup and readiness tracking.
+
+After the lifespan has prepared the database, an optional warmup opens a
+number of pool connections and runs representative read statements from
+each service module, validating a row of each result through its response
+schema. This fills SQLAlchemy's compiled-statement cache, the pool and the
+Pydantic validators before traffic arrives.
+
+``readiness`` flips once startup (and warmup, if enabled) has finished;
+``/ready`` reports it, while ``/health`` only says the process is up.
+"""
+import logging
+import threading
+import time
+from datetime import date
+from typing import Callable, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Identifier that never matches a real student, so lookups run their
+# full statement without returning rows.
+MISSING_IDENTIFIER = "__warmup__"
+
+
+class Readiness:
+    """Thread-safe flag set once the application can take traffic."""
+
+    def __init__(self) -> None:
+        self._ready = threading.Event()
+        self.warmup_seconds: float = 0.0
+
+    def mark_ready(self) -> None:
+        self._ready.set()
+
+    def reset(self) -> None:
+        self._ready.clear()
+        self.warmup_seconds = 0.0
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+
+readiness = Readiness()
+
+
+def _warmup_steps() -> List[Tuple[str, Callable[[Session], object], object]]:
+    """
+    Representative service calls paired with their response schema.
+
+    Routes that serialize column rows with ``rows_response`` are warmed
+    through it, with no schema.
+    """
+    from app.core.serialization import rows_response
+    from app.schemas.dashboard import AdminDashboardSummaryResponse
+    from app.schemas.fee import FeeBalanceResponse, FeeDefaulterResponse, FeeResponse
+    from app.schemas.pdf import PdfResponse
+    from app.schemas.result import ResultResponse
+    from app.schemas.student import StudentResponse
+    from app.services import attendance, dashboard, fees, pdfs, results, rosters, student_view, students
+
+    return [
+        ("students.get_students_by_class", lambda db: students.get_students_by_class(db, 1), StudentResponse),
+        ("students.get_student", lambda db: students.get_student(db, 0), StudentResponse),
+        ("student_view.get_student_by_id", lambda db: student_view.get_student_by_id(db, 0), None),
+        ("rosters.get_class_roster_with_status",
+         lambda db: rows_response(rosters.get_class_roster_with_status(db, 1, date.today())), None),
+        ("attendance.get_student_attendance_rows_by_identifier",
+         lambda db: rows_response(attendance.get_student_attendance_rows_by_identifier(db, MISSING_IDENTIFIER)),
+         None),
+        ("fees.get_student_fees_by_identifier",
+         lambda db: fees.get_student_fees_by_identifier(db, MISSING_IDENTIFIER), FeeResponse),
+        ("fees.get_fee", lambda db: fees.get_fee(db, 0), FeeResponse),
+        ("fees.get_student_balance", lambda db: fees.get_student_balance(db, 0), FeeBalanceResponse),
+        ("fees.get_top_defaulters", lambda db: fees.get_top_defaulters(db, 1), FeeDefaulterResponse),
+        ("results.get_result", lambda db: results.get_result(db, 0), ResultResponse),
+        ("results.get_student_result_rows_by_identifier",
+         lambda db: rows_response(results.get_student_result_rows_by_identifier(db, MISSING_IDENTIFIER)),
+         None),
+        ("results.get_class_result_rows",
+         lambda db: rows_response(results.get_class_result_rows(db, 1)), None),
+        ("pdfs.get_pdf", lambda db: pdfs.get_pdf(db, 0), PdfResponse),
+        ("dashboard.get_admin_dashboard_summary",
+         dashboard.get_admin_dashboard_summary, AdminDashboardSummaryResponse),
+    ]
+
+
+def warm_pool(engine: Engine, connections: int) -> int:
+    """
+    Open pool connections up front.
+
+    Args:
+        engine: Application engine
+        connections: Number of connections to open, capped at the pool size
+
+    Returns:
+        Number of connections opened
+    """
+    pool_size = getattr(engine.pool, "size", None)
+    if callable(pool_size):
+        connections = min(connections, pool_size())
+
+    opened = []
+    try:
+        for _ in range(max(0, connections)):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+    return len(opened)
+
+
+def run_warmup(engine: Engine, session_factory: Callable[[], Session], pool_connections: int) -> dict:
+    """
+    Warm the pool, statement cache and response validators.
+
+    A failing step is logged and skipped; warmup never blocks startup.
+
+    Args:
+        engine: Application engine
+        session_factory: Callable returning a new Session
+        pool_connections: Number of pool connections to open
+
+    Returns:
+        Dict with connections opened, steps run, failed steps and duration
+    """
+    started = time.perf_counter()
+    opened = warm_pool(engine, pool_connections)
+
+    failed = []
+    steps = _warmup_steps()
+    db = session_factory()
+    try:
+        for name, call, schema in steps:
+            try:
+                value = call(db)
+                rows = value if isinstance(value, list) else [value]
+                if schema is not None:
+                    for row in rows[:1]:
+                        if row is not None:
+                            schema.model_validate(row)
+            except Exception:
+                logger.exception("Warmup step %s failed", name)
+                failed.append(name)
+            finally:
+                db.rollback()
+    finally:
+        db.close()
+
+    return {
+        "connections": opened,
+        "steps": len(steps),
+        "failed": failed,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def finish_startup(
+    engine: Engine,
+    session_factory: Callable[[], Session],
+    enabled: bool,
+    pool_connections: int,
+) -> None:
+    """
+    Run the warmup if enabled, then mark the application ready.
+
+    Args:
+        engine: Application engine
+        session_factory: Callable returning a new Session
+        enabled: Whether to warm up at all
+        pool_connections: Number of pool connections to open
+    """
+    try:
+        if enabled:
+            report = run_warmup(engine, session_factory, pool_connections)
+            readiness.warmup_seconds = report["seconds"]
+            logger.info(
+                "Warmup finished in %.3fs (%d connections, %d steps, %d failed)",
+                report["seconds"], report["connections"], report["steps"], len(report["failed"]),
+            )
+    finally:
+        readiness.mark_ready()
+
+
+def start_warmup(
+    engine: Engine,
+    session_factory: Callable[[], Session],
+    enabled: bool,
+    pool_connections: int,
+) -> None:
+    """
+    Finish startup in a daemon thread so the lifespan can complete.
+
+    Args:
+        engine: Application engine
+        session_factory: Callable returning a new Session
+        enabled: Whether to warm up at all
+        pool_connections: Number of pool connections to open
+    """
+    if not enabled:
+        readiness.mark_ready()
+        return
+
+    threading.Thread(
+        target=finish_startup,
+        args=(engine, session_factory, enabled, pool_connections),
+        name="warmup",
+        daemon=True,
+    ).start()
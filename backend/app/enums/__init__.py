@@ -1,6 +1,8 @@
 """Application enums"""
 from app.enums.attendance_enum import AttendanceStatus
+from app.enums.calendar_enum import CalendarDayType
 from app.enums.class_enum import ClassEnum
+from app.enums.job_enum import JobStatus
 from app.enums.pdf_enum import PdfCategory
 from app.enums.subject_enum import SubjectEnum
 
@@ -9,4 +11,6 @@ __all__ = [
     "SubjectEnum",
     "AttendanceStatus",
     "PdfCategory",
+    "JobStatus",
+    "CalendarDayType",
 ]
@@ -0,0 +1,9 @@
+"""School calendar day type enumeration"""
+from enum import Enum
+
+
+class CalendarDayType(str, Enum):
+    """School calendar day types"""
+    HOLIDAY = "HOLIDAY"
+    EXAM = "EXAM"
+    CLOSURE = "CLOSURE"
@@ -0,0 +1,11 @@
+"""Background job status enumeration"""
+from enum import Enum
+
+
+class JobStatus(str, Enum):
+    """Background job lifecycle states"""
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
@@ -1,38 +1,41 @@
 """FastAPI application entry point"""
+import logging
+import secrets
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Optional
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 
+from app.core.boot import BackgroundBoot, LazyBootMiddleware, include_routers
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.database import Base, SessionLocal, engine
-from app.models import Admin, Attendance, Fees, PDF, Result, Student  # noqa: F401
-from app.routes.admin import router as admin_router
-from app.routes.attendance import router as attendance_router
-from app.routes.auth import router as auth_router
-from app.routes.dashboard import router as dashboard_router
-from app.routes.fees import router as fees_router
-from app.routes.pdfs import router as pdfs_router
-from app.routes.public import router as public_router
-from app.routes.results import router as results_router
-from app.routes.student import router as student_router
-from app.routes.test import router as test_router
-from app.services.auth import create_default_admin
-from app.services.pdfs import normalize_legacy_pdf_paths
+from app.core.database import Base, SessionLocal, database_init_lock, engine
+from app.core.metrics import MetricsMiddleware, install_query_hooks, registry
+from app.core.partitions import (
+    PARTITIONED_TABLES,
+    convert_to_partitioned,
+    create_session_partitions,
+    partitioning_enabled,
+)
+from app.core.warmup import finish_startup, readiness, start_warmup
+
+logger = logging.getLogger(__name__)
 
 
 def _ensure_subject_enum_values() -> None:
     """
-    Ensure PostgreSQL enum for results subjects includes new values.
+    Ensure the results subject column accepts new subjects: the PostgreSQL
+    enum gets the new values, and a SQLite results table created with a
+    CHECK constraint listing the old subjects is rebuilt without it.
     This is safe to run repeatedly.
     """
-    if engine.dialect.name != "postgresql":
-        return
-
     enum_values = [
         "SCIENCE",
         "SOCIAL_STUDIES",
@@ -40,6 +43,18 @@ def _ensure_subject_enum_values() -> None:
         "ART",
     ]
 
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            table_sql = conn.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'results'"
+            ).scalar() or ""
+        if "CHECK" in table_sql and any(f"'{value}'" not in table_sql for value in enum_values):
+            _rebuild_sqlite_tables(["results"])
+        return
+
+    if engine.dialect.name != "postgresql":
+        return
+
     with engine.connect() as conn:
         conn = conn.execution_options(isolation_level="AUTOCOMMIT")
         for enum_value in enum_values:
@@ -48,25 +63,348 @@ def _ensure_subject_enum_values() -> None:
             )
 
 
+FEE_MONEY_COLUMNS = {
+    "fees": ["amount", "paid_amount", "due_amount"],
+    "fee_payments": ["amount"],
+    "student_balances": ["total_amount", "total_paid", "total_due"],
+}
+
+
+def _has_sqlite_real_affinity(declared_type: str) -> bool:
+    """Whether SQLite stores a column of this declared type as REAL/NUMERIC."""
+    declared_type = declared_type.upper()
+    if "INT" in declared_type:
+        return False
+    return any(name in declared_type for name in ("REAL", "FLOA", "DOUB", "NUMERIC", "DECIMAL"))
+
+
+def _ensure_fee_money_columns() -> None:
+    """
+    Convert legacy floating-point fee columns (rupees) to integer paise.
+    On PostgreSQL the columns are altered to BIGINT; on SQLite the tables
+    are rebuilt with BIGINT columns, converting the values as they are
+    copied. Columns already stored as integers are left untouched, so this
+    is safe to run repeatedly.
+    """
+    if engine.dialect.name == "sqlite":
+        inspector = inspect(engine)
+        conversions = {}
+        for table_name, column_names in FEE_MONEY_COLUMNS.items():
+            if not inspector.has_table(table_name):
+                continue
+            declared = {column["name"]: str(column["type"]) for column in inspector.get_columns(table_name)}
+            legacy = [
+                column_name for column_name in column_names
+                if column_name in declared and _has_sqlite_real_affinity(declared[column_name])
+            ]
+            if legacy:
+                conversions[table_name] = {
+                    column_name: f"CAST(ROUND({column_name} * 100) AS INTEGER)" for column_name in legacy
+                }
+        if conversions:
+            _rebuild_sqlite_tables(list(conversions), conversions)
+        return
+
+    if engine.dialect.name != "postgresql":
+        return
+
+    with engine.begin() as conn:
+        for table_name, column_names in FEE_MONEY_COLUMNS.items():
+            for column_name in column_names:
+                data_type = conn.execute(
+                    text(
+                        "SELECT data_type FROM information_schema.columns "
+                        "WHERE table_name = :table_name AND column_name = :column_name"
+                    ),
+                    {"table_name": table_name, "column_name": column_name},
+                ).scalar()
+
+                if data_type in ("double precision", "real", "numeric"):
+                    conn.execute(
+                        text(
+                            f"ALTER TABLE {table_name} ALTER COLUMN {column_name} "
+                            f"TYPE BIGINT USING ROUND({column_name} * 100)::BIGINT"
+                        )
+                    )
+
+
+def _ensure_fee_term_key_column() -> None:
+    """
+    Add the fees.term_key column and its per-student uniqueness index to
+    databases created before bulk fee assignment. Safe to run repeatedly.
+    """
+    column_names = {column["name"] for column in inspect(engine).get_columns("fees")}
+    if "term_key" in column_names:
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE fees ADD COLUMN term_key VARCHAR(50)"))
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_fees_student_term "
+                "ON fees (student_id, term_key)"
+            )
+        )
+
+
+STUDENT_CHILD_TABLES = ("attendances", "fees", "results", "fee_payments", "student_balances")
+
+
+def _ensure_student_cascade_foreign_keys() -> None:
+    """
+    Recreate the foreign keys from student history tables to students with
+    ON DELETE CASCADE on databases created before cascading deletes.
+    PostgreSQL constraints are replaced in place; SQLite cannot alter a
+    constraint, so affected tables are rebuilt from the model definition
+    and their rows copied across. Safe to run repeatedly.
+    """
+    inspector = inspect(engine)
+    legacy_tables = [
+        (table_name, foreign_key)
+        for table_name in STUDENT_CHILD_TABLES
+        for foreign_key in inspector.get_foreign_keys(table_name)
+        if foreign_key["referred_table"] == "students"
+        and (foreign_key.get("options") or {}).get("ondelete", "").upper() != "CASCADE"
+    ]
+    if not legacy_tables:
+        return
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            for table_name, foreign_key in legacy_tables:
+                conn.execute(text(f'ALTER TABLE {table_name} DROP CONSTRAINT "{foreign_key["name"]}"'))
+                conn.execute(
+                    text(
+                        f'ALTER TABLE {table_name} ADD CONSTRAINT "{foreign_key["name"]}" '
+                        "FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE"
+                    )
+                )
+        return
+
+    if engine.dialect.name == "sqlite":
+        _rebuild_sqlite_tables([table_name for table_name, _ in legacy_tables])
+
+
+def _rebuild_sqlite_tables(table_names, conversions: Optional[dict] = None) -> None:
+    """
+    Rebuild SQLite tables from their model definitions, copying their rows
+    across. SQLite cannot alter a constraint or a column type, so this is
+    how such changes reach existing SQLite databases.
+
+    ``conversions`` maps a table name to ``{column: SQL expression}`` for
+    columns whose values are converted as they are copied; the copy and
+    the new column types commit together, so a conversion runs once.
+    """
+    inspector = inspect(engine)
+    with engine.connect() as conn:
+        # Must be switched off outside a transaction for the table swap
+        conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        conn.commit()
+        try:
+            with conn.begin():
+                for table_name in table_names:
+                    table = Base.metadata.tables[table_name]
+                    old_columns = {column["name"] for column in inspector.get_columns(table_name)}
+                    copied = [column.name for column in table.columns if column.name in old_columns]
+                    converted = (conversions or {}).get(table_name, {})
+                    columns = ", ".join(copied)
+                    values = ", ".join(converted.get(name, name) for name in copied)
+                    for index in table.indexes:
+                        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index.name}")
+                    conn.exec_driver_sql(f"ALTER TABLE {table_name} RENAME TO {table_name}__legacy")
+                    table.create(conn)
+                    conn.exec_driver_sql(
+                        f"INSERT INTO {table_name} ({columns}) "
+                        f"SELECT {values} FROM {table_name}__legacy"
+                    )
+                    conn.exec_driver_sql(f"DROP TABLE {table_name}__legacy")
+        finally:
+            conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+            conn.commit()
+
+
+def _ensure_session_columns() -> None:
+    """
+    Add the academic session column and its index to attendance and
+    results tables created before academic sessions. Existing rows are
+    assigned a session by ``ensure_academic_sessions``. Safe to run
+    repeatedly.
+    """
+    inspector = inspect(engine)
+    for table_name in PARTITIONED_TABLES:
+        column_names = {column["name"] for column in inspector.get_columns(table_name)}
+        if "session_id" in column_names:
+            continue
+
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    f"ALTER TABLE {table_name} ADD COLUMN session_id INTEGER "
+                    "REFERENCES academic_sessions (id)"
+                )
+            )
+            conn.execute(
+                text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table_name}_session_id "
+                    f"ON {table_name} (session_id)"
+                )
+            )
+
+
+def _ensure_session_archive_column() -> None:
+    """
+    Add the academic_sessions.archive_path column to databases created
+    before the cold archive. Safe to run repeatedly.
+    """
+    column_names = {column["name"] for column in inspect(engine).get_columns("academic_sessions")}
+    if "archive_path" in column_names:
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE academic_sessions ADD COLUMN archive_path VARCHAR(255)"))
+
+
+def _ensure_student_search_indexes() -> None:
+    """
+    Create the pg_trgm extension and GIN trigram indexes behind student
+    search on PostgreSQL (see ``app.services.student_search``). Without
+    the privilege to create the extension, search uses its in-memory
+    index instead. Safe to run repeatedly.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    try:
+        with engine.connect() as conn:
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except DBAPIError:
+        logger.warning("Could not create the pg_trgm extension; student search uses an in-memory index")
+        return
+
+    with engine.begin() as conn:
+        for column in ("name", "father_name", "phone", "student_id"):
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_students_{column}_trgm "
+                f"ON students USING gin ({column} gin_trgm_ops)"
+            ))
+
+
+def _ensure_partitioned_history_tables() -> None:
+    """
+    Rebuild attendance and results as tables partitioned by academic
+    session on PostgreSQL (see ``app.core.partitions``), and make sure
+    every live session has its partitions. Runs after every row has been
+    assigned a session. Safe to run repeatedly.
+    """
+    if not partitioning_enabled(engine):
+        return
+
+    with engine.begin() as conn:
+        session_ids = [
+            session_id
+            for (session_id,) in conn.execute(
+                text("SELECT id FROM academic_sessions WHERE archived_at IS NULL ORDER BY id")
+            )
+        ]
+        convert_to_partitioned(conn, session_ids)
+        for session_id in session_ids:
+            create_session_partitions(conn, session_id)
+
+
+def _initialize_database() -> None:
+    """Create tables, apply startup migrations and fix up legacy data."""
+    # Models and services are imported here so a lightweight boot can
+    # defer them until after the port is bound.
+    from app.models import (  # noqa: F401
+        AcademicSession,
+        Admin,
+        Attendance,
+        AttendanceMonth,
+        FeePayment,
+        Fees,
+        Job,
+        PDF,
+        Result,
+        SchoolCalendarDay,
+        Student,
+        StudentBalance,
+    )
+    from app.services.academic_sessions import ensure_academic_sessions
+    from app.services.attendance_bitmap import backfill_attendance_months
+    from app.services.auth import create_default_admin
+    from app.services.calendar import collapse_uniform_holidays
+    from app.services.fees import backfill_fee_ledger
+    from app.services.pdfs import normalize_legacy_pdf_paths
+
+    # Workers booting together take turns; later ones find it all done
+    with database_init_lock():
+        Base.metadata.create_all(bind=engine)
+        _ensure_subject_enum_values()
+        _ensure_fee_money_columns()
+        _ensure_fee_term_key_column()
+        _ensure_student_cascade_foreign_keys()
+        _ensure_session_columns()
+        _ensure_session_archive_column()
+        _ensure_student_search_indexes()
+
+        # Create default admin
+        db: Session = SessionLocal()
+        try:
+            create_default_admin(db)
+            normalize_legacy_pdf_paths(db)
+            backfill_fee_ledger(db)
+            collapse_uniform_holidays(db)
+            backfill_attendance_months(db)
+            ensure_academic_sessions(db)
+        finally:
+            db.close()
+
+        _ensure_partitioned_history_tables()
+
+
+def _deferred_startup() -> None:
+    """Startup work run in the background in lightweight boot mode."""
+    if settings.DATABASE_INIT_ON_STARTUP:
+        _initialize_database()
+    finish_startup(
+        engine,
+        SessionLocal,
+        enabled=settings.WARMUP_ENABLED,
+        pool_connections=settings.WARMUP_POOL_CONNECTIONS,
+    )
+
+
+_background_boot: Optional[BackgroundBoot] = None
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Manage FastAPI application lifespan.
     
-    Startup: Create all database tables and default admin
+    Startup: Create all database tables and default admin, then warm up
+    (if enabled) in the background; /ready flips once that is done. With
+    LIGHTWEIGHT_BOOT all of this runs in a background thread once the
+    server is up, together with the router imports.
     Shutdown: Clean up resources if needed
     """
+    global _background_boot
+
     # Startup
-    Base.metadata.create_all(bind=engine)
-    _ensure_subject_enum_values()
-    
-    # Create default admin
-    db: Session = SessionLocal()
-    try:
-        create_default_admin(db)
-        normalize_legacy_pdf_paths(db)
-    finally:
-        db.close()
+    readiness.reset()
+    if settings.LIGHTWEIGHT_BOOT:
+        _background_boot = BackgroundBoot(_deferred_startup)
+        _background_boot.start()
+    else:
+        if settings.DATABASE_INIT_ON_STARTUP:
+            _initialize_database()
+        start_warmup(
+            engine,
+            SessionLocal,
+            enabled=settings.WARMUP_ENABLED,
+            pool_connections=settings.WARMUP_POOL_CONNECTIONS,
+        )
     
     yield
     
@@ -95,17 +433,41 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-# Include routers
-app.include_router(auth_router)
-app.include_router(admin_router)
-app.include_router(attendance_router)
-app.include_router(fees_router)
-app.include_router(dashboard_router)
-app.include_router(results_router)
-app.include_router(pdfs_router)
-app.include_router(student_router)
-app.include_router(public_router)
-app.include_router(test_router)
+
+if settings.DATABASE_REPLICA_URLS:
+    from app.core.replicas import ReadYourWritesMiddleware, replica_engines
+
+    app.add_middleware(ReadYourWritesMiddleware)
+else:
+    replica_engines = []
+
+if settings.METRICS_ENABLED:
+    for metered_engine in [engine, *replica_engines]:
+        install_query_hooks(metered_engine)
+    app.add_middleware(
+        MetricsMiddleware,
+        server_timing=settings.METRICS_SERVER_TIMING,
+    )
+
+# Include routers (deferred to the first request in lightweight boot mode)
+if settings.LIGHTWEIGHT_BOOT:
+    app.add_middleware(
+        LazyBootMiddleware,
+        fastapi_app=app,
+        boot_ref=lambda: _background_boot,
+    )
+else:
+    include_routers(app)
+
+if settings.COMPRESSION_ENABLED or settings.ETAG_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.GZIP_LEVEL,
+        brotli_quality=settings.BROTLI_QUALITY,
+        etag=settings.ETAG_ENABLED,
+        compress=settings.COMPRESSION_ENABLED,
+    )
 
 # Serve uploaded files so frontend can download PDFs via /uploads/*
 # Keep this aligned with app.services.pdfs.UPLOADS_DIR (backend/uploads).
@@ -123,3 +485,37 @@ app.mount("/notice", StaticFiles(directory=str(notice_dir)), name="notice")
 async def health_check():
     """Health check endpoint."""
     return {"status": "ok"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint: 503 until startup and warmup have finished."""
+    if not readiness.is_ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "starting"},
+        )
+    return {"status": "ready"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """
+    Prometheus-style request and database metrics.
+
+    They describe traffic to every route, so they are only served to a
+    scraper sending ``Authorization: Bearer <METRICS_TOKEN>``.
+    """
+    if not settings.METRICS_ENABLED or not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4",
+    )
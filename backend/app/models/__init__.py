@@ -1,16 +1,28 @@
 """Database models"""
+from app.models.academic_session import AcademicSession
 from app.models.admin import Admin
 from app.models.attendance import Attendance
+from app.models.attendance_month import AttendanceMonth
+from app.models.fee_payment import FeePayment
 from app.models.fees import Fees
+from app.models.job import Job
 from app.models.pdf import PDF
 from app.models.result import Result
+from app.models.school_calendar import SchoolCalendarDay
 from app.models.student import Student
+from app.models.student_balance import StudentBalance
 
 __all__ = [
+    "AcademicSession",
     "Admin",
     "Student",
     "Attendance",
+    "AttendanceMonth",
     "Fees",
+    "FeePayment",
+    "StudentBalance",
     "Result",
     "PDF",
+    "Job",
+    "SchoolCalendarDay",
 ]
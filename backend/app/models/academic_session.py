@@ -0,0 +1,30 @@
+"""Academic session model"""
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, Integer, String
+
+from app.core.database import Base
+
+
+class AcademicSession(Base):
+    """School year that attendance and results belong to.
+
+    Sessions start on the first day of ``ACADEMIC_SESSION_START_MONTH``
+    (April by default) and are created on demand for the dates being
+    written. On PostgreSQL each session has its own partition of the
+    attendance and results tables; archiving a session detaches them.
+    A cold-archived session's history lives in columnar files instead.
+    """
+    __tablename__ = "academic_sessions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(20), unique=True, nullable=False)  # e.g. "2025-26"
+    start_date = Column(Date, unique=True, nullable=False)
+    end_date = Column(Date, nullable=False)
+    archived_at = Column(DateTime, nullable=True)
+    # Set when the session's history was exported to files under ARCHIVE_DIR
+    archive_path = Column(String(255), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<AcademicSession(id={self.id}, name={self.name})>"
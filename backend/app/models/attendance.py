@@ -13,8 +13,10 @@ class Attendance(Base):
     __tablename__ = "attendances"
 
     id = Column(Integer, primary_key=True, index=True)
-    student_id = Column(Integer, ForeignKey("students.id"), nullable=False, index=True)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
     class_ = Column(Integer, nullable=False)  # Maps to ClassEnum (1-10)
+    # Partition key on PostgreSQL (LIST partitions per academic session)
+    session_id = Column(Integer, ForeignKey("academic_sessions.id"), nullable=True, index=True)
     date = Column(Date, default=datetime.utcnow, nullable=False, index=True)
     status = Column(
         Enum(AttendanceStatus),
@@ -0,0 +1,31 @@
+"""Month bitmap attendance model"""
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer
+
+from app.core.database import Base
+
+
+class AttendanceMonth(Base):
+    """One student's attendance for one month, packed into day bitmaps.
+
+    Bit ``n - 1`` of each mask is day ``n`` of the month; a day is set in
+    at most one of the three masks, and unmarked days in none. Maintained
+    alongside the attendance rows when ``ATTENDANCE_BITMAP_ENABLED`` is on
+    (see ``app.services.attendance_bitmap``): one row replaces up to 31
+    attendance rows for month-level summaries, percentages and streaks.
+    """
+    __tablename__ = "attendance_months"
+
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)  # First day of the month
+    class_ = Column(Integer, nullable=False)  # Class when the month was marked
+    present_days = Column(Integer, default=0, nullable=False)
+    absent_days = Column(Integer, default=0, nullable=False)
+    holiday_days = Column(Integer, default=0, nullable=False)
+
+    # Class registers for a month (monthly class summaries)
+    __table_args__ = (
+        Index("ix_attendance_months_month_class", "month", "class_"),
+    )
+
+    def __repr__(self):
+        return f"<AttendanceMonth(student_id={self.student_id}, month={self.month})>"
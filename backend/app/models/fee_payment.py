@@ -0,0 +1,36 @@
+"""Fee payment ledger model"""
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+from app.core.money import from_paise
+
+
+class FeePayment(Base):
+    """Append-only ledger of payments recorded against fee records.
+
+    Each row is a signed delta, in paise, on the paid amount of a fee. Corrections and
+    fee deletions are recorded as reversing entries, never as edits, so the
+    ledger keeps the full payment history. ``fee_id`` is deliberately not a
+    foreign key so entries survive the deletion of their fee record.
+    """
+    __tablename__ = "fee_payments"
+
+    id = Column(Integer, primary_key=True, index=True)
+    fee_id = Column(Integer, nullable=False, index=True)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
+    amount_paise = Column("amount", BigInteger, nullable=False)
+    remark = Column(String(255), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    student = relationship("Student", back_populates="fee_payments")
+
+    @property
+    def amount(self) -> float:
+        return from_paise(self.amount_paise)
+
+    def __repr__(self):
+        return f"<FeePayment(id={self.id}, fee_id={self.fee_id}, amount={self.amount})>"
@@ -1,27 +1,58 @@
 """Fees/Payment model"""
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.core.money import from_paise
 
 
 class Fees(Base):
-    """Fees payment tracking model"""
+    """Fees payment tracking model.
+
+    Amounts are stored as integer paise; the rupee properties are what the
+    API schemas read.
+    """
     __tablename__ = "fees"
 
     id = Column(Integer, primary_key=True, index=True)
-    student_id = Column(Integer, ForeignKey("students.id"), nullable=False, index=True)
-    amount = Column(Float, nullable=False)
-    paid_amount = Column(Float, default=0.0, nullable=False)
-    due_amount = Column(Float, nullable=False)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
+    amount_paise = Column("amount", BigInteger, nullable=False)
+    paid_amount_paise = Column("paid_amount", BigInteger, default=0, nullable=False)
+    due_amount_paise = Column("due_amount", BigInteger, nullable=False)
     payment_date = Column(DateTime, nullable=True)
     remark = Column(String(255), nullable=True)
+    term_key = Column(String(50), nullable=True)  # e.g. "2025-T1"; one fee per student per term
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
     student = relationship("Student", back_populates="fees")
 
+    __table_args__ = (
+        UniqueConstraint("student_id", "term_key", name="uq_fees_student_term"),
+    )
+
+    @property
+    def amount(self) -> float:
+        return from_paise(self.amount_paise)
+
+    @property
+    def paid_amount(self) -> float:
+        return from_paise(self.paid_amount_paise)
+
+    @property
+    def due_amount(self) -> float:
+        return from_paise(self.due_amount_paise)
+
     def __repr__(self):
         return f"<Fees(id={self.id}, student_id={self.student_id}, amount={self.amount})>"
@@ -0,0 +1,40 @@
+"""Background job model"""
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, Enum, Index, Integer, String, Text
+
+from app.core.database import Base
+from app.enums.job_enum import JobStatus
+
+
+class Job(Base):
+    """Queued unit of background work, claimed and run by ``app.worker``.
+
+    ``job_type`` names an entry in the job registry (``app.services.jobs``);
+    ``payload`` holds its JSON arguments. A failed attempt is re-queued with
+    ``run_after`` pushed back until ``max_attempts`` is reached.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(100), nullable=False, index=True)
+    status = Column(Enum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+    payload = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    progress = Column(Integer, default=0, nullable=False)  # 0-100
+    progress_message = Column(String(255), nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False)
+    locked_by = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, job_type={self.job_type}, status={self.status})>"
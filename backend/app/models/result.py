@@ -13,8 +13,10 @@ class Result(Base):
     __tablename__ = "results"
 
     id = Column(Integer, primary_key=True, index=True)
-    student_id = Column(Integer, ForeignKey("students.id"), nullable=False, index=True)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
     class_ = Column(Integer, nullable=False)  # Maps to ClassEnum (1-10)
+    # Partition key on PostgreSQL (LIST partitions per academic session)
+    session_id = Column(Integer, ForeignKey("academic_sessions.id"), nullable=True, index=True)
     subject = Column(Enum(SubjectEnum), nullable=False, index=True)
     marks = Column(Float, nullable=False)
     exam_type = Column(String(50), nullable=False)  # e.g., "Midterm", "Final", "Unit Test"
@@ -0,0 +1,30 @@
+"""School calendar model"""
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, Enum, Index, Integer, String
+
+from app.core.database import Base
+from app.enums.calendar_enum import CalendarDayType
+
+
+class SchoolCalendarDay(Base):
+    """Holiday, exam day or closure for the whole school or one class.
+
+    ``class_`` is NULL for entries that apply to every class. Holidays and
+    closures are non-working days: attendance is not taken and they are
+    left out of working-day counts. Exam days are working days.
+    """
+    __tablename__ = "school_calendar"
+    __table_args__ = (
+        Index("ix_school_calendar_date_class", "date", "class_"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    date = Column(Date, nullable=False)
+    class_ = Column(Integer, nullable=True)  # Maps to ClassEnum (1-10); NULL = whole school
+    day_type = Column(Enum(CalendarDayType), nullable=False)
+    title = Column(String(200), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<SchoolCalendarDay(id={self.id}, date={self.date}, class_={self.class_}, day_type={self.day_type})>"
@@ -24,10 +24,19 @@ class Student(Base):
     address = Column(String(255), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
-    # Relationships
-    attendances = relationship("Attendance", back_populates="student", cascade="all, delete-orphan")
-    fees = relationship("Fees", back_populates="student", cascade="all, delete-orphan")
-    results = relationship("Result", back_populates="student", cascade="all, delete-orphan")
+    # Relationships. Child rows are removed by ON DELETE CASCADE foreign
+    # keys; passive_deletes stops the ORM loading them to delete one by one.
+    attendances = relationship(
+        "Attendance", back_populates="student", cascade="all, delete-orphan", passive_deletes=True
+    )
+    fees = relationship("Fees", back_populates="student", cascade="all, delete-orphan", passive_deletes=True)
+    results = relationship("Result", back_populates="student", cascade="all, delete-orphan", passive_deletes=True)
+    fee_payments = relationship(
+        "FeePayment", back_populates="student", cascade="all, delete-orphan", passive_deletes=True
+    )
+    balance = relationship(
+        "StudentBalance", back_populates="student", uselist=False, cascade="all, delete-orphan", passive_deletes=True
+    )
 
     def __repr__(self):
         return f"<Student(id={self.id}, student_id={self.student_id}, name={self.name})>"
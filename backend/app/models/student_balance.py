@@ -0,0 +1,47 @@
+"""Per-student fee balance model"""
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+from app.core.money import from_paise
+
+
+class StudentBalance(Base):
+    """Running fee totals per student.
+
+    Maintained in the same transaction as every fee write, so balance lookups
+    and defaulter listings never have to aggregate the fees table. Totals
+    are integer paise.
+    """
+    __tablename__ = "student_balances"
+
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    total_amount_paise = Column("total_amount", BigInteger, default=0, nullable=False)
+    total_paid_paise = Column("total_paid", BigInteger, default=0, nullable=False)
+    total_due_paise = Column("total_due", BigInteger, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    student = relationship("Student", back_populates="balance")
+
+    @property
+    def total_amount(self) -> float:
+        return from_paise(self.total_amount_paise)
+
+    @property
+    def total_paid(self) -> float:
+        return from_paise(self.total_paid_paise)
+
+    @property
+    def total_due(self) -> float:
+        return from_paise(self.total_due_paise)
+
+    # Covering index for "top defaulters" (ORDER BY total_due DESC LIMIT n)
+    __table_args__ = (
+        Index("ix_student_balances_total_due", "total_due", "student_id"),
+    )
+
+    def __repr__(self):
+        return f"<StudentBalance(student_id={self.student_id}, total_due={self.total_due_paise})>"
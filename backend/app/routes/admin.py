@@ -1,21 +1,33 @@
 """Admin management routes"""
 import os
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import require_admin
-from app.schemas.student import StudentCreate, StudentResponse, StudentUpdate
+from app.schemas.student import (
+    StudentCreate,
+    StudentPromotionRequest,
+    StudentPromotionResponse,
+    StudentResponse,
+    StudentSearchResult,
+    StudentUpdate,
+    StudentWithdrawRequest,
+    StudentWithdrawResponse,
+)
 from app.services.students import (
     create_student,
     delete_student,
     get_all_students,
     get_student,
     get_students_by_class,
+    promote_students,
     update_student,
+    withdraw_students,
 )
+from app.services.student_search import search_students
 
 router = APIRouter(prefix="/admin/students", tags=["admin"])
 
@@ -94,6 +106,72 @@ async def add_student(
         )
 
 
+@router.post("/withdraw", response_model=StudentWithdrawResponse)
+async def withdraw_students_bulk(
+    request: StudentWithdrawRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Withdraw a whole class or a list of students.
+
+    Deletes the students together with their attendance, fees, results
+    and payment history, using set-based statements. IDs that do not
+    exist are reported in not_found_ids.
+
+    Only admin can access this endpoint.
+    """
+    return withdraw_students(db, class_=request.class_, student_ids=request.student_ids)
+
+
+@router.post("/promote", response_model=StudentPromotionResponse)
+async def promote_students_bulk(
+    request: StudentPromotionRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Promote whole classes to the next class at year end.
+
+    All students of the given classes (default: 1-9) move up one class
+    in a single transaction, except those listed in detained_ids.
+    Optionally reissues promoted students' IDs in their new class
+    (STU{class}{roll}). With dry_run the report is returned and nothing
+    is saved. Class 10 leavers are withdrawn instead.
+
+    Only admin can access this endpoint.
+    """
+    try:
+        return promote_students(
+            db,
+            classes=request.classes,
+            detained_ids=request.detained_ids,
+            reissue_student_ids=request.reissue_student_ids,
+            dry_run=request.dry_run,
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Reissued student IDs conflict with existing ones; nothing was changed"
+        )
+
+
+@router.get("/search", response_model=list[StudentSearchResult])
+async def search_students_list(
+    q: str = Query(..., min_length=2, max_length=100, description="Name, father's name, phone or student_id"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Search students by name, father's name, phone number or student_id.
+
+    Only admin can access this endpoint.
+    Prefixes and small typos match; best matches come first.
+    """
+    return search_students(db, q, limit)
+
+
 @router.get("/{student_id}", response_model=StudentResponse)
 async def get_student_by_id(
     student_id: int,
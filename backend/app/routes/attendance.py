@@ -1,21 +1,33 @@
 """Attendance management routes"""
 from datetime import date
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Path, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import require_admin
+from app.core.serialization import rows_response
 from app.schemas.attendance import (
     AttendanceMarkBulkRequest,
     AttendanceResponse,
+    AttendanceSummaryResponse,
+    ClassMonthlyAttendanceResponse,
     StudentAttendanceResponse,
+    StudentMonthlyAttendanceResponse,
 )
 from app.services.attendance import (
-    get_students_for_attendance,
-    get_student_attendance_history,
+    get_student_attendance_rows_by_identifier,
+    get_student_attendance_summary,
     mark_attendance_bulk,
 )
+from app.services.attendance_bitmap import (
+    get_class_monthly_attendance,
+    get_student_monthly_attendance,
+)
+from app.services.calendar import get_closure
+from app.services.identifiers import resolve_student_pk
+from app.services.rosters import get_class_roster_with_status
 
 router = APIRouter(prefix="/admin/attendance", tags=["admin-attendance"])
 
@@ -30,7 +42,8 @@ async def get_class_students_for_attendance(
     """
     Get all students in a class for attendance marking.
     
-    Returns student list for the admin to mark attendance.
+    Returns student list for the admin to mark attendance, with the
+    status already marked for the date (null where not marked yet).
     Only admin can access.
     """
     if class_ < 1 or class_ > 10:
@@ -39,9 +52,7 @@ async def get_class_students_for_attendance(
             detail="Class must be between 1 and 10"
         )
     
-    students = get_students_for_attendance(db, class_)
-    
-    return [StudentAttendanceResponse.from_orm(student) for student in students]
+    return rows_response(get_class_roster_with_status(db, class_, date))
 
 
 @router.post("/mark", status_code=status.HTTP_201_CREATED)
@@ -62,6 +73,8 @@ async def mark_attendance(
     - One attendance per student per date
     - If exists → update
     - Prevents duplicate entries (upsert logic)
+    - Not allowed on a holiday or closure in the school calendar
+    - Not allowed in an archived academic session
     
     Only admin can access.
     """
@@ -70,6 +83,13 @@ async def mark_attendance(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Class must be between 1 and 10"
         )
+
+    closure = get_closure(db, request.date, request.class_)
+    if closure:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Class {request.class_} is closed on {request.date}: {closure.title}"
+        )
     
     # Convert attendances to dict format
     attendances_data = [
@@ -80,7 +100,13 @@ async def mark_attendance(
         for att in request.attendances
     ]
     
-    result = mark_attendance_bulk(db, request.class_, request.date, attendances_data)
+    try:
+        result = mark_attendance_bulk(db, request.class_, request.date, attendances_data)
+    except ValueError as error:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(error)
+        )
     
     return {
         "message": "Attendance marked successfully",
@@ -92,18 +118,92 @@ async def mark_attendance(
     }
 
 
-@router.get("/student/{student_id}", response_model=list[AttendanceResponse])
+@router.get("/student/{student_identifier}", response_model=list[AttendanceResponse])
 async def get_student_attendance(
-    student_id: int,
+    student_identifier: str,
+    session_id: Optional[int] = None,
+    all_sessions: bool = False,
     db: Session = Depends(get_db),
     current_user: dict = Depends(require_admin)
 ):
     """
-    Get attendance history for a student.
+    Get attendance history for a student by numeric ID or student_id string.
     
-    Returns all attendance records for the student.
+    Returns the student's attendance records for the current academic
+    session, another session (session_id) or all of them (all_sessions).
     Only admin can access.
     """
-    attendances = get_student_attendance_history(db, student_id)
-    
-    return [AttendanceResponse.from_orm(att) for att in attendances]
+    return rows_response(get_student_attendance_rows_by_identifier(
+        db, student_identifier, session_id, all_sessions
+    ))
+
+
+@router.get("/summary/{student_identifier}", response_model=AttendanceSummaryResponse)
+async def get_student_attendance_totals(
+    student_identifier: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get a student's attendance totals over working days.
+
+    Holidays and closures from the school calendar are excluded.
+    Only admin can access.
+    """
+    student_pk = resolve_student_pk(db, student_identifier)
+    summary = get_student_attendance_summary(db, student_pk, start, end) if student_pk else None
+
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Student not found"
+        )
+
+    return summary
+
+
+@router.get("/monthly/{student_identifier}", response_model=StudentMonthlyAttendanceResponse)
+async def get_student_monthly_attendance_view(
+    student_identifier: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get a student's attendance month by month, with current and longest
+    present streaks.
+
+    Only admin can access.
+    """
+    student_pk = resolve_student_pk(db, student_identifier)
+    summary = get_student_monthly_attendance(db, student_pk, start, end) if student_pk else None
+
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Student not found"
+        )
+
+    return summary
+
+
+@router.get(
+    "/monthly/class/{class_}/{year}/{month}",
+    response_model=list[ClassMonthlyAttendanceResponse]
+)
+async def get_class_monthly_attendance_view(
+    class_: int = Path(..., ge=1, le=10),
+    year: int = Path(..., ge=2000, le=2100),
+    month: int = Path(..., ge=1, le=12),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get one month's attendance totals for every student marked in a class.
+
+    Only admin can access.
+    """
+    return get_class_monthly_attendance(db, class_, date(year, month, 1))
@@ -0,0 +1,102 @@
+"""School calendar routes"""
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.dependencies import require_admin
+from app.schemas.calendar import CalendarDayCreate, CalendarDayResponse, WorkingDaysResponse
+from app.services.calendar import (
+    count_working_days,
+    delete_calendar_day,
+    list_calendar_days,
+    set_calendar_days,
+)
+
+router = APIRouter(prefix="/admin/calendar", tags=["admin-calendar"])
+
+
+@router.get("", response_model=list[CalendarDayResponse])
+async def get_calendar(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    class_: Optional[int] = Query(None, ge=1, le=10, alias="class"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    List holidays, exam days and closures, oldest first.
+
+    With ``class``, school-wide entries and that class's entries are
+    returned.
+    Only admin can access.
+    """
+    return list_calendar_days(db, start, end, class_)
+
+
+@router.post("", response_model=list[CalendarDayResponse], status_code=status.HTTP_201_CREATED)
+async def create_calendar_days(
+    request: CalendarDayCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Declare a holiday, exam day or closure.
+
+    One entry per date from ``date`` to ``end_date``, for one class or
+    (without ``class``) the whole school. Replaces existing entries for
+    the same dates and class. Attendance cannot be marked for a class on
+    its holidays and closures.
+    Only admin can access.
+    """
+    return set_calendar_days(
+        db, request.date, request.end_date, request.day_type, request.title, request.class_
+    )
+
+
+@router.get("/working-days", response_model=WorkingDaysResponse)
+async def get_working_days(
+    start: date,
+    end: date,
+    class_: Optional[int] = Query(None, ge=1, le=10, alias="class"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Count working days between two dates (inclusive).
+
+    Weekly days off and holidays or closures for the class (or the whole
+    school) are excluded.
+    Only admin can access.
+    """
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must not be before start"
+        )
+
+    return {"start": start, "end": end, "class": class_, **count_working_days(db, start, end, class_)}
+
+
+@router.delete("/{day_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_calendar_entry(
+    day_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Delete a calendar entry.
+
+    Only admin can access.
+    """
+    deleted = delete_calendar_day(db, day_id)
+
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Calendar entry not found"
+        )
+
+    return None
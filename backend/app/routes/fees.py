@@ -1,16 +1,29 @@
 """Fees management routes"""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import require_admin
-from app.models import Student
-from app.schemas.fee import FeeCreate, FeeResponse, FeeUpdate
+from app.schemas.fee import (
+    FeeBalanceResponse,
+    FeeBulkCreate,
+    FeeBulkResponse,
+    FeeCreate,
+    FeeDefaulterResponse,
+    FeePaymentResponse,
+    FeeResponse,
+    FeeUpdate,
+)
 from app.services.fees import (
+    assign_fees_bulk,
     create_fee,
     delete_fee,
     get_fee,
-    get_student_fees,
+    get_student_balance,
+    get_student_fees_by_identifier,
+    get_student_payments,
+    get_top_defaulters,
     update_fee,
 )
 
@@ -30,13 +43,20 @@ async def add_fee(
     
     Only admin can access.
     """
-    fee = create_fee(
-        db,
-        student_id=request.student_id,
-        amount=request.amount,
-        paid_amount=request.paid_amount,
-        remark=request.remark
-    )
+    try:
+        fee = create_fee(
+            db,
+            student_id=request.student_id,
+            amount=request.amount,
+            paid_amount=request.paid_amount,
+            remark=request.remark,
+            term_key=request.term_key
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Fee already exists for this student and term"
+        )
     
     if not fee:
         raise HTTPException(
@@ -47,6 +67,37 @@ async def add_fee(
     return fee
 
 
+@router.post("/bulk", response_model=FeeBulkResponse, status_code=status.HTTP_201_CREATED)
+async def add_fees_bulk(
+    request: FeeBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Raise a fee for every student in a class, a list of students, or the
+    whole school (when neither class nor student_ids is given).
+    
+    Idempotent per (student, term_key): repeating the request creates no
+    duplicates and reports the students as skipped.
+    
+    Only admin can access.
+    """
+    try:
+        return assign_fees_bulk(
+            db,
+            amount=request.amount,
+            term_key=request.term_key,
+            class_=request.class_,
+            student_ids=request.student_ids,
+            remark=request.remark
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Fees for this term are being assigned concurrently, retry"
+        )
+
+
 @router.get("/student/{student_identifier}", response_model=list[FeeResponse])
 async def get_student_fees_list(
     student_identifier: str,
@@ -58,24 +109,59 @@ async def get_student_fees_list(
     
     Only admin can access.
     """
-    resolved_student_id = None
+    return get_student_fees_by_identifier(db, student_identifier)
 
-    # Numeric identifier -> database primary key
-    if student_identifier.isdigit():
-        resolved_student_id = int(student_identifier)
-    else:
-        # Non-numeric identifier -> Student.student_id (e.g. STU5001)
-        student = db.query(Student).filter(
-            Student.student_id == student_identifier
-        ).first()
-        if student:
-            resolved_student_id = student.id
 
-    if resolved_student_id is None:
-        return []
+@router.get("/balance/{student_id}", response_model=FeeBalanceResponse)
+async def get_student_fee_balance(
+    student_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get the outstanding fee balance for a student.
+    
+    Served from the maintained per-student balance, not by summing fees.
+    
+    Only admin can access.
+    """
+    balance = get_student_balance(db, student_id)
+    
+    if not balance:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No fee balance for student"
+        )
+    
+    return balance
 
-    fees = get_student_fees(db, resolved_student_id)
-    return fees
+
+@router.get("/defaulters", response_model=list[FeeDefaulterResponse])
+async def get_fee_defaulters(
+    limit: int = Query(20, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get students with the highest outstanding fees.
+    
+    Only admin can access.
+    """
+    return get_top_defaulters(db, limit)
+
+
+@router.get("/payments/{student_id}", response_model=list[FeePaymentResponse])
+async def get_student_fee_payments(
+    student_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get the payment ledger for a student.
+    
+    Only admin can access.
+    """
+    return get_student_payments(db, student_id)
 
 
 @router.get("/{fee_id}", response_model=FeeResponse)
@@ -0,0 +1,169 @@
+"""Background job routes"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.dependencies import require_admin
+from app.enums.job_enum import JobStatus
+from app.schemas.job import JobCreate, JobResponse, JobTypeResponse
+from app.services.jobs import (
+    cancel_job,
+    enqueue_job,
+    get_job,
+    get_job_types,
+    list_jobs,
+    retry_job,
+)
+
+router = APIRouter(prefix="/admin/jobs", tags=["admin-jobs"])
+
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    request: JobCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Queue a background job.
+
+    The job runs in a worker process (python -m app.worker); poll
+    GET /admin/jobs/{job_id} for status, progress and result.
+
+    Only admin can access.
+    """
+    try:
+        return enqueue_job(db, request.job_type, request.payload, request.max_attempts)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=jsonable_encoder(e.errors(include_url=False))
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("", response_model=list[JobResponse])
+async def get_jobs_list(
+    job_status: Optional[JobStatus] = Query(None, alias="status"),
+    job_type: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    List jobs, newest first, optionally filtered by status and type.
+
+    Only admin can access.
+    """
+    return list_jobs(db, job_status, job_type, limit)
+
+
+@router.get("/types", response_model=list[JobTypeResponse])
+async def get_job_types_list(
+    current_user: dict = Depends(require_admin)
+):
+    """
+    List the registered job types with their limits and payload schemas.
+
+    Only admin can access.
+    """
+    return [
+        JobTypeResponse(
+            name=job_type.name,
+            description=job_type.description,
+            concurrency=job_type.concurrency,
+            max_attempts=job_type.max_attempts,
+            retry_backoff_seconds=job_type.retry_backoff_seconds,
+            payload_schema=(
+                job_type.payload_schema.model_json_schema(by_alias=True)
+                if job_type.payload_schema else None
+            ),
+        )
+        for job_type in get_job_types()
+    ]
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job_status(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get a job's status, progress and result.
+
+    Only admin can access.
+    """
+    job = get_job(db, job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    return job
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_queued_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Cancel a job that has not started yet.
+
+    Only admin can access.
+    """
+    job = cancel_job(db, job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    if job.status != JobStatus.CANCELLED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status.value}; only queued jobs can be cancelled"
+        )
+
+    return job
+
+
+@router.post("/{job_id}/retry", response_model=JobResponse)
+async def retry_failed_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Queue a failed or cancelled job again.
+
+    Only admin can access.
+    """
+    job = retry_job(db, job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    if job.status != JobStatus.QUEUED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status.value}; only failed or cancelled jobs can be retried"
+        )
+
+    return job
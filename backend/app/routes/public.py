@@ -4,7 +4,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.replicas import get_read_db
 from app.schemas.pdf import PdfResponse
 from app.schemas.student_view import SchoolInfoResponse
 from app.services.pdfs import get_public_pdfs
@@ -15,7 +15,7 @@ router = APIRouter(prefix="/public", tags=["public"])
 @router.get("/pdfs", response_model=list[PdfResponse])
 async def list_public_pdfs(
     category: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all public PDF documents.
@@ -7,6 +7,8 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import require_admin
+from app.core.replicas import get_read_db
+from app.core.serialization import rows_response
 from app.models import Student
 from app.enums.subject_enum import SubjectEnum
 from app.schemas.result import (
@@ -17,9 +19,9 @@ from app.schemas.result import (
 from app.services.results import (
     create_result,
     delete_result,
-    get_class_results,
+    get_class_result_rows,
     get_result,
-    get_student_results,
+    get_student_result_rows_by_identifier,
     update_result,
 )
 
@@ -114,6 +116,11 @@ async def add_result(
             exam_type=request.exam_type,
             marks=normalized_marks
         )
+    except ValueError as error:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(error)
+        )
     except Exception as error:
         print(f"Error while creating results: {str(error)}")
         is_dev = os.getenv("ENV", "development").lower() == "development"
@@ -158,32 +165,41 @@ async def get_result_record(
     return result
 
 
-@router.get("/student/{student_id}", response_model=list[ResultResponse])
+@router.get("/student/{student_identifier}", response_model=list[ResultResponse])
 async def get_student_results_list(
-    student_id: int,
-    db: Session = Depends(get_db),
+    student_identifier: str,
+    session_id: Optional[int] = None,
+    all_sessions: bool = False,
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(require_admin)
 ):
     """
-    Get all results for a student.
+    Get a student's results by numeric ID or student_id string.
+    
+    Results are for the current academic session unless session_id or
+    all_sessions is given.
     
     Only admin can access.
     """
-    results = get_student_results(db, student_id)
-    return [ResultResponse.from_orm(r) for r in results]
+    return rows_response(get_student_result_rows_by_identifier(
+        db, student_identifier, session_id, all_sessions
+    ))
 
 
 @router.get("/class/{class_}", response_model=list[ResultResponse])
 async def get_class_results_list(
     class_: int,
     exam_type: Optional[str] = None,
-    db: Session = Depends(get_db),
+    session_id: Optional[int] = None,
+    all_sessions: bool = False,
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(require_admin)
 ):
     """
     Get results for all students in a class.
     
-    Optionally filter by exam_type.
+    Optionally filter by exam_type. Results are for the current academic
+    session unless session_id or all_sessions is given.
     
     Only admin can access.
     """
@@ -193,8 +209,7 @@ async def get_class_results_list(
             detail="Class must be between 1 and 10"
         )
     
-    results = get_class_results(db, class_, exam_type)
-    return [ResultResponse.from_orm(r) for r in results]
+    return rows_response(get_class_result_rows(db, class_, exam_type, session_id, all_sessions))
 
 
 @router.put("/{result_id}", response_model=ResultResponse)
@@ -0,0 +1,127 @@
+"""Academic session routes"""
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.dependencies import require_admin
+from app.schemas.academic_session import (
+    AcademicSessionCreate,
+    AcademicSessionResponse,
+    ColdArchiveRequest,
+    ColdArchiveResponse,
+    SessionArchiveResponse,
+)
+from app.services.academic_sessions import archive_session, create_session, list_sessions
+from app.services.cold_archive import archive_history
+
+router = APIRouter(prefix="/admin/sessions", tags=["admin-sessions"])
+
+
+def _session_response(academic_session) -> AcademicSessionResponse:
+    response = AcademicSessionResponse.model_validate(academic_session)
+    response.is_current = academic_session.start_date <= date.today() <= academic_session.end_date
+    return response
+
+
+@router.get("", response_model=list[AcademicSessionResponse])
+async def get_sessions(
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    List academic sessions, newest first.
+
+    Only admin can access.
+    """
+    return [_session_response(academic_session) for academic_session in list_sessions(db)]
+
+
+@router.post("", response_model=AcademicSessionResponse, status_code=status.HTTP_201_CREATED)
+async def create_academic_session(
+    request: AcademicSessionCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Create the academic session starting in a year, e.g. ahead of a new
+    school year. Returns the existing session if there is one.
+
+    Sessions are also created automatically when attendance or results
+    are first recorded in them.
+    Only admin can access.
+    """
+    try:
+        academic_session = create_session(db, request.start_year)
+    except ValueError as error:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(error)
+        )
+
+    return _session_response(academic_session)
+
+
+@router.post("/cold-archive", response_model=ColdArchiveResponse)
+async def cold_archive_sessions(
+    request: ColdArchiveRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Move every academic session that ended before a date to compressed
+    columnar files (Parquet by default) under ARCHIVE_DIR.
+
+    Each session's attendance, results and settled fees are exported and
+    then deleted from the live tables. History endpoints still return
+    them when asked for the session (session_id) or for all_sessions.
+    The current session is never archived. Use dry_run to only count the
+    rows. Large schools should run this as the cold_archive.archive_history
+    job or with ``python -m app.archive``.
+    Only admin can access.
+    """
+    try:
+        return archive_history(db, request.before, dry_run=request.dry_run)
+    except RuntimeError as error:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(error)
+        )
+    except ValueError as error:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(error)
+        )
+
+
+@router.post("/{session_id}/archive", response_model=SessionArchiveResponse)
+async def archive_academic_session(
+    session_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Archive a past academic session.
+
+    Its attendance and results leave the live tables: on PostgreSQL the
+    session's partitions are detached and kept as standalone tables,
+    elsewhere the rows are deleted. No more attendance or results can be
+    recorded in it. The current session cannot be archived.
+    Only admin can access.
+    """
+    try:
+        result = archive_session(db, session_id)
+    except ValueError as error:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(error)
+        )
+
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Academic session not found"
+        )
+
+    return result
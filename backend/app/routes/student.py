@@ -1,9 +1,14 @@
 """Student personal data routes"""
+from datetime import date
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
 from app.core.dependencies import require_student
+from app.core.replicas import get_read_db
+from app.core.serialization import rows_response
+from app.schemas.attendance import AttendanceSummaryResponse
 from app.schemas.student_view import (
     StudentAttendanceSummary,
     StudentFeesSummary,
@@ -11,10 +16,10 @@ from app.schemas.student_view import (
     StudentPdfResponse,
     StudentResultSummary,
 )
-from app.services.attendance import get_student_attendance_history
+from app.services.attendance import get_student_attendance_rows, get_student_attendance_summary
 from app.services.fees import get_student_fees
 from app.services.pdfs import get_public_pdfs
-from app.services.results import get_student_results
+from app.services.results import get_student_result_rows
 from app.services.student_view import get_student_by_id
 
 router = APIRouter(prefix="/student", tags=["student"])
@@ -22,7 +27,7 @@ router = APIRouter(prefix="/student", tags=["student"])
 
 @router.get("/me", response_model=StudentProfileResponse)
 async def get_student_profile(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(require_student)
 ):
     """
@@ -46,25 +51,52 @@ async def get_student_profile(
 
 @router.get("/attendance", response_model=list[StudentAttendanceSummary])
 async def get_student_attendance(
-    db: Session = Depends(get_db),
+    session_id: Optional[int] = None,
+    all_sessions: bool = False,
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(require_student)
 ):
     """
     Get current student's attendance history.
     
-    Returns all attendance records for the student.
+    Returns the student's attendance records for the current academic
+    session, another session (session_id) or all of them (all_sessions).
     Only student can access own attendance.
     """
     student_id = int(current_user.get("sub"))
     
-    attendances = get_student_attendance_history(db, student_id)
-    
-    return [StudentAttendanceSummary.from_orm(att) for att in attendances]
+    return rows_response(get_student_attendance_rows(db, student_id, session_id, all_sessions))
+
+
+@router.get("/attendance/summary", response_model=AttendanceSummaryResponse)
+async def get_student_attendance_totals(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(require_student)
+):
+    """
+    Get current student's attendance totals over working days.
+
+    Holidays and closures from the school calendar are excluded.
+    Only student can access own attendance.
+    """
+    student_id = int(current_user.get("sub"))
+
+    summary = get_student_attendance_summary(db, student_id, start, end)
+
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Student profile not found"
+        )
+
+    return summary
 
 
 @router.get("/fees", response_model=list[StudentFeesSummary])
 async def get_student_fees_list(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(require_student)
 ):
     """
@@ -82,26 +114,28 @@ async def get_student_fees_list(
 
 @router.get("/results", response_model=list[StudentResultSummary])
 async def get_student_results_list(
-    db: Session = Depends(get_db),
+    session_id: Optional[int] = None,
+    all_sessions: bool = False,
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(require_student)
 ):
     """
     Get current student's result records.
     
-    Returns all exam results across all subjects and exam types.
+    Returns exam results across all subjects and exam types for the
+    current academic session, another session (session_id) or all of
+    them (all_sessions).
     Only student can access own results.
     """
     student_id = int(current_user.get("sub"))
     
-    results = get_student_results(db, student_id)
-    
-    return [StudentResultSummary.from_orm(result) for result in results]
+    return rows_response(get_student_result_rows(db, student_id, session_id, all_sessions))
 
 
 @router.get("/pdfs", response_model=list[StudentPdfResponse])
 async def get_student_available_pdfs(
     category: str = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(require_student)
 ):
     """
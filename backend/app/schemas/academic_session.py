@@ -0,0 +1,60 @@
+"""Academic session request and response schemas"""
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class AcademicSessionCreate(BaseModel):
+    """Create the academic session starting in a year"""
+    start_year: int = Field(..., ge=2000, le=2100)
+
+
+class AcademicSessionResponse(BaseModel):
+    """Academic session response"""
+    id: int
+    name: str
+    start_date: date
+    end_date: date
+    archived_at: Optional[datetime] = None
+    archive_path: Optional[str] = None
+    is_current: bool = False
+
+    class Config:
+        from_attributes = True
+
+
+class SessionArchiveRequest(BaseModel):
+    """Archive an academic session (job payload)"""
+    session_id: int
+
+
+class SessionArchiveResponse(BaseModel):
+    """Outcome of archiving an academic session"""
+    session_id: int
+    name: str
+    method: str = Field(..., description="detach (PostgreSQL partitions) or delete")
+    detached_tables: List[str]
+    deleted_rows: Dict[str, int]
+
+
+class ColdArchiveRequest(BaseModel):
+    """Move sessions that ended before a date to archive files"""
+    before: date
+    dry_run: bool = False
+
+
+class ColdArchiveSession(BaseModel):
+    """One cold-archived academic session"""
+    session_id: int
+    name: str
+    rows: Dict[str, int]
+    bytes: int = Field(..., description="Size of the session's archive files")
+
+
+class ColdArchiveResponse(BaseModel):
+    """Outcome of a cold archive run"""
+    dry_run: bool
+    format: str
+    directory: str
+    sessions: List[ColdArchiveSession]
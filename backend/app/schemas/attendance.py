@@ -1,6 +1,6 @@
 """Attendance request and response schemas"""
 from datetime import date, datetime
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -42,7 +42,60 @@ class StudentAttendanceResponse(BaseModel):
     student_id: str
     name: str
     class_: int = Field(..., alias="class")
+    status: Optional[AttendanceStatus] = Field(None, description="Attendance already marked for the date")
 
     class Config:
         populate_by_name = True
         from_attributes = True
+
+
+class AttendanceSummaryResponse(BaseModel):
+    """Attendance totals for a student over a date range.
+
+    Only working days count: attendance marked on holidays and closures
+    is ignored, and ``unmarked`` is the working days with no mark.
+    """
+    student_id: int
+    start: date
+    end: date
+    working_days: int
+    present: int
+    absent: int
+    unmarked: int
+    attendance_percentage: float
+
+
+class AttendanceMonthSummary(BaseModel):
+    """One month of a student's attendance"""
+    month: date = Field(..., description="First day of the month")
+    class_: int = Field(..., alias="class")
+    working_days: int
+    present: int
+    absent: int
+    holidays: int
+    unmarked: int
+    attendance_percentage: float
+
+    class Config:
+        populate_by_name = True
+
+
+class StudentMonthlyAttendanceResponse(BaseModel):
+    """Month-by-month attendance with totals and streaks.
+
+    Streaks count consecutive working days present; weekly days off,
+    holidays and closures neither extend nor break them.
+    """
+    student_id: int
+    months: List[AttendanceMonthSummary]
+    present: int
+    absent: int
+    attendance_percentage: float
+    current_streak: int
+    longest_streak: int
+
+
+class ClassMonthlyAttendanceResponse(AttendanceMonthSummary):
+    """One student's month in a class register"""
+    id: int
+    name: Optional[str] = None
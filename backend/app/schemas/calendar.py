@@ -0,0 +1,55 @@
+"""School calendar request and response schemas"""
+from datetime import date, datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.enums.calendar_enum import CalendarDayType
+
+
+class CalendarDayCreate(BaseModel):
+    """Declare a holiday, exam day or closure, optionally over a date range"""
+    date: date
+    end_date: Optional[date] = Field(None, description="Last day of a range (inclusive); defaults to date")
+    day_type: CalendarDayType
+    title: str = Field(..., min_length=1, max_length=200)
+    class_: Optional[int] = Field(None, ge=1, le=10, alias="class", description="Omit for the whole school")
+
+    @model_validator(mode="after")
+    def check_range(self) -> "CalendarDayCreate":
+        if self.end_date is not None:
+            if self.end_date < self.date:
+                raise ValueError("end_date must not be before date")
+            if (self.end_date - self.date).days >= 366:
+                raise ValueError("A calendar range can span at most one year")
+        return self
+
+    class Config:
+        populate_by_name = True
+
+
+class CalendarDayResponse(BaseModel):
+    """School calendar entry response"""
+    id: int
+    date: date
+    class_: Optional[int] = Field(None, alias="class")
+    day_type: CalendarDayType
+    title: str
+    created_at: datetime
+
+    class Config:
+        populate_by_name = True
+        from_attributes = True
+
+
+class WorkingDaysResponse(BaseModel):
+    """Working days in a date range for the whole school or one class"""
+    start: date
+    end: date
+    class_: Optional[int] = Field(None, alias="class")
+    working_days: int
+    non_working_days: int
+
+    class Config:
+        populate_by_name = True
+
@@ -9,3 +9,5 @@ class AdminDashboardSummaryResponse(BaseModel):
     total_fees_collected: float
     total_pending_fees: float
     total_pdfs: int
+    school_open_today: bool
+    working_days_this_month: int
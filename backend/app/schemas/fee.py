@@ -1,26 +1,57 @@
 """Fees request and response schemas"""
 from datetime import datetime
-from typing import Optional
+from decimal import Decimal
+from typing import Annotated, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+# Rupee amounts accepted from clients; stored as integer paise.
+RupeeAmount = Annotated[Decimal, Field(ge=0, decimal_places=2)]
 
 
 class FeeCreate(BaseModel):
     """Create fee record for a student"""
     student_id: int = Field(..., description="Student database ID")
-    amount: float = Field(..., gt=0, description="Total fee amount")
-    paid_amount: float = Field(0, ge=0, description="Amount paid")
+    amount: RupeeAmount = Field(..., gt=0, description="Total fee amount")
+    paid_amount: RupeeAmount = Field(Decimal("0"), description="Amount paid")
+    remark: Optional[str] = Field(None, max_length=255)
+    term_key: Optional[str] = Field(None, min_length=1, max_length=50, description="Term identifier, e.g. 2025-T1")
+
+
+class FeeBulkCreate(BaseModel):
+    """Raise a fee for a class, a list of students, or the whole school"""
+    amount: RupeeAmount = Field(..., gt=0, description="Fee amount per student")
+    term_key: str = Field(..., min_length=1, max_length=50, description="Term identifier, e.g. 2025-T1")
+    class_: Optional[int] = Field(None, ge=1, le=10, alias="class", description="Class (1-10)")
+    student_ids: Optional[List[int]] = Field(None, min_length=1, description="Student database IDs")
     remark: Optional[str] = Field(None, max_length=255)
 
+    @model_validator(mode="after")
+    def check_target(self) -> "FeeBulkCreate":
+        if self.class_ is not None and self.student_ids is not None:
+            raise ValueError("Provide either class or student_ids, not both")
+        return self
+
+    class Config:
+        populate_by_name = True
+
+
+class FeeBulkResponse(BaseModel):
+    """Bulk fee assignment counts"""
+    term_key: str
+    targeted: int
+    created: int
+    skipped: int
+
 
 class FeeUpdate(BaseModel):
     """Update fee record"""
-    paid_amount: Optional[float] = Field(None, ge=0)
+    paid_amount: Optional[RupeeAmount] = None
     remark: Optional[str] = Field(None, max_length=255)
 
 
 class FeeResponse(BaseModel):
-    """Fee response"""
+    """Fee response (amounts in rupees, read from the paise columns)"""
     id: int
     student_id: int
     amount: float
@@ -28,7 +59,45 @@ class FeeResponse(BaseModel):
     due_amount: float
     payment_date: Optional[datetime]
     remark: Optional[str]
+    term_key: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class FeePaymentResponse(BaseModel):
+    """Fee payment ledger entry"""
+    id: int
+    fee_id: int
+    student_id: int
+    amount: float
+    remark: Optional[str]
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class FeeBalanceResponse(BaseModel):
+    """Student fee balance"""
+    student_id: int
+    total_amount: float
+    total_paid: float
+    total_due: float
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class FeeDefaulterResponse(BaseModel):
+    """Student with outstanding fees"""
+    id: int
+    student_id: str
+    name: str
+    class_: int = Field(..., alias="class")
+    total_due: float
+
+    class Config:
+        populate_by_name = True
@@ -0,0 +1,45 @@
+"""Background job request and response schemas"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+from app.enums.job_enum import JobStatus
+
+
+class JobCreate(BaseModel):
+    """Enqueue a background job"""
+    job_type: str = Field(..., min_length=1, max_length=100, description="Registered job type, e.g. fees.assign_fees_bulk")
+    payload: Dict[str, Any] = Field(default_factory=dict, description="Arguments for the job type")
+    max_attempts: Optional[int] = Field(None, ge=1, le=10, description="Override the job type's attempt limit")
+
+
+class JobResponse(BaseModel):
+    """Background job status and outcome"""
+    id: int
+    job_type: str
+    status: JobStatus
+    payload: Optional[Dict[str, Any]] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    progress: int
+    progress_message: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class JobTypeResponse(BaseModel):
+    """Registered job type"""
+    name: str
+    description: Optional[str] = None
+    concurrency: int
+    max_attempts: int
+    retry_backoff_seconds: float
+    payload_schema: Optional[Dict[str, Any]] = None
@@ -1,8 +1,8 @@
 """Student request and response schemas"""
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.enums.class_enum import ClassEnum
 
@@ -52,3 +52,82 @@ class StudentResponse(BaseModel):
     class Config:
         populate_by_name = True
         from_attributes = True
+
+
+class StudentSearchResult(BaseModel):
+    """A student matching a search, with the fields the search box shows"""
+    id: int
+    student_id: str
+    name: str
+    father_name: Optional[str]
+    phone: Optional[str]
+    class_: int = Field(..., alias="class")
+    score: float = Field(..., description="Share of the query's trigrams matched, 0-1")
+
+    class Config:
+        populate_by_name = True
+
+
+class StudentWithdrawRequest(BaseModel):
+    """Withdraw (delete) a class or a list of students with their history"""
+    class_: Optional[int] = Field(None, ge=1, le=10, alias="class", description="Class (1-10)")
+    student_ids: Optional[List[int]] = Field(None, min_length=1, max_length=5000, description="Student database IDs")
+
+    @model_validator(mode="after")
+    def check_target(self) -> "StudentWithdrawRequest":
+        if (self.class_ is None) == (self.student_ids is None):
+            raise ValueError("Provide either class or student_ids")
+        return self
+
+    class Config:
+        populate_by_name = True
+
+
+class StudentWithdrawResponse(BaseModel):
+    """Bulk withdrawal counts"""
+    withdrawn: int
+    withdrawn_ids: List[int]
+    not_found_ids: List[int]
+
+
+class StudentPromotionRequest(BaseModel):
+    """Promote whole classes to the next class at year end"""
+    classes: Optional[List[int]] = Field(
+        None, min_length=1, max_length=9, description="Classes to promote (default: 1-9)"
+    )
+    detained_ids: List[int] = Field(
+        default_factory=list, max_length=5000, description="Student database IDs kept in their class"
+    )
+    reissue_student_ids: bool = Field(False, description="Give promoted students IDs of their new class")
+    dry_run: bool = Field(False, description="Report what would change without saving it")
+
+    @model_validator(mode="after")
+    def check_classes(self) -> "StudentPromotionRequest":
+        if self.classes is not None and any(not 1 <= class_ <= 9 for class_ in self.classes):
+            raise ValueError("Only classes 1-9 can be promoted")
+        return self
+
+
+class PromotionClassReport(BaseModel):
+    """Promotion counts for one class"""
+    from_class: int
+    to_class: int
+    promoted: int
+    detained: int
+
+
+class ReissuedStudentId(BaseModel):
+    """A student_id replaced on promotion"""
+    id: int
+    old_student_id: str
+    new_student_id: str
+
+
+class StudentPromotionResponse(BaseModel):
+    """Year-end promotion report"""
+    dry_run: bool
+    promoted: int
+    detained: int
+    classes: List[PromotionClassReport]
+    reissued: List[ReissuedStudentId]
+    detained_not_found_ids: List[int]
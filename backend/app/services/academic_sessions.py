@@ -0,0 +1,380 @@
+"""Academic session service.
+
+Attendance and results carry the academic session they were recorded in.
+Reads in the attendance and results services are scoped to the current
+session by default (the session covering today), which on PostgreSQL
+prunes the query to that session's partition; callers can ask for another
+session or for all of them.
+
+Sessions are created on demand for the dates being written, and once at
+startup for legacy rows. Session lookups are cached; a session's entry is
+dropped whenever it is created or archived.
+"""
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.core.partitions import (
+    create_session_partitions,
+    detach_session_partitions,
+    partitioning_enabled,
+)
+from app.core.replicas import reads_from_replica
+from app.models import AcademicSession, Attendance, AttendanceMonth, Result, Student
+
+# ("start", session start date) -> session ID, negated once archived,
+# 0 when there is none
+_session_cache = get_cache("academic_session", maxsize=64)
+
+
+def session_start(day: date) -> date:
+    """First day of the academic session containing ``day``."""
+    start_month = settings.ACADEMIC_SESSION_START_MONTH
+    year = day.year if day.month >= start_month else day.year - 1
+    return date(year, start_month, 1)
+
+
+def session_bounds(day: date) -> tuple:
+    """First and last day of the academic session containing ``day``."""
+    start = session_start(day)
+    return start, start.replace(year=start.year + 1) - timedelta(days=1)
+
+
+def session_name(start: date) -> str:
+    """Display name of the session starting on ``start``, e.g. 2025-26."""
+    if start.month == 1:
+        return str(start.year)
+    return f"{start.year}-{(start.year + 1) % 100:02d}"
+
+
+def get_session_id_for_date(db: Session, day: date, create: bool = False) -> Optional[int]:
+    """
+    Get the academic session covering a date.
+
+    With ``create``, a missing session is created (with its partitions on
+    PostgreSQL) inside the caller's transaction; the caller commits.
+
+    Args:
+        db: Database session
+        day: Date
+        create: Create the session if it doesn't exist
+
+    Returns:
+        Session database ID, or None if there is none and ``create`` is off
+
+    Raises:
+        ValueError: If ``create`` is on and the session has been archived
+    """
+    start, end = session_bounds(day)
+    cached = _session_cache.get(("start", start))
+    if cached is not None and (cached > 0 or not create):
+        return abs(cached) or None
+
+    row = db.query(AcademicSession.id, AcademicSession.archived_at, AcademicSession.name).filter(
+        AcademicSession.start_date == start
+    ).first()
+
+    if row is None and create:
+        try:
+            with db.begin_nested():
+                academic_session = AcademicSession(
+                    name=session_name(start), start_date=start, end_date=end
+                )
+                db.add(academic_session)
+                db.flush()
+                if partitioning_enabled(db.get_bind()):
+                    create_session_partitions(db.connection(), academic_session.id)
+            # Not cached until committed; the caller may still roll back
+            _session_cache.delete(("start", start))
+            return academic_session.id
+        except IntegrityError:
+            # Created concurrently
+            row = db.query(
+                AcademicSession.id, AcademicSession.archived_at, AcademicSession.name
+            ).filter(AcademicSession.start_date == start).first()
+
+    # A replica may lag the primary; only cache what the primary says
+    cacheable = not reads_from_replica(db)
+    if row is None:
+        if cacheable:
+            _session_cache.set(("start", start), 0)
+        return None
+
+    archived = row[1] is not None
+    if cacheable:
+        _session_cache.set(("start", start), -row[0] if archived else row[0])
+    if create and archived:
+        raise ValueError(f"Academic session {row[2]} is archived")
+    return row[0]
+
+
+def get_current_session_id(db: Session) -> Optional[int]:
+    """
+    Get the academic session covering today.
+
+    Returns:
+        Session database ID, or None if no session covers today
+    """
+    return get_session_id_for_date(db, date.today())
+
+
+def session_scope(
+    db: Session,
+    column,
+    session_id: Optional[int] = None,
+    all_sessions: bool = False
+) -> list:
+    """
+    Filter criteria restricting a ``session_id`` column to one session.
+
+    Args:
+        db: Database session
+        column: ``session_id`` column of the queried model
+        session_id: Session to read (default: the current session)
+        all_sessions: Read every session instead
+
+    Returns:
+        List of criteria (empty for all sessions, or when no session
+        covers today)
+    """
+    if all_sessions:
+        return []
+    if session_id is None:
+        session_id = get_current_session_id(db)
+        if session_id is None:
+            return []
+    return [column == session_id]
+
+
+def list_sessions(db: Session) -> List[AcademicSession]:
+    """
+    List academic sessions, newest first.
+
+    Args:
+        db: Database session
+
+    Returns:
+        List of AcademicSession objects
+    """
+    return db.query(AcademicSession).order_by(AcademicSession.start_date.desc()).all()
+
+
+def get_session(db: Session, session_id: int) -> Optional[AcademicSession]:
+    """
+    Get an academic session by ID.
+
+    Args:
+        db: Database session
+        session_id: Session database ID
+
+    Returns:
+        AcademicSession object or None
+    """
+    return db.query(AcademicSession).filter(AcademicSession.id == session_id).first()
+
+
+def create_session(db: Session, start_year: int) -> AcademicSession:
+    """
+    Create the academic session starting in a year, if it doesn't exist.
+
+    Args:
+        db: Database session
+        start_year: Calendar year the session starts in
+
+    Returns:
+        AcademicSession object
+
+    Raises:
+        ValueError: If the session exists and has been archived
+    """
+    start = date(start_year, settings.ACADEMIC_SESSION_START_MONTH, 1)
+    try:
+        session_id = get_session_id_for_date(db, start, create=True)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return get_session(db, session_id)
+
+
+def check_archivable(academic_session: AcademicSession) -> None:
+    """
+    Refuse to archive the current session or an archived one.
+
+    Raises:
+        ValueError: If the session is current or already archived
+    """
+    if academic_session.archived_at is not None:
+        raise ValueError(f"Academic session {academic_session.name} is already archived")
+    if academic_session.start_date <= date.today() <= academic_session.end_date:
+        raise ValueError(f"Academic session {academic_session.name} is the current session")
+
+
+def remove_session_history(
+    db: Session,
+    academic_session: AcademicSession,
+    drop_partitions: bool = False
+) -> dict:
+    """
+    Remove a session's attendance and results from the live tables and
+    mark it archived, inside the caller's transaction.
+
+    On partitioned PostgreSQL tables the session's partitions are
+    detached (and dropped with ``drop_partitions``). Elsewhere the rows
+    are removed with one set-based DELETE per table. Month attendance
+    bitmaps for the session are deleted either way.
+
+    Args:
+        db: Database session
+        academic_session: Session to archive
+        drop_partitions: Drop detached partitions instead of keeping them
+
+    Returns:
+        Dict with detached_tables and deleted_rows
+    """
+    detached: List[str] = []
+    deleted = {}
+    if partitioning_enabled(db.get_bind()):
+        detached = detach_session_partitions(db.connection(), academic_session.id)
+        if drop_partitions:
+            for partition in detached:
+                db.connection().exec_driver_sql(f"DROP TABLE {partition}")
+    detached_parents = {partition.rsplit("_s", 1)[0] for partition in detached}
+    for model in (Attendance, Result):
+        if model.__tablename__ not in detached_parents:
+            deleted[model.__tablename__] = db.execute(
+                delete(model).where(model.session_id == academic_session.id)
+            ).rowcount
+    deleted[AttendanceMonth.__tablename__] = db.execute(
+        delete(AttendanceMonth).where(
+            AttendanceMonth.month >= academic_session.start_date,
+            AttendanceMonth.month <= academic_session.end_date,
+        )
+    ).rowcount
+    academic_session.archived_at = datetime.utcnow()
+    _session_cache.delete(("start", academic_session.start_date))
+    return {"detached_tables": [] if drop_partitions else detached, "deleted_rows": deleted}
+
+
+def archive_session(db: Session, session_id: int) -> dict:
+    """
+    Take an academic session's attendance and results out of the live tables.
+
+    On partitioned PostgreSQL tables the session's partitions are
+    detached and kept as standalone tables. Elsewhere the rows are
+    removed with one set-based DELETE per table. Month attendance bitmaps
+    for the session are deleted either way. The current session cannot
+    be archived.
+
+    Args:
+        db: Database session
+        session_id: Session database ID
+
+    Returns:
+        Dict with method ("detach" or "delete"), detached_tables and
+        deleted_rows, or None if the session doesn't exist
+
+    Raises:
+        ValueError: If the session is current or already archived
+    """
+    academic_session = get_session(db, session_id)
+    if academic_session is None:
+        return None
+    check_archivable(academic_session)
+
+    name, start = academic_session.name, academic_session.start_date
+    try:
+        removed = remove_session_history(db, academic_session)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    # Dropped again in case a concurrent lookup cached it before the commit
+    _session_cache.delete(("start", start))
+    return {
+        "session_id": session_id,
+        "name": name,
+        "method": "detach" if removed["detached_tables"] else "delete",
+        **removed,
+    }
+
+
+def ensure_academic_sessions(db: Session, today: Optional[date] = None) -> dict:
+    """
+    Create sessions and assign them to attendance and results without one.
+
+    Attendance is assigned by date. Results have no date, so their
+    session is inferred from how many classes below the student's current
+    class they were recorded in (one class per year, counted back from
+    the session covering ``today``). Also creates the session covering
+    ``today``. Safe to run repeatedly.
+
+    Args:
+        db: Database session
+        today: Reference date (default: today)
+
+    Returns:
+        Dict with attendance and results rows assigned
+    """
+    today = today or date.today()
+    assigned = {"attendances": 0, "results": 0}
+
+    try:
+        current = get_session_id_for_date(db, today, create=True)
+
+        first, last = db.query(func.min(Attendance.date), func.max(Attendance.date)).filter(
+            Attendance.session_id.is_(None)
+        ).one()
+        if first is not None:
+            start = session_start(first)
+            while start <= last:
+                end = session_bounds(start)[1]
+                session_id = get_session_id_for_date(db, start, create=True)
+                assigned["attendances"] += db.execute(
+                    update(Attendance)
+                    .where(
+                        Attendance.session_id.is_(None),
+                        Attendance.date >= start,
+                        Attendance.date <= end,
+                    )
+                    .values(session_id=session_id)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                start = end + timedelta(days=1)
+
+        years_back = func.max(Student.class_ - Result.class_, 0)
+        offsets = [
+            offset for (offset,) in db.query(years_back).select_from(Result).join(
+                Student, Student.id == Result.student_id
+            ).filter(Result.session_id.is_(None)).distinct()
+        ]
+        current_start = session_start(today)
+        for offset in offsets:
+            session_id = (
+                current if offset == 0
+                else get_session_id_for_date(
+                    db, current_start.replace(year=current_start.year - offset), create=True
+                )
+            )
+            unassigned = select(Result.id).join(Student, Student.id == Result.student_id).where(
+                Result.session_id.is_(None), years_back == offset
+            )
+            assigned["results"] += db.execute(
+                update(Result)
+                .where(Result.id.in_(unassigned))
+                .values(session_id=session_id)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return assigned
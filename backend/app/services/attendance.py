@@ -1,12 +1,33 @@
 """Attendance management service"""
 from datetime import date
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+from sqlalchemy import case, func, insert, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.models import Attendance, Student
 from app.enums.attendance_enum import AttendanceStatus
+from app.services.academic_sessions import get_session_id_for_date, session_scope
+from app.services.attendance_bitmap import bitmap_enabled, record_marks
+from app.services.calendar import count_working_days, non_working_day_clause
+from app.services.cold_archive import archived_column_rows, archived_objects, archived_sessions
+from app.services.identifiers import (
+    get_columns_for_student_identifier,
+    get_rows_for_student_identifier,
+    resolve_student_pk,
+)
+
+# Column tuples for the fast serialization path, labelled with the JSON
+# field names of the attendance response schemas.
+ATTENDANCE_COLUMNS = (
+    Attendance.id,
+    Attendance.student_id,
+    Attendance.class_.label("class"),
+    Attendance.date,
+    Attendance.status,
+)
+ATTENDANCE_SUMMARY_COLUMNS = (Attendance.date, Attendance.status)
 
 
 def get_students_for_attendance(db: Session, class_: int) -> List[Student]:
@@ -33,7 +54,8 @@ def mark_attendance(
     """
     Mark or update attendance for a student on a specific date.
     
-    Uses upsert logic: updates if exists, creates if doesn't exist.
+    Uses upsert logic: updates if exists, creates if doesn't exist. New
+    marks are stamped with the academic session covering the date.
     
     Args:
         db: Database session
@@ -44,11 +66,16 @@ def mark_attendance(
         
     Returns:
         Attendance object or None if student doesn't exist
+
+    Raises:
+        ValueError: If the date falls in an archived academic session
     """
     # Verify student exists
     student = db.query(Student).filter(Student.id == student_id).first()
     if not student:
         return None
+
+    session_id = get_session_id_for_date(db, attendance_date, create=True)
     
     # Check if attendance already exists
     existing = db.query(Attendance).filter(
@@ -56,6 +83,9 @@ def mark_attendance(
         Attendance.date == attendance_date
     ).first()
     
+    if bitmap_enabled():
+        record_marks(db, class_, attendance_date, {student_id: status})
+
     if existing:
         # Update existing
         existing.status = status
@@ -68,7 +98,8 @@ def mark_attendance(
             student_id=student_id,
             class_=class_,
             date=attendance_date,
-            status=status
+            status=status,
+            session_id=session_id
         )
         db.add(new_attendance)
         db.commit()
@@ -85,6 +116,12 @@ def mark_attendance_bulk(
     """
     Mark attendance for multiple students in bulk.
     
+    Same upsert rules as mark_attendance, but set-based: one query to
+    validate the students, one to find existing marks for the date, then
+    one batched UPDATE and one batched INSERT, all in a single transaction
+    regardless of class size. Month bitmaps, when enabled, are updated in
+    the same transaction.
+    
     Args:
         db: Database session
         class_: Class number
@@ -93,17 +130,73 @@ def mark_attendance_bulk(
         
     Returns:
         Dict with success count, failed count, and failed list
+
+    Raises:
+        ValueError: If the date falls in an archived academic session
     """
+    # Last status wins if a student appears more than once
+    statuses = {}
+    for attendance_data in attendances_data:
+        statuses[attendance_data["student_id"]] = attendance_data["status"]
+
+    requested_ids = list(statuses)
+    known_ids = set()
+    if requested_ids:
+        known_ids = {
+            student_id
+            for (student_id,) in db.query(Student.id).filter(
+                Student.id.in_(requested_ids)
+            ).all()
+        }
+
+    existing = {}
+    if known_ids:
+        existing = dict(
+            db.query(Attendance.student_id, Attendance.id).filter(
+                Attendance.student_id.in_(known_ids),
+                Attendance.date == attendance_date
+            ).all()
+        )
+
+    session_id = get_session_id_for_date(db, attendance_date, create=True) if known_ids else None
+
+    updates = [
+        {"id": existing[student_id], "status": statuses[student_id]}
+        for student_id in known_ids
+        if student_id in existing
+    ]
+    inserts = [
+        {
+            "student_id": student_id,
+            "class_": class_,
+            "date": attendance_date,
+            "status": statuses[student_id],
+            "session_id": session_id,
+        }
+        for student_id in known_ids
+        if student_id not in existing
+    ]
+
+    try:
+        if updates:
+            db.execute(update(Attendance), updates)
+        if inserts:
+            db.execute(insert(Attendance), inserts)
+        if bitmap_enabled():
+            record_marks(
+                db, class_, attendance_date,
+                {student_id: statuses[student_id] for student_id in known_ids}
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
     success_count = 0
     failed_students = []
-    
     for attendance_data in attendances_data:
         student_id = attendance_data["student_id"]
-        status = attendance_data["status"]
-        
-        result = mark_attendance(db, student_id, class_, attendance_date, status)
-        
-        if result:
+        if student_id in known_ids:
             success_count += 1
         else:
             failed_students.append(student_id)
@@ -139,18 +232,190 @@ def get_attendance(
 
 def get_student_attendance_history(
     db: Session,
-    student_id: int
+    student_id: int,
+    session_id: Optional[int] = None,
+    all_sessions: bool = False
 ) -> List[Attendance]:
     """
-    Get all attendance records for a student.
+    Get a student's attendance records for an academic session.
+    
+    Cold-archived sessions are read from their archive files when asked
+    for (by session_id or all_sessions).
     
     Args:
         db: Database session
         student_id: Student database ID
+        session_id: Academic session (default: the current session)
+        all_sessions: Return every session's records instead
         
     Returns:
         List of Attendance objects
     """
-    return db.query(Attendance).filter(
-        Attendance.student_id == student_id
+    records = db.query(Attendance).filter(
+        Attendance.student_id == student_id,
+        *session_scope(db, Attendance.session_id, session_id, all_sessions)
     ).order_by(Attendance.date.desc()).all()
+
+    archived = archived_sessions(db, session_id, all_sessions)
+    if archived:
+        records += archived_objects(Attendance, archived, student_id=student_id)
+        records.sort(key=lambda record: record.date, reverse=True)
+    return records
+
+
+def get_student_attendance_history_by_identifier(
+    db: Session,
+    identifier: str,
+    session_id: Optional[int] = None,
+    all_sessions: bool = False
+) -> List[Attendance]:
+    """
+    Get a student's attendance records by database ID or student_id string.
+    
+    Args:
+        db: Database session
+        identifier: Database ID (digits) or student_id string (e.g. STU5001)
+        session_id: Academic session (default: the current session)
+        all_sessions: Return every session's records instead
+        
+    Returns:
+        List of Attendance objects (empty if the student doesn't exist)
+    """
+    records = get_rows_for_student_identifier(
+        db, identifier, Attendance, Attendance.date.desc(),
+        filters=session_scope(db, Attendance.session_id, session_id, all_sessions)
+    )
+
+    archived = archived_sessions(db, session_id, all_sessions)
+    student_pk = resolve_student_pk(db, identifier) if archived else None
+    if student_pk is not None:
+        records += archived_objects(Attendance, archived, student_id=student_pk)
+        records.sort(key=lambda record: record.date, reverse=True)
+    return records
+
+
+def get_student_attendance_rows(
+    db: Session,
+    student_id: int,
+    session_id: Optional[int] = None,
+    all_sessions: bool = False
+) -> List[Dict]:
+    """
+    Get a student's attendance as dicts shaped like StudentAttendanceSummary.
+    
+    Args:
+        db: Database session
+        student_id: Student database ID
+        session_id: Academic session (default: the current session)
+        all_sessions: Return every session's records instead
+        
+    Returns:
+        List of dicts keyed by response field name, newest first
+    """
+    rows = [
+        row._asdict()
+        for row in db.query(*ATTENDANCE_SUMMARY_COLUMNS).filter(
+            Attendance.student_id == student_id,
+            *session_scope(db, Attendance.session_id, session_id, all_sessions)
+        ).order_by(Attendance.date.desc())
+    ]
+
+    archived = archived_sessions(db, session_id, all_sessions)
+    if archived:
+        rows += archived_column_rows(
+            Attendance, ATTENDANCE_SUMMARY_COLUMNS, archived, student_id=student_id
+        )
+        rows.sort(key=lambda row: row["date"], reverse=True)
+    return rows
+
+
+def get_student_attendance_rows_by_identifier(
+    db: Session,
+    identifier: str,
+    session_id: Optional[int] = None,
+    all_sessions: bool = False
+) -> List[Dict]:
+    """
+    Get a student's attendance as dicts shaped like AttendanceResponse.
+    
+    Args:
+        db: Database session
+        identifier: Database ID (digits) or student_id string (e.g. STU5001)
+        session_id: Academic session (default: the current session)
+        all_sessions: Return every session's records instead
+        
+    Returns:
+        List of dicts keyed by response field name, newest first (empty if
+        the student doesn't exist)
+    """
+    rows = get_columns_for_student_identifier(
+        db, identifier, Attendance, ATTENDANCE_COLUMNS, Attendance.date.desc(),
+        filters=session_scope(db, Attendance.session_id, session_id, all_sessions)
+    )
+
+    archived = archived_sessions(db, session_id, all_sessions)
+    student_pk = resolve_student_pk(db, identifier) if archived else None
+    if student_pk is not None:
+        rows += archived_column_rows(Attendance, ATTENDANCE_COLUMNS, archived, student_id=student_pk)
+        rows.sort(key=lambda row: row["date"], reverse=True)
+    return rows
+
+
+def get_student_attendance_summary(
+    db: Session,
+    student_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> Optional[Dict]:
+    """
+    Summarize a student's attendance over working days.
+
+    Marks on dates the school calendar closes for the class they were
+    taken in, and legacy per-student HOLIDAY marks, are left out. Working
+    days come from the calendar for the student's current class.
+
+    Args:
+        db: Database session
+        student_id: Student database ID
+        start: Optional first date (default: the student's first mark)
+        end: Optional last date (default: today)
+
+    Returns:
+        Dict shaped like AttendanceSummaryResponse, or None if the student
+        doesn't exist
+    """
+    class_ = db.query(Student.class_).filter(Student.id == student_id).scalar()
+    if class_ is None:
+        return None
+
+    end = end or date.today()
+    filters = [
+        Attendance.student_id == student_id,
+        Attendance.date <= end,
+        Attendance.status != AttendanceStatus.HOLIDAY,
+        ~non_working_day_clause(Attendance.date, Attendance.class_),
+    ]
+    if start is not None:
+        filters.append(Attendance.date >= start)
+
+    first_marked, present, absent = db.query(
+        func.min(Attendance.date),
+        func.coalesce(func.sum(case((Attendance.status == AttendanceStatus.PRESENT, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((Attendance.status == AttendanceStatus.ABSENT, 1), else_=0)), 0),
+    ).filter(*filters).one()
+
+    start = start or first_marked or end
+    working_days = count_working_days(db, start, end, class_)["working_days"]
+    marked = present + absent
+
+    return {
+        "student_id": student_id,
+        "start": start,
+        "end": end,
+        "working_days": working_days,
+        "present": int(present),
+        "absent": int(absent),
+        # Marks on a weekly day off (a make-up day) can exceed the count
+        "unmarked": max(working_days - marked, 0),
+        "attendance_percentage": (present / marked) * 100.0 if marked else 0.0,
+    }
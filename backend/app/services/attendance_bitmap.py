@@ -0,0 +1,429 @@
+"""Month bitmap attendance storage.
+
+An attendance row per student per day costs a surrogate key, a date, a
+status and three index entries; over a few years a school accumulates
+millions of them. ``attendance_months`` packs one student's month into
+three 31-bit masks (present, absent, holiday), so five years of history
+is about 60 small rows per student. Monthly summaries, percentages and
+streaks are computed from those masks with bit operations, with the
+weekly days off and the school calendar applied as one more mask at read
+time.
+
+The attendance rows stay the source of truth. With
+``ATTENDANCE_BITMAP_ENABLED`` the attendance service updates the bitmaps
+in the same transaction as every mark, and ``rebuild_attendance_months``
+(re)builds them from the rows. Without it, readers fold the rows into the
+same masks on the fly, so the API answers the same either way.
+"""
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.enums.attendance_enum import AttendanceStatus
+from app.models import Attendance, AttendanceMonth, SchoolCalendarDay, Student
+from app.services.calendar import NON_WORKING_DAY_TYPES, weekly_off_days
+
+# Mask column per status; a day's bit is set in at most one of them
+MASK_COLUMNS = {
+    AttendanceStatus.PRESENT: "present_days",
+    AttendanceStatus.ABSENT: "absent_days",
+    AttendanceStatus.HOLIDAY: "holiday_days",
+}
+MASK_INDEX = {status: index for index, status in enumerate(MASK_COLUMNS)}
+FULL_MONTH_MASK = (1 << 31) - 1
+REBUILD_BATCH_SIZE = 5000
+
+# (student_id, month) -> [class_, present, absent, holiday]
+MonthMasks = Dict[Tuple[int, date], List[int]]
+
+
+def bitmap_enabled() -> bool:
+    """Whether the month bitmaps are maintained and read."""
+    return settings.ATTENDANCE_BITMAP_ENABLED
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing ``day``."""
+    return day.replace(day=1)
+
+
+def _next_month(month: date) -> date:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def _months(start: date, end: date) -> Iterator[date]:
+    month = month_start(start)
+    while month <= end:
+        yield month
+        month = _next_month(month)
+
+
+def day_bit(day: date) -> int:
+    """Bit of ``day`` in its month's masks."""
+    return 1 << (day.day - 1)
+
+
+def days_mask(month: date, through: Optional[date] = None) -> int:
+    """Mask of the days of a month, optionally only up to ``through``."""
+    days = monthrange(month.year, month.month)[1]
+    if through is not None and month_start(through) == month:
+        days = through.day
+    return (1 << days) - 1
+
+
+def _runs(mask: int) -> Iterator[int]:
+    """Split a mask into its runs of consecutive set bits, lowest first."""
+    while mask:
+        low = mask & -mask
+        run = ((mask + low) & ~mask) - low
+        yield run
+        mask ^= run
+
+
+def _fold(rows: Iterable) -> MonthMasks:
+    """Fold (student_id, class_, date, status) rows into month masks."""
+    masks: MonthMasks = {}
+    for student_id, class_, day, status in rows:
+        entry = masks.setdefault((student_id, month_start(day)), [class_, 0, 0, 0])
+        entry[0] = class_
+        entry[1 + MASK_INDEX[AttendanceStatus(status)]] |= day_bit(day)
+    return masks
+
+
+def record_marks(
+    db: Session,
+    class_: int,
+    attendance_date: date,
+    statuses: Dict[int, AttendanceStatus]
+) -> None:
+    """
+    Apply one date's marks to the month bitmaps.
+
+    Does not commit; called by the attendance service inside the
+    transaction that writes the rows. One query for the existing months,
+    one batched INSERT and at most one UPDATE per status.
+
+    Args:
+        db: Database session
+        class_: Class number
+        attendance_date: Date of the marks
+        statuses: Student database ID -> status
+    """
+    if not statuses:
+        return
+
+    month = month_start(attendance_date)
+    bit = day_bit(attendance_date)
+    keep = FULL_MONTH_MASK ^ bit
+
+    existing = {
+        student_id
+        for (student_id,) in db.query(AttendanceMonth.student_id).filter(
+            AttendanceMonth.month == month,
+            AttendanceMonth.student_id.in_(list(statuses)),
+        )
+    }
+
+    by_status = defaultdict(list)
+    for student_id in existing:
+        by_status[statuses[student_id]].append(student_id)
+
+    for status, student_ids in by_status.items():
+        values = {
+            name: getattr(AttendanceMonth, name).bitwise_and(keep)
+            for name in MASK_COLUMNS.values()
+        }
+        values[MASK_COLUMNS[status]] = getattr(AttendanceMonth, MASK_COLUMNS[status]).bitwise_or(bit)
+        values["class_"] = class_
+        db.execute(
+            update(AttendanceMonth)
+            .where(AttendanceMonth.month == month, AttendanceMonth.student_id.in_(student_ids))
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+
+    inserts = [
+        {
+            "student_id": student_id,
+            "month": month,
+            "class_": class_,
+            **{name: bit if status == mask_status else 0 for mask_status, name in MASK_COLUMNS.items()},
+        }
+        for student_id, status in statuses.items()
+        if student_id not in existing
+    ]
+    if inserts:
+        db.execute(insert(AttendanceMonth), inserts)
+
+
+def rebuild_attendance_months(db: Session, student_ids: Optional[List[int]] = None) -> dict:
+    """
+    Rebuild the month bitmaps from the attendance rows.
+
+    Args:
+        db: Database session
+        student_ids: Optional students to rebuild (default: everyone)
+
+    Returns:
+        Dict with months written and attendance_rows read
+    """
+    query = db.query(
+        Attendance.student_id, Attendance.class_, Attendance.date, Attendance.status
+    ).order_by(Attendance.student_id, Attendance.date)
+    clear = delete(AttendanceMonth)
+    if student_ids is not None:
+        query = query.filter(Attendance.student_id.in_(student_ids))
+        clear = clear.where(AttendanceMonth.student_id.in_(student_ids))
+
+    rows_read = 0
+
+    def counted(rows):
+        nonlocal rows_read
+        for row in rows:
+            rows_read += 1
+            yield row
+
+    masks = _fold(counted(query.yield_per(REBUILD_BATCH_SIZE)))
+    records = [
+        {
+            "student_id": student_id,
+            "month": month,
+            "class_": class_,
+            "present_days": present,
+            "absent_days": absent,
+            "holiday_days": holiday,
+        }
+        for (student_id, month), (class_, present, absent, holiday) in masks.items()
+    ]
+
+    try:
+        db.execute(clear)
+        for offset in range(0, len(records), REBUILD_BATCH_SIZE):
+            db.execute(insert(AttendanceMonth), records[offset:offset + REBUILD_BATCH_SIZE])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {"months": len(records), "attendance_rows": rows_read}
+
+
+def backfill_attendance_months(db: Session) -> None:
+    """
+    Build the month bitmaps once when they are enabled on an existing
+    database (attendance rows but no bitmaps). Safe to run repeatedly.
+    """
+    if not bitmap_enabled():
+        return
+    if db.query(AttendanceMonth.student_id).first() is not None:
+        return
+    if db.query(Attendance.id).first() is None:
+        return
+    rebuild_attendance_months(db)
+
+
+def _load_masks(
+    db: Session,
+    start: date,
+    end: date,
+    student_id: Optional[int] = None,
+    class_: Optional[int] = None
+) -> MonthMasks:
+    """Month masks for one student or one class, from bitmaps or rows."""
+    if bitmap_enabled():
+        query = db.query(
+            AttendanceMonth.student_id,
+            AttendanceMonth.month,
+            AttendanceMonth.class_,
+            AttendanceMonth.present_days,
+            AttendanceMonth.absent_days,
+            AttendanceMonth.holiday_days,
+        ).filter(
+            AttendanceMonth.month >= month_start(start),
+            AttendanceMonth.month <= end,
+        )
+        if student_id is not None:
+            query = query.filter(AttendanceMonth.student_id == student_id)
+        if class_ is not None:
+            query = query.filter(AttendanceMonth.class_ == class_)
+        return {(row[0], row[1]): list(row[2:]) for row in query}
+
+    query = db.query(
+        Attendance.student_id, Attendance.class_, Attendance.date, Attendance.status
+    ).filter(
+        Attendance.date >= month_start(start),
+        Attendance.date <= end,
+    )
+    if student_id is not None:
+        query = query.filter(Attendance.student_id == student_id)
+    if class_ is not None:
+        query = query.filter(Attendance.class_ == class_)
+    return _fold(query)
+
+
+def _non_working_masks(db: Session, start: date, end: date) -> Dict[Tuple[date, Optional[int]], int]:
+    """Weekly days off and calendar closures per (month, class); class None is school-wide."""
+    masks: Dict[Tuple[date, Optional[int]], int] = defaultdict(int)
+
+    off = weekly_off_days()
+    for month in _months(start, end):
+        day = month
+        while day.month == month.month:
+            if day.weekday() in off:
+                masks[(month, None)] |= day_bit(day)
+            day += timedelta(days=1)
+
+    for day, class_ in db.query(SchoolCalendarDay.date, SchoolCalendarDay.class_).filter(
+        SchoolCalendarDay.date >= month_start(start),
+        SchoolCalendarDay.date <= end,
+        SchoolCalendarDay.day_type.in_(NON_WORKING_DAY_TYPES),
+    ):
+        masks[(month_start(day), class_)] |= day_bit(day)
+
+    return masks
+
+
+def _summarize(month: date, class_: int, masks: List[int], non_working: int, days: int) -> dict:
+    """Bit-operation summary of one month."""
+    _, present, absent, holiday = masks
+    working = days & ~non_working
+    present_count = (present & working).bit_count()
+    absent_count = (absent & working).bit_count()
+    marked = present_count + absent_count
+    return {
+        "month": month,
+        "class": class_,
+        "working_days": working.bit_count(),
+        "present": present_count,
+        "absent": absent_count,
+        "holidays": ((holiday | non_working) & days).bit_count(),
+        "unmarked": (working & ~(present | absent)).bit_count(),
+        "attendance_percentage": (present_count / marked) * 100.0 if marked else 0.0,
+    }
+
+
+def get_student_monthly_attendance(
+    db: Session,
+    student_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> Optional[dict]:
+    """
+    Month-by-month attendance with streaks for a student.
+
+    Months without any mark are left out of ``months`` but still break
+    streaks. A streak is consecutive working days present; weekly days
+    off, holidays and closures neither extend nor break it.
+
+    Args:
+        db: Database session
+        student_id: Student database ID
+        start: Optional first date (default: first marked month)
+        end: Optional last date (default: today)
+
+    Returns:
+        Dict shaped like StudentMonthlyAttendanceResponse, or None if the
+        student doesn't exist
+    """
+    current_class = db.query(Student.class_).filter(Student.id == student_id).scalar()
+    if current_class is None:
+        return None
+
+    end = end or date.today()
+    masks = _load_masks(db, start or date.min, end, student_id=student_id)
+    marked_months = sorted(month for _, month in masks)
+    months: List[dict] = []
+    current_streak = longest_streak = 0
+
+    if marked_months:
+        first = month_start(start) if start else marked_months[0]
+        non_working = _non_working_masks(db, first, end)
+
+        streak_days = present_days = marked_days = 0
+        offset = 0
+        class_ = current_class
+        for month in _months(first, end):
+            days = days_mask(month, end)
+            if start is not None and month == month_start(start):
+                days &= ~((1 << (start.day - 1)) - 1)
+            month_masks = masks.get((student_id, month))
+            if month_masks is not None:
+                class_ = month_masks[0]
+            closed = (
+                non_working.get((month, None), 0) | non_working.get((month, class_), 0)
+            ) & days
+            _, present, absent, holiday = month_masks or (class_, 0, 0, 0)
+            working = days & ~closed
+
+            if month_masks is not None:
+                months.append(_summarize(month, class_, month_masks, closed, days))
+
+            streak_days |= ((present & working) | closed | (holiday & days)) << offset
+            present_days |= (present & working) << offset
+            marked_days |= ((present | absent) & days) << offset
+            offset += days.bit_length()
+
+        runs = list(_runs(streak_days))
+        longest_streak = max(((run & present_days).bit_count() for run in runs), default=0)
+        if marked_days:
+            last_marked = 1 << (marked_days.bit_length() - 1)
+            current_run = next((run for run in runs if run & last_marked), 0)
+            current_streak = (current_run & present_days).bit_count()
+
+    present = sum(month["present"] for month in months)
+    absent = sum(month["absent"] for month in months)
+    return {
+        "student_id": student_id,
+        "months": months,
+        "present": present,
+        "absent": absent,
+        "attendance_percentage": (present / (present + absent)) * 100.0 if present + absent else 0.0,
+        "current_streak": current_streak,
+        "longest_streak": longest_streak,
+    }
+
+
+def get_class_monthly_attendance(db: Session, class_: int, month: date) -> List[dict]:
+    """
+    One month's attendance for every student marked in a class.
+
+    Students are grouped by the class they were marked in that month.
+
+    Args:
+        db: Database session
+        class_: Class number (1-10)
+        month: Any date in the month
+
+    Returns:
+        List of dicts shaped like ClassMonthlyAttendanceResponse, ordered
+        by student database ID
+    """
+    month = month_start(month)
+    end = _next_month(month) - timedelta(days=1)
+    masks = _load_masks(db, month, end, class_=class_)
+    if not masks:
+        return []
+
+    non_working = _non_working_masks(db, month, end)
+    closed = non_working.get((month, None), 0) | non_working.get((month, class_), 0)
+    days = days_mask(month, min(end, date.today()) if month <= date.today() else None)
+
+    names = dict(
+        db.query(Student.id, Student.name).filter(
+            Student.id.in_([student_id for student_id, _ in masks])
+        ).all()
+    )
+
+    return [
+        {
+            "id": student_id,
+            "name": names.get(student_id),
+            **_summarize(month, class_, month_masks, closed & days, days),
+        }
+        for (student_id, _), month_masks in sorted(masks.items())
+    ]
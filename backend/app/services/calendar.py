@@ -0,0 +1,308 @@
+"""School calendar service.
+
+Holidays, exam days and closures are stored once per date, for the whole
+school (``class_`` NULL) or for one class, instead of as a HOLIDAY
+attendance row for every student. Attendance aggregates exclude
+non-working days with ``non_working_day_clause``, a correlated EXISTS
+against the calendar, and working days are counted from the calendar and
+the weekly days off (``SCHOOL_WEEKLY_OFF_DAYS``).
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, FrozenSet, List, Optional
+
+from sqlalchemy import and_, case, delete, exists, func, insert, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.enums.attendance_enum import AttendanceStatus
+from app.enums.calendar_enum import CalendarDayType
+from app.models import Attendance, SchoolCalendarDay
+from app.services.writes import delete_by_id
+
+# Day types on which the school (or class) does not meet
+NON_WORKING_DAY_TYPES = (CalendarDayType.HOLIDAY, CalendarDayType.CLOSURE)
+WEEKDAY_NAMES = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+
+
+def weekly_off_days() -> FrozenSet[int]:
+    """Weekdays (``date.weekday()`` numbers) the school is always closed."""
+    names = [name.strip().upper()[:3] for name in settings.SCHOOL_WEEKLY_OFF_DAYS.split(",")]
+    return frozenset(WEEKDAY_NAMES.index(name) for name in names if name in WEEKDAY_NAMES)
+
+
+def _applies_to(class_) -> object:
+    """Filter for calendar entries covering a class (or a class column)."""
+    return or_(SchoolCalendarDay.class_.is_(None), SchoolCalendarDay.class_ == class_)
+
+
+def non_working_day_clause(date_column, class_column) -> object:
+    """
+    Condition true when a holiday or closure covers a date and class.
+
+    Correlated EXISTS for filtering attendance (or any table with a date
+    and class column) against the calendar in the same statement.
+
+    Args:
+        date_column: Date column or value
+        class_column: Class column or value
+
+    Returns:
+        SQL boolean expression
+    """
+    return exists().where(
+        SchoolCalendarDay.date == date_column,
+        SchoolCalendarDay.day_type.in_(NON_WORKING_DAY_TYPES),
+        _applies_to(class_column),
+    )
+
+
+def list_calendar_days(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    class_: Optional[int] = None
+) -> List[SchoolCalendarDay]:
+    """
+    List calendar entries, oldest first.
+
+    Args:
+        db: Database session
+        start: Optional first date (inclusive)
+        end: Optional last date (inclusive)
+        class_: Optional class; school-wide entries are always included
+
+    Returns:
+        List of SchoolCalendarDay objects
+    """
+    query = db.query(SchoolCalendarDay)
+    if start is not None:
+        query = query.filter(SchoolCalendarDay.date >= start)
+    if end is not None:
+        query = query.filter(SchoolCalendarDay.date <= end)
+    if class_ is not None:
+        query = query.filter(_applies_to(class_))
+    return query.order_by(SchoolCalendarDay.date, SchoolCalendarDay.class_).all()
+
+
+def set_calendar_days(
+    db: Session,
+    start: date,
+    end: Optional[date],
+    day_type: CalendarDayType,
+    title: str,
+    class_: Optional[int] = None
+) -> List[SchoolCalendarDay]:
+    """
+    Declare a holiday, exam day or closure for every date in a range.
+
+    An existing entry for the same date and class (or the whole school) is
+    replaced, so one row per date is kept. The new entries are returned
+    detached, so serializing them after the commit needs no refresh.
+
+    Args:
+        db: Database session
+        start: First date
+        end: Last date (inclusive), or None for a single day
+        day_type: Calendar day type
+        title: Short description shown on the calendar
+        class_: Optional class (1-10); None for the whole school
+
+    Returns:
+        List of SchoolCalendarDay objects, oldest first
+    """
+    end = end or start
+    dates = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    same_scope = (
+        SchoolCalendarDay.class_.is_(None) if class_ is None
+        else SchoolCalendarDay.class_ == class_
+    )
+
+    try:
+        db.execute(
+            delete(SchoolCalendarDay).where(
+                same_scope,
+                SchoolCalendarDay.date >= start,
+                SchoolCalendarDay.date <= end,
+            )
+        )
+        # One batched INSERT ... RETURNING; row order is not guaranteed
+        days = sorted(
+            db.scalars(
+                insert(SchoolCalendarDay).returning(SchoolCalendarDay),
+                [
+                    {"date": day, "class_": class_, "day_type": day_type, "title": title}
+                    for day in dates
+                ],
+            ).all(),
+            key=lambda day: day.date,
+        )
+        for day in days:
+            db.expunge(day)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return days
+
+
+def delete_calendar_day(db: Session, day_id: int) -> bool:
+    """
+    Delete a calendar entry.
+
+    Args:
+        db: Database session
+        day_id: Calendar entry database ID
+
+    Returns:
+        True if deleted, False if not found
+    """
+    deleted = delete_by_id(db, SchoolCalendarDay, day_id)
+
+    if not deleted:
+        return False
+
+    db.commit()
+    return True
+
+
+def get_closure(db: Session, on_date: date, class_: int) -> Optional[SchoolCalendarDay]:
+    """
+    Get the holiday or closure covering a class on a date, if any.
+
+    Weekly days off are not calendar entries and are not reported here.
+
+    Args:
+        db: Database session
+        on_date: Date
+        class_: Class number (1-10)
+
+    Returns:
+        SchoolCalendarDay object (class-specific first) or None
+    """
+    return db.query(SchoolCalendarDay).filter(
+        SchoolCalendarDay.date == on_date,
+        SchoolCalendarDay.day_type.in_(NON_WORKING_DAY_TYPES),
+        _applies_to(class_),
+    ).order_by(SchoolCalendarDay.class_.is_(None)).first()
+
+
+def count_working_days(
+    db: Session,
+    start: date,
+    end: date,
+    class_: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Count working days in a date range.
+
+    A working day is any date that is not a weekly day off and has no
+    holiday or closure for the class (or, without a class, for the whole
+    school). One query for the calendar dates in the range.
+
+    Args:
+        db: Database session
+        start: First date (inclusive)
+        end: Last date (inclusive)
+        class_: Optional class (1-10)
+
+    Returns:
+        Dict with working_days and non_working_days
+    """
+    if end < start:
+        return {"working_days": 0, "non_working_days": 0}
+
+    scope = SchoolCalendarDay.class_.is_(None) if class_ is None else _applies_to(class_)
+    closed = {
+        day
+        for (day,) in db.query(SchoolCalendarDay.date).filter(
+            SchoolCalendarDay.date >= start,
+            SchoolCalendarDay.date <= end,
+            SchoolCalendarDay.day_type.in_(NON_WORKING_DAY_TYPES),
+            scope,
+        ).distinct()
+    }
+
+    off = weekly_off_days()
+    total_days = (end - start).days + 1
+    working_days = sum(
+        1
+        for offset in range(total_days)
+        if (day := start + timedelta(days=offset)).weekday() not in off and day not in closed
+    )
+    return {"working_days": working_days, "non_working_days": total_days - working_days}
+
+
+def collapse_uniform_holidays(db: Session) -> dict:
+    """
+    Replace per-student HOLIDAY attendance with calendar entries.
+
+    For every date and class where all attendance is HOLIDAY, the rows are
+    deleted and a holiday is added to the calendar: one school-wide entry
+    when every class with attendance that day was on holiday, otherwise
+    one per class. Classes with mixed marks keep their rows. Safe to run
+    repeatedly; returns at once when there are no HOLIDAY rows.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Dict with calendar_days created and attendance_rows removed
+    """
+    if db.query(Attendance.id).filter(Attendance.status == AttendanceStatus.HOLIDAY).first() is None:
+        return {"calendar_days": 0, "attendance_rows": 0}
+
+    holiday_dates = db.query(Attendance.date).filter(
+        Attendance.status == AttendanceStatus.HOLIDAY
+    ).distinct().subquery()
+    groups = db.query(
+        Attendance.date,
+        Attendance.class_,
+        func.sum(case((Attendance.status == AttendanceStatus.HOLIDAY, 0), else_=1)),
+    ).filter(
+        Attendance.date.in_(holiday_dates.select())
+    ).group_by(Attendance.date, Attendance.class_).all()
+
+    uniform: Dict[date, List[int]] = defaultdict(list)
+    mixed_dates = set()
+    for day, class_, marked in groups:
+        if marked:
+            mixed_dates.add(day)
+        else:
+            uniform[day].append(class_)
+
+    existing = {
+        (day, class_)
+        for day, class_ in db.query(SchoolCalendarDay.date, SchoolCalendarDay.class_).filter(
+            SchoolCalendarDay.date.in_(list(uniform))
+        )
+    } if uniform else set()
+
+    entries = []
+    removed = 0
+    try:
+        for day, classes in sorted(uniform.items()):
+            scopes = [None] if day not in mixed_dates else classes
+            entries.extend(
+                {"date": day, "class_": class_, "day_type": CalendarDayType.HOLIDAY, "title": "Holiday"}
+                for class_ in scopes
+                if (day, class_) not in existing and (day, None) not in existing
+            )
+            removed += db.execute(
+                delete(Attendance).where(
+                    and_(
+                        Attendance.date == day,
+                        Attendance.class_.in_(classes),
+                        Attendance.status == AttendanceStatus.HOLIDAY,
+                    )
+                )
+            ).rowcount
+        if entries:
+            db.execute(insert(SchoolCalendarDay), entries)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {"calendar_days": len(entries), "attendance_rows": removed}
@@ -0,0 +1,367 @@
+"""Cold archive of old academic sessions to columnar files.
+
+``archive_history`` exports the attendance, results and settled fees of
+every academic session that ended before a cutoff to zstd-compressed
+Parquet (or Arrow IPC) files, one directory per session under
+``ARCHIVE_DIR``, then deletes them from the live tables (dropping the
+session's partitions on PostgreSQL). Unpaid fees stay live so dues are
+never lost; student balances are running totals and are not touched.
+
+The attendance and results history services read a cold-archived session
+from its files, memory-mapped and filtered on the student, when that
+session (or every session) is asked for.
+
+Requires the optional ``pyarrow`` package; without it archiving and
+reading archived sessions raise RuntimeError, and everything else works.
+"""
+import enum
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import Date, DateTime, Enum, Float, Integer, delete, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import Label
+
+from app.core.config import settings
+from app.models import AcademicSession, Attendance, Fees, Result
+from app.services.academic_sessions import remove_session_history, session_start
+from app.services.pdfs import UPLOADS_DIR
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+ARCHIVED_MODELS = (Attendance, Result, Fees)
+ARCHIVE_FORMATS = ("parquet", "arrow")
+
+# Rows per exported batch; each batch is one Parquet row group, so reads
+# filtered on student_id (rows are sorted by it) skip most of the file
+EXPORT_BATCH_SIZE = 16384
+
+
+def archive_dir() -> Path:
+    """Directory holding one subdirectory of archive files per session."""
+    if settings.ARCHIVE_DIR:
+        return Path(settings.ARCHIVE_DIR)
+    return UPLOADS_DIR.parent / "archive"
+
+
+def _require_pyarrow() -> None:
+    if pyarrow is None:
+        raise RuntimeError("The cold archive requires the pyarrow package")
+
+
+def _archive_format() -> str:
+    archive_format = settings.ARCHIVE_FORMAT.lower()
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"ARCHIVE_FORMAT must be one of {', '.join(ARCHIVE_FORMATS)}")
+    return archive_format
+
+
+def _arrow_type(column):
+    column_type = column.type
+    if isinstance(column_type, Enum):
+        return pyarrow.string()
+    if isinstance(column_type, Integer):
+        return pyarrow.int64()
+    if isinstance(column_type, Float):
+        return pyarrow.float64()
+    if isinstance(column_type, DateTime):
+        return pyarrow.timestamp("us")
+    if isinstance(column_type, Date):
+        return pyarrow.date32()
+    return pyarrow.string()
+
+
+def _arrow_schema(table):
+    return pyarrow.schema([
+        pyarrow.field(column.name, _arrow_type(column), nullable=column.nullable or False)
+        for column in table.columns
+    ])
+
+
+def _session_criteria(model, academic_session: AcademicSession) -> list:
+    """Rows of a model that belong to a session's cold archive."""
+    if model is Fees:
+        start = datetime.combine(academic_session.start_date, datetime.min.time())
+        end = datetime.combine(academic_session.end_date + timedelta(days=1), datetime.min.time())
+        return [
+            Fees.created_at >= start,
+            Fees.created_at < end,
+            Fees.due_amount_paise == 0,
+        ]
+    return [model.session_id == academic_session.id]
+
+
+def _export(db: Session, model, criteria: list, path: Path, archive_format: str) -> int:
+    """Stream matching rows into a compressed file; returns rows written."""
+    table = model.__table__
+    schema = _arrow_schema(table)
+    partial = path.with_name(path.name + ".partial")
+    result = db.execute(
+        select(table).where(*criteria).order_by(table.c.student_id, table.c.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    if archive_format == "parquet":
+        writer = pyarrow.parquet.ParquetWriter(partial, schema, compression="zstd")
+    else:
+        writer = pyarrow.ipc.new_file(
+            str(partial), schema, options=pyarrow.ipc.IpcWriteOptions(compression="zstd")
+        )
+
+    written = 0
+    try:
+        for rows in result.partitions():
+            batch = pyarrow.RecordBatch.from_pylist(
+                [
+                    {
+                        name: value.value if isinstance(value, enum.Enum) else value
+                        for name, value in row._mapping.items()
+                    }
+                    for row in rows
+                ],
+                schema=schema,
+            )
+            writer.write_batch(batch)
+            written += len(rows)
+    finally:
+        writer.close()
+
+    os.replace(partial, path)
+    return written
+
+
+def archive_history(
+    db: Session,
+    before: date,
+    dry_run: bool = False,
+    report_progress: Optional[Callable[[int, Optional[str]], None]] = None
+) -> dict:
+    """
+    Move the history of academic sessions that ended before a date to files.
+
+    Each session is exported and removed in its own transaction: its
+    attendance, results and settled fees (created during the session) are
+    written to ``ARCHIVE_DIR/<session name>/<table>.<format>`` and deleted
+    from the live tables, and the session is marked archived. The current
+    session is never archived. Safe to re-run after a failure.
+
+    Args:
+        db: Database session
+        before: Archive sessions whose last day is before this date
+        dry_run: Only count the rows that would be archived
+        report_progress: Optional callback taking a percentage and a
+            message, called as each session starts and after the last
+
+    Returns:
+        Dict with the format, directory and per-session row counts and
+        file sizes
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+        ValueError: If ARCHIVE_FORMAT is unknown, or rows changed while a
+            session was being exported
+    """
+    if not dry_run:
+        _require_pyarrow()
+    archive_format = _archive_format()
+    cutoff = min(before, session_start(date.today()))
+
+    sessions = db.query(AcademicSession).filter(
+        AcademicSession.archived_at.is_(None),
+        AcademicSession.end_date < cutoff,
+    ).order_by(AcademicSession.start_date).all()
+
+    report = []
+    for done, academic_session in enumerate(sessions):
+        if report_progress:
+            report_progress(
+                done * 100 // len(sessions),
+                f"Archiving session {academic_session.name} ({done + 1} of {len(sessions)})",
+            )
+        criteria = {model: _session_criteria(model, academic_session) for model in ARCHIVED_MODELS}
+        entry = {"session_id": academic_session.id, "name": academic_session.name, "rows": {}, "bytes": 0}
+
+        if dry_run:
+            for model, model_criteria in criteria.items():
+                entry["rows"][model.__tablename__] = db.query(func.count(model.id)).filter(
+                    *model_criteria
+                ).scalar()
+            report.append(entry)
+            continue
+
+        directory = archive_dir() / academic_session.name
+        directory.mkdir(parents=True, exist_ok=True)
+        try:
+            for model, model_criteria in criteria.items():
+                path = directory / f"{model.__tablename__}.{archive_format}"
+                entry["rows"][model.__tablename__] = _export(
+                    db, model, model_criteria, path, archive_format
+                )
+                entry["bytes"] += path.stat().st_size
+
+            fees_deleted = db.execute(delete(Fees).where(*criteria[Fees])).rowcount
+            removed = remove_session_history(db, academic_session, drop_partitions=True)
+            deleted = {**removed["deleted_rows"], Fees.__tablename__: fees_deleted}
+            changed = [
+                table_name for table_name, count in entry["rows"].items()
+                if table_name in deleted and deleted[table_name] != count
+            ]
+            if changed:
+                raise ValueError(
+                    f"{', '.join(changed)} changed while session {academic_session.name} "
+                    "was being archived; nothing was deleted, run the archive again"
+                )
+            academic_session.archive_path = academic_session.name
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        report.append(entry)
+
+    if report_progress:
+        report_progress(100, f"{'Counted' if dry_run else 'Archived'} {len(report)} sessions")
+    return {
+        "dry_run": dry_run,
+        "format": archive_format,
+        "directory": str(archive_dir()),
+        "sessions": report,
+    }
+
+
+def archived_sessions(
+    db: Session,
+    session_id: Optional[int] = None,
+    all_sessions: bool = False
+) -> list:
+    """
+    Cold-archived sessions a history read asks for.
+
+    The default read (the current session) never touches the archive and
+    costs no query.
+
+    Args:
+        db: Database session
+        session_id: Session the caller asked for
+        all_sessions: The caller asked for every session
+
+    Returns:
+        List of (id, archive_path) rows
+    """
+    if session_id is None and not all_sessions:
+        return []
+    query = db.query(AcademicSession.id, AcademicSession.archive_path).filter(
+        AcademicSession.archive_path.isnot(None)
+    )
+    if not all_sessions:
+        query = query.filter(AcademicSession.id == session_id)
+    return query.order_by(AcademicSession.start_date.desc()).all()
+
+
+def _archive_file(archive_path: str, table_name: str) -> Optional[Path]:
+    for archive_format in ARCHIVE_FORMATS:
+        path = archive_dir() / archive_path / f"{table_name}.{archive_format}"
+        if path.exists():
+            return path
+    return None
+
+
+def read_archived_rows(model, sessions: Sequence, **equals) -> List[Dict]:
+    """
+    Read a model's archived rows from memory-mapped archive files.
+
+    Args:
+        model: Archived model (Attendance, Result or Fees)
+        sessions: (id, archive_path) rows from ``archived_sessions``
+        equals: Column name -> value filters, e.g. student_id=42
+
+    Returns:
+        List of dicts keyed by model attribute name, with enum columns
+        converted back to their enums
+    """
+    if not sessions:
+        return []
+    _require_pyarrow()
+
+    table = model.__table__
+    attributes = {
+        column.name: (
+            model.__mapper__.get_property_by_column(column).key,
+            column.type.enum_class if isinstance(column.type, Enum) else None,
+        )
+        for column in table.columns
+    }
+
+    rows = []
+    for _, archive_path in sessions:
+        path = _archive_file(archive_path, table.name)
+        if path is None:
+            continue
+        if path.suffix == ".parquet":
+            archived = pyarrow.parquet.read_table(
+                path,
+                memory_map=True,
+                filters=[(name, "=", value) for name, value in equals.items()] or None,
+            )
+        else:
+            with pyarrow.memory_map(str(path)) as source:
+                archived = pyarrow.ipc.open_file(source).read_all()
+            for name, value in equals.items():
+                archived = archived.filter(pyarrow.compute.equal(archived[name], value))
+
+        for row in archived.to_pylist():
+            values = {}
+            for name, value in row.items():
+                key, enum_class = attributes[name]
+                values[key] = enum_class(value) if enum_class and value is not None else value
+            rows.append(values)
+    return rows
+
+
+def archived_objects(model, sessions: Sequence, **equals) -> list:
+    """
+    Archived rows as transient (never added to a session) model objects.
+
+    Args:
+        model: Archived model
+        sessions: (id, archive_path) rows from ``archived_sessions``
+        equals: Column name -> value filters
+
+    Returns:
+        List of model objects
+    """
+    return [model(**values) for values in read_archived_rows(model, sessions, **equals)]
+
+
+def archived_column_rows(model, columns: Sequence, sessions: Sequence, **equals) -> List[Dict]:
+    """
+    Archived rows as dicts keyed like a labelled column tuple.
+
+    Counterpart of the column-tuple fast serialization path.
+
+    Args:
+        model: Archived model
+        columns: Column expressions, labelled with their JSON field names
+        sessions: (id, archive_path) rows from ``archived_sessions``
+        equals: Column name -> value filters
+
+    Returns:
+        List of dicts keyed by column label
+    """
+    if not sessions:
+        return []
+    keys = [
+        (column.key, (column.element if isinstance(column, Label) else column.expression).key)
+        for column in columns
+    ]
+    return [
+        {label: values[key] for label, key in keys}
+        for values in read_archived_rows(model, sessions, **equals)
+    ]
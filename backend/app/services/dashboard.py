@@ -1,11 +1,13 @@
 """Dashboard metrics service"""
 from datetime import date
 
-from sqlalchemy import func
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 
+from app.core.money import from_paise
 from app.enums.attendance_enum import AttendanceStatus
-from app.models import Attendance, Fees, PDF, Student
+from app.models import Attendance, PDF, Student, StudentBalance
+from app.services.calendar import count_working_days, non_working_day_clause
 
 
 def get_admin_dashboard_summary(db: Session) -> dict:
@@ -13,17 +15,22 @@ def get_admin_dashboard_summary(db: Session) -> dict:
     Build admin dashboard summary metrics.
 
     Returns zeros for all aggregate fields when records are missing.
+    Fee totals are summed exactly, as integer paise, over the per-student
+    balances rather than every fee row. Today's attendance percentage
+    counts PRESENT and ABSENT marks of classes the school calendar does
+    not close today.
     """
+    today = date.today()
     total_students = db.query(func.count(Student.id)).scalar() or 0
 
-    total_attendance_today = db.query(func.count(Attendance.id)).filter(
-        Attendance.date == date.today()
-    ).scalar() or 0
-
-    present_attendance_today = db.query(func.count(Attendance.id)).filter(
-        Attendance.date == date.today(),
-        Attendance.status == AttendanceStatus.PRESENT
-    ).scalar() or 0
+    total_attendance_today, present_attendance_today = db.query(
+        func.count(Attendance.id),
+        func.coalesce(func.sum(case((Attendance.status == AttendanceStatus.PRESENT, 1), else_=0)), 0),
+    ).filter(
+        Attendance.date == today,
+        Attendance.status != AttendanceStatus.HOLIDAY,
+        ~non_working_day_clause(Attendance.date, Attendance.class_),
+    ).one()
 
     if total_attendance_today > 0:
         today_attendance_percentage = (
@@ -32,20 +39,25 @@ def get_admin_dashboard_summary(db: Session) -> dict:
     else:
         today_attendance_percentage = 0.0
 
-    total_fees_collected = db.query(
-        func.coalesce(func.sum(Fees.paid_amount), 0.0)
-    ).scalar() or 0.0
+    total_fees_collected_paise = db.query(
+        func.coalesce(func.sum(StudentBalance.total_paid_paise), 0)
+    ).scalar() or 0
 
-    total_pending_fees = db.query(
-        func.coalesce(func.sum(Fees.due_amount), 0.0)
-    ).scalar() or 0.0
+    total_pending_fees_paise = db.query(
+        func.coalesce(func.sum(StudentBalance.total_due_paise), 0)
+    ).scalar() or 0
 
     total_pdfs = db.query(func.count(PDF.id)).scalar() or 0
 
+    school_open_today = count_working_days(db, today, today)["working_days"] == 1
+    working_days_this_month = count_working_days(db, today.replace(day=1), today)["working_days"]
+
     return {
         "total_students": int(total_students),
         "today_attendance_percentage": float(today_attendance_percentage),
-        "total_fees_collected": float(total_fees_collected),
-        "total_pending_fees": float(total_pending_fees),
+        "total_fees_collected": from_paise(int(total_fees_collected_paise)),
+        "total_pending_fees": from_paise(int(total_pending_fees_paise)),
         "total_pdfs": int(total_pdfs),
+        "school_open_today": school_open_today,
+        "working_days_this_month": working_days_this_month,
     }
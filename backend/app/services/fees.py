@@ -1,50 +1,289 @@
 """Fees management service"""
 from datetime import datetime
-from typing import List, Optional
+from decimal import Decimal
+from typing import Callable, List, Optional
 
+from sqlalchemy import exists, func, insert, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
-from app.models import Fees
+from app.core.money import from_paise, to_paise
+from app.models import FeePayment, Fees, Student, StudentBalance
+from app.services.identifiers import get_rows_for_student_identifier
+from app.services.writes import delete_by_id, update_by_id
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE, for balance upserts
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _record_payment(
+    db: Session,
+    fee: Fees,
+    amount_paise: int,
+    remark: Optional[str] = None
+) -> None:
+    """Append a payment delta in paise to the ledger (no-op for zero)."""
+    if not amount_paise:
+        return
+
+    db.add(FeePayment(
+        fee_id=fee.id,
+        student_id=fee.student_id,
+        amount_paise=amount_paise,
+        remark=remark
+    ))
+
+
+def _apply_balance_delta(
+    db: Session,
+    student_id: int,
+    amount_delta: int = 0,
+    paid_delta: int = 0
+) -> None:
+    """
+    Adjust a student's running fee totals (in paise) inside the caller's
+    transaction.
+
+    The update is expressed relative to the stored values so concurrent
+    writers never overwrite each other's deltas. On PostgreSQL and SQLite
+    it is one INSERT ... ON CONFLICT DO UPDATE, so two first fees for a
+    student arriving together cannot both try to create the balance row.
+    """
+    if not amount_delta and not paid_delta:
+        return
+
+    upsert_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if upsert_insert is not None:
+        balances = StudentBalance.__table__
+        statement = upsert_insert(balances).values(
+            student_id=student_id,
+            total_amount=amount_delta,
+            total_paid=paid_delta,
+            total_due=amount_delta - paid_delta,
+            updated_at=datetime.utcnow(),
+        )
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[balances.c.student_id],
+            set_={
+                "total_amount": balances.c.total_amount + statement.excluded.total_amount,
+                "total_paid": balances.c.total_paid + statement.excluded.total_paid,
+                "total_due": balances.c.total_due + statement.excluded.total_due,
+                "updated_at": statement.excluded.updated_at,
+            },
+        ))
+        return
+
+    updated = db.query(StudentBalance).filter(
+        StudentBalance.student_id == student_id
+    ).update(
+        {
+            StudentBalance.total_amount_paise: StudentBalance.total_amount_paise + amount_delta,
+            StudentBalance.total_paid_paise: StudentBalance.total_paid_paise + paid_delta,
+            StudentBalance.total_due_paise: StudentBalance.total_due_paise + (amount_delta - paid_delta),
+            StudentBalance.updated_at: datetime.utcnow(),
+        },
+        synchronize_session=False
+    )
+
+    if not updated:
+        db.add(StudentBalance(
+            student_id=student_id,
+            total_amount_paise=amount_delta,
+            total_paid_paise=paid_delta,
+            total_due_paise=amount_delta - paid_delta
+        ))
 
 
 def create_fee(
     db: Session,
     student_id: int,
-    amount: float,
-    paid_amount: float = 0.0,
-    remark: Optional[str] = None
+    amount: Decimal,
+    paid_amount: Decimal = Decimal("0"),
+    remark: Optional[str] = None,
+    term_key: Optional[str] = None
 ) -> Optional[Fees]:
     """
     Create a new fee record for a student.
     
-    Auto-calculates due_amount = amount - paid_amount
+    Auto-calculates due_amount = amount - paid_amount (exactly, in paise)
+    and records the initial payment in the ledger and the student's balance.
     
     Args:
         db: Database session
         student_id: Student database ID
-        amount: Total fee amount
-        paid_amount: Amount already paid
+        amount: Total fee amount in rupees
+        paid_amount: Amount already paid in rupees
         remark: Optional remark
+        term_key: Optional term identifier (unique per student)
         
     Returns:
-        Created Fees object
+        Created Fees object or None if student doesn't exist
     """
-    due_amount = amount - paid_amount
+    student_exists = db.query(Student.id).filter(Student.id == student_id).first()
+    if not student_exists:
+        return None
+
+    amount_paise = to_paise(amount)
+    paid_paise = to_paise(paid_amount)
     
     new_fee = Fees(
         student_id=student_id,
-        amount=amount,
-        paid_amount=paid_amount,
-        due_amount=due_amount,
-        remark=remark
+        amount_paise=amount_paise,
+        paid_amount_paise=paid_paise,
+        due_amount_paise=amount_paise - paid_paise,
+        remark=remark,
+        term_key=term_key
     )
     
-    db.add(new_fee)
-    db.commit()
+    try:
+        db.add(new_fee)
+        db.flush()
+
+        _record_payment(db, new_fee, paid_paise, remark)
+        _apply_balance_delta(db, student_id, amount_delta=amount_paise, paid_delta=paid_paise)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
     db.refresh(new_fee)
     return new_fee
 
 
+def assign_fees_bulk(
+    db: Session,
+    amount: Decimal,
+    term_key: str,
+    class_: Optional[int] = None,
+    student_ids: Optional[List[int]] = None,
+    remark: Optional[str] = None,
+    report_progress: Optional[Callable[[int, Optional[str]], None]] = None
+) -> dict:
+    """
+    Raise the same fee for many students with a single INSERT ... SELECT.
+    
+    Targets every student in a class, an explicit list of student IDs, or
+    the whole school when neither is given. Idempotent per
+    (student, term_key): students who already have a fee for the term are
+    skipped. Balances are updated with set-based statements in the same
+    transaction.
+    
+    Args:
+        db: Database session
+        amount: Fee amount in rupees
+        term_key: Term identifier, e.g. "2025-T1"
+        class_: Optional class number (1-10)
+        student_ids: Optional list of student database IDs
+        remark: Optional remark
+        report_progress: Optional callback taking a percentage and a
+            message, called before the writes and after the commit
+        
+    Returns:
+        Dict with term_key, targeted, created and skipped counts
+    """
+    amount_paise = to_paise(amount)
+    # Identifies the rows written by this call for the balance update
+    batch_created_at = datetime.utcnow()
+
+    student_filter = []
+    if class_ is not None:
+        student_filter.append(Student.class_ == class_)
+    if student_ids is not None:
+        student_filter.append(Student.id.in_(student_ids))
+
+    already_assigned = exists().where(
+        Fees.student_id == Student.id,
+        Fees.term_key == term_key
+    )
+
+    source = select(
+        Student.id,
+        literal(amount_paise),
+        literal(0),
+        literal(amount_paise),
+        literal(remark),
+        literal(term_key),
+        literal(batch_created_at),
+    ).where(*student_filter, ~already_assigned)
+
+    batch_student_ids = select(Fees.student_id).where(
+        Fees.term_key == term_key,
+        Fees.created_at == batch_created_at
+    )
+
+    try:
+        targeted = db.query(func.count(Student.id)).filter(*student_filter).scalar() or 0
+        if report_progress:
+            report_progress(10, f"Assigning {term_key} fees to {targeted} students")
+
+        created = db.execute(
+            insert(Fees).from_select(
+                [
+                    Fees.student_id,
+                    Fees.amount_paise,
+                    Fees.paid_amount_paise,
+                    Fees.due_amount_paise,
+                    Fees.remark,
+                    Fees.term_key,
+                    Fees.created_at,
+                ],
+                source
+            )
+        ).rowcount
+
+        if created:
+            missing_balance = ~exists().where(
+                StudentBalance.student_id == Fees.student_id
+            )
+            db.execute(
+                insert(StudentBalance).from_select(
+                    [
+                        StudentBalance.student_id,
+                        StudentBalance.total_amount_paise,
+                        StudentBalance.total_paid_paise,
+                        StudentBalance.total_due_paise,
+                        StudentBalance.updated_at,
+                    ],
+                    select(
+                        Fees.student_id,
+                        literal(0),
+                        literal(0),
+                        literal(0),
+                        literal(batch_created_at),
+                    ).where(
+                        Fees.term_key == term_key,
+                        Fees.created_at == batch_created_at,
+                        missing_balance
+                    )
+                )
+            )
+            db.execute(
+                update(StudentBalance).where(
+                    StudentBalance.student_id.in_(batch_student_ids)
+                ).values(
+                    total_amount_paise=StudentBalance.total_amount_paise + amount_paise,
+                    total_due_paise=StudentBalance.total_due_paise + amount_paise,
+                    updated_at=batch_created_at
+                ).execution_options(synchronize_session=False)
+            )
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if report_progress:
+        report_progress(100, f"Created {created} fees, {targeted - created} already assigned")
+
+    return {
+        "term_key": term_key,
+        "targeted": int(targeted),
+        "created": int(created),
+        "skipped": int(targeted) - int(created),
+    }
+
+
 def get_fee(db: Session, fee_id: int) -> Optional[Fees]:
     """
     Get a specific fee record.
@@ -75,41 +314,74 @@ def get_student_fees(db: Session, student_id: int) -> List[Fees]:
     ).all()
 
 
+def get_student_fees_by_identifier(db: Session, identifier: str) -> List[Fees]:
+    """
+    Get all fee records for a student by database ID or student_id string.
+    
+    Args:
+        db: Database session
+        identifier: Database ID (digits) or student_id string (e.g. STU5001)
+        
+    Returns:
+        List of Fees objects (empty if the student doesn't exist)
+    """
+    return get_rows_for_student_identifier(
+        db, identifier, Fees, Fees.created_at.desc()
+    )
+
+
 def update_fee(
     db: Session,
     fee_id: int,
-    paid_amount: Optional[float] = None,
+    paid_amount: Optional[Decimal] = None,
     remark: Optional[str] = None
 ) -> Optional[Fees]:
     """
     Update a fee record.
     
-    Auto-recalculates due_amount when paid_amount changes.
+    Auto-recalculates due_amount when paid_amount changes. The difference
+    from the previous paid amount is appended to the ledger and applied to
+    the student's balance in the same transaction. The fee is updated with
+    one UPDATE ... RETURNING that also returns the previous paid amount.
     
     Args:
         db: Database session
         fee_id: Fee record ID
-        paid_amount: Updated paid amount
+        paid_amount: Updated paid amount in rupees
         remark: Updated remark
         
     Returns:
         Updated Fees object or None if not found
     """
-    fee = db.query(Fees).filter(Fees.id == fee_id).first()
-    
-    if not fee:
-        return None
+    values = {}
+    paid_paise = None
     
     if paid_amount is not None:
-        fee.paid_amount = paid_amount
-        fee.due_amount = fee.amount - paid_amount
-        fee.payment_date = datetime.utcnow()
+        paid_paise = to_paise(paid_amount)
+        values["paid_amount_paise"] = paid_paise
+        values["due_amount_paise"] = Fees.amount_paise - paid_paise
+        values["payment_date"] = datetime.utcnow()
     
     if remark is not None:
-        fee.remark = remark
+        values["remark"] = remark
     
-    db.commit()
-    db.refresh(fee)
+    try:
+        row = update_by_id(db, Fees, fee_id, values, previous=(Fees.paid_amount_paise,))
+        
+        if not row:
+            return None
+        
+        fee, previous_paid_paise = row
+        if paid_paise is not None:
+            paid_delta = paid_paise - previous_paid_paise
+            _record_payment(db, fee, paid_delta, remark)
+            _apply_balance_delta(db, fee.student_id, paid_delta=paid_delta)
+        
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
     return fee
 
 
@@ -117,6 +389,10 @@ def delete_fee(db: Session, fee_id: int) -> bool:
     """
     Delete a fee record.
     
+    Any amount paid against the fee is reversed in the ledger and the
+    student's balance is reduced by the fee's totals. The fee row is
+    removed with one DELETE ... RETURNING that supplies those totals.
+    
     Args:
         db: Database session
         fee_id: Fee record ID
@@ -124,11 +400,159 @@ def delete_fee(db: Session, fee_id: int) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    fee = db.query(Fees).filter(Fees.id == fee_id).first()
+    try:
+        fee = delete_by_id(
+            db, Fees, fee_id,
+            Fees.id, Fees.student_id, Fees.amount_paise, Fees.paid_amount_paise
+        )
+        
+        if not fee:
+            return False
+        
+        _record_payment(db, fee, -fee.paid_amount_paise, "Fee record deleted")
+        _apply_balance_delta(
+            db,
+            fee.student_id,
+            amount_delta=-fee.amount_paise,
+            paid_delta=-fee.paid_amount_paise
+        )
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return True
+
+
+def get_student_balance(db: Session, student_id: int) -> Optional[StudentBalance]:
+    """
+    Get the maintained fee balance for a student.
+    
+    Args:
+        db: Database session
+        student_id: Student database ID
+        
+    Returns:
+        StudentBalance object or None if the student has no fee history
+    """
+    return db.query(StudentBalance).filter(
+        StudentBalance.student_id == student_id
+    ).first()
+
+
+def get_top_defaulters(db: Session, limit: int = 20) -> List[dict]:
+    """
+    Get students with the largest outstanding balance.
     
-    if not fee:
-        return False
+    Reads the top rows from the total_due index and joins only those
+    students by primary key.
     
-    db.delete(fee)
-    db.commit()
-    return True
+    Args:
+        db: Database session
+        limit: Maximum number of students to return
+        
+    Returns:
+        List of dicts with student identity and total_due
+    """
+    top_balances = db.query(
+        StudentBalance.student_id,
+        StudentBalance.total_due_paise.label("total_due")
+    ).filter(
+        StudentBalance.total_due_paise > 0
+    ).order_by(
+        StudentBalance.total_due_paise.desc()
+    ).limit(limit).subquery()
+
+    rows = db.query(
+        Student.id,
+        Student.student_id,
+        Student.name,
+        Student.class_,
+        top_balances.c.total_due
+    ).join(
+        top_balances, top_balances.c.student_id == Student.id
+    ).order_by(top_balances.c.total_due.desc()).all()
+
+    return [
+        {
+            "id": row.id,
+            "student_id": row.student_id,
+            "name": row.name,
+            "class_": row.class_,
+            "total_due": from_paise(row.total_due),
+        }
+        for row in rows
+    ]
+
+
+def get_student_payments(db: Session, student_id: int) -> List[FeePayment]:
+    """
+    Get the payment ledger for a student, newest first.
+    
+    Args:
+        db: Database session
+        student_id: Student database ID
+        
+    Returns:
+        List of FeePayment objects
+    """
+    return db.query(FeePayment).filter(
+        FeePayment.student_id == student_id
+    ).order_by(FeePayment.created_at.desc(), FeePayment.id.desc()).all()
+
+
+def backfill_fee_ledger(db: Session) -> None:
+    """
+    Seed the ledger and balances from existing fee rows.
+
+    Runs once for databases created before the ledger existed: when there
+    are fees but no balances, every fee's paid amount becomes an opening
+    ledger entry and balances are rebuilt with one aggregate pass.
+    Safe to run repeatedly.
+    """
+    has_balances = db.query(StudentBalance.student_id).first() is not None
+    if has_balances:
+        return
+
+    has_fees = db.query(Fees.id).first() is not None
+    if not has_fees:
+        return
+
+    try:
+        if db.query(FeePayment.id).first() is None:
+            opening_entries = db.query(
+                Fees.id, Fees.student_id, Fees.paid_amount_paise
+            ).filter(Fees.paid_amount_paise != 0).all()
+
+            db.add_all([
+                FeePayment(
+                    fee_id=fee_id,
+                    student_id=student_id,
+                    amount_paise=paid_paise,
+                    remark="Opening balance"
+                )
+                for fee_id, student_id, paid_paise in opening_entries
+            ])
+
+        totals = db.query(
+            Fees.student_id,
+            func.sum(Fees.amount_paise),
+            func.sum(Fees.paid_amount_paise),
+            func.sum(Fees.due_amount_paise)
+        ).group_by(Fees.student_id).all()
+
+        db.add_all([
+            StudentBalance(
+                student_id=student_id,
+                total_amount_paise=total_amount,
+                total_paid_paise=total_paid,
+                total_due_paise=total_due
+            )
+            for student_id, total_amount, total_paid, total_due in totals
+        ])
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
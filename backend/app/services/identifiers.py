@@ -0,0 +1,166 @@
+"""Student identifier resolution service.
+
+Admin screens address students either by database ID (``42``) or by the
+student_id string printed on ID cards (``STU5001``). Resolved string
+identifiers are cached (see ``app.core.cache``) so repeat lookups cost no
+query, and a cold lookup fetches the student's rows through a join in one
+round trip.
+"""
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_cache
+from app.core.replicas import reads_from_replica
+from app.models import Student
+
+# student_id string (e.g. STU5001) -> Student.id
+_student_pk_cache = get_cache("student_pk", maxsize=4096)
+
+
+def _cached_student_pk(identifier: str) -> Optional[int]:
+    """Resolve an identifier without touching the database, if possible."""
+    if identifier.isdigit():
+        return int(identifier)
+    return _student_pk_cache.get(identifier)
+
+
+def _cache_student_pk(db: Session, identifier: str, student_pk: int) -> None:
+    # A replica may lag the primary (e.g. behind a reissued student_id)
+    if not reads_from_replica(db):
+        _student_pk_cache.set(identifier, student_pk)
+
+
+def resolve_student_pk(db: Session, identifier: str) -> Optional[int]:
+    """
+    Resolve a numeric ID or student_id string to a student primary key.
+    
+    Args:
+        db: Database session
+        identifier: Database ID (digits) or student_id string
+        
+    Returns:
+        Student database ID or None if no such student
+    """
+    student_pk = _cached_student_pk(identifier)
+    if student_pk is not None:
+        return student_pk
+
+    row = db.query(Student.id).filter(Student.student_id == identifier).first()
+    if not row:
+        return None
+
+    _cache_student_pk(db, identifier, row.id)
+    return row.id
+
+
+def get_rows_for_student_identifier(
+    db: Session,
+    identifier: str,
+    model,
+    *order_by,
+    filters: Sequence = ()
+) -> List:
+    """
+    Get all rows of a student-owned model for a student identifier.
+    
+    Uses the cached primary key when available; otherwise resolves the
+    identifier and loads the rows with a single outer join, caching the
+    primary key for next time.
+    
+    Args:
+        db: Database session
+        identifier: Database ID (digits) or student_id string
+        model: Model with a ``student_id`` foreign key to students.id
+        order_by: Ordering criteria for the returned rows
+        filters: Extra criteria on the model's rows
+        
+    Returns:
+        List of model objects (empty if the student doesn't exist)
+    """
+    student_pk = _cached_student_pk(identifier)
+    if student_pk is not None:
+        return db.query(model).filter(
+            model.student_id == student_pk, *filters
+        ).order_by(*order_by).all()
+
+    rows = db.query(Student.id, model).outerjoin(
+        model, and_(model.student_id == Student.id, *filters)
+    ).filter(
+        Student.student_id == identifier
+    ).order_by(*order_by).all()
+
+    if not rows:
+        return []
+
+    _cache_student_pk(db, identifier, rows[0][0])
+    return [row for _, row in rows if row is not None]
+
+
+def get_columns_for_student_identifier(
+    db: Session,
+    identifier: str,
+    model,
+    columns: Sequence,
+    *order_by,
+    filters: Sequence = ()
+) -> List[Dict]:
+    """
+    Get labelled columns of a student's rows as plain dicts.
+    
+    Column-tuple counterpart of ``get_rows_for_student_identifier`` for the
+    fast serialization path: no ORM objects are built. A cold lookup
+    inner-joins students to resolve the identifier in the same query.
+    
+    Args:
+        db: Database session
+        identifier: Database ID (digits) or student_id string
+        model: Model with a ``student_id`` foreign key to students.id
+        columns: Column expressions, labelled with their JSON field names
+        order_by: Ordering criteria for the returned rows
+        filters: Extra criteria on the model's rows
+        
+    Returns:
+        List of dicts keyed by column label (empty if the student doesn't
+        exist or has no rows)
+    """
+    student_pk = _cached_student_pk(identifier)
+    if student_pk is not None:
+        return [
+            row._asdict()
+            for row in db.query(*columns).filter(
+                model.student_id == student_pk, *filters
+            ).order_by(*order_by)
+        ]
+
+    rows = db.query(Student.id.label("_student_pk"), *columns).select_from(model).join(
+        Student, model.student_id == Student.id
+    ).filter(
+        Student.student_id == identifier, *filters
+    ).order_by(*order_by).all()
+
+    if not rows:
+        return []
+
+    _cache_student_pk(db, identifier, rows[0][0])
+    result = []
+    for row in rows:
+        values = row._asdict()
+        del values["_student_pk"]
+        result.append(values)
+    return result
+
+
+def invalidate_student_identifier(identifier: Optional[str]) -> None:
+    """
+    Drop a student_id string from the resolver cache.
+    
+    Called by the students service whenever a student is created,
+    updated or deleted.
+    
+    Args:
+        identifier: student_id string (e.g. STU5001)
+    """
+    if identifier:
+        _student_pk_cache.delete(identifier)
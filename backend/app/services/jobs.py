@@ -0,0 +1,582 @@
+"""Background job queue service.
+
+Jobs are rows in the ``jobs`` table: admin routes enqueue them and worker
+processes started with ``python -m app.worker`` claim and run them, so a
+slow bulk operation no longer holds a web worker or hits proxy timeouts.
+
+Job types are registered with ``register_job``: a name, the service
+function to call as ``func(db, **arguments)``, an optional Pydantic payload
+schema (validated when the job is enqueued and again before it runs), a
+concurrency limit shared by all workers, an attempt limit and a retry
+backoff. Functions that accept a ``report_progress`` argument get a
+callback taking a percentage and an optional message.
+
+A job is claimed with a conditional UPDATE on its QUEUED status, so two
+workers never run the same job. A failed attempt is re-queued with an
+exponential delay until ``max_attempts`` is reached. Workers heartbeat the
+jobs they hold; jobs whose worker stopped responding are re-queued.
+"""
+import inspect
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.core.serialization import dumps
+from app.enums.job_enum import JobStatus
+from app.models import Job
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY_SECONDS = 3600
+
+
+@dataclass
+class JobType:
+    """A service function registered to run as a background job."""
+    name: str
+    func: Callable[..., Any]
+    payload_schema: Optional[Type[BaseModel]] = None
+    arguments: Optional[Callable[[BaseModel], Dict[str, Any]]] = None
+    concurrency: int = 1
+    max_attempts: int = 3
+    retry_backoff_seconds: float = 30.0
+    description: Optional[str] = None
+
+    @property
+    def accepts_progress(self) -> bool:
+        return "report_progress" in inspect.signature(self.func).parameters
+
+    def validate_payload(self, payload: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Validate a payload and return its JSON form for storage."""
+        if self.payload_schema is None:
+            if payload:
+                raise ValueError(f"Job type {self.name} takes no payload")
+            return None
+        model = self.payload_schema.model_validate(payload or {})
+        return model.model_dump(mode="json", by_alias=True)
+
+    def build_arguments(self, payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Turn a stored payload into keyword arguments for ``func``."""
+        if self.payload_schema is None:
+            return {}
+        model = self.payload_schema.model_validate(payload or {})
+        if self.arguments is not None:
+            return self.arguments(model)
+        return model.model_dump(by_alias=False)
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        seconds = self.retry_backoff_seconds * 2 ** max(0, attempts - 1)
+        return timedelta(seconds=min(seconds, MAX_RETRY_DELAY_SECONDS))
+
+
+_registry: Dict[str, JobType] = {}
+
+
+def register_job(
+    name: str,
+    func: Callable[..., Any],
+    payload_schema: Optional[Type[BaseModel]] = None,
+    arguments: Optional[Callable[[BaseModel], Dict[str, Any]]] = None,
+    concurrency: int = 1,
+    max_attempts: int = 3,
+    retry_backoff_seconds: float = 30.0,
+    description: Optional[str] = None,
+) -> JobType:
+    """
+    Register a service function as a job type.
+
+    Args:
+        name: Job type name used when enqueueing, e.g. "fees.assign_fees_bulk"
+        func: Callable invoked as ``func(db, **arguments)``
+        payload_schema: Optional Pydantic model for the job payload
+        arguments: Optional mapping from a validated payload to keyword
+            arguments; defaults to the payload's fields
+        concurrency: Maximum jobs of this type running at once, across workers
+        max_attempts: Attempts before the job is marked FAILED
+        retry_backoff_seconds: Delay before the first retry; doubles per attempt
+        description: Short description shown by the job types endpoint
+
+    Returns:
+        The registered JobType
+    """
+    job_type = JobType(
+        name=name,
+        func=func,
+        payload_schema=payload_schema,
+        arguments=arguments,
+        concurrency=concurrency,
+        max_attempts=max_attempts,
+        retry_backoff_seconds=retry_backoff_seconds,
+        description=description or (inspect.getdoc(func) or "").split("\n", 1)[0] or None,
+    )
+    _registry[name] = job_type
+    return job_type
+
+
+def get_job_type(name: str) -> Optional[JobType]:
+    """Get a registered job type by name."""
+    return _registry.get(name)
+
+
+def get_job_types() -> List[JobType]:
+    """Get all registered job types, sorted by name."""
+    return [_registry[name] for name in sorted(_registry)]
+
+
+def enqueue_job(
+    db: Session,
+    job_type: str,
+    payload: Optional[Dict[str, Any]] = None,
+    max_attempts: Optional[int] = None,
+) -> Job:
+    """
+    Add a job to the queue.
+
+    Args:
+        db: Database session
+        job_type: Registered job type name
+        payload: Arguments for the job type
+        max_attempts: Optional override of the job type's attempt limit
+
+    Returns:
+        Created Job object
+
+    Raises:
+        ValueError: Unknown job type or invalid payload (pydantic's
+            ValidationError is a ValueError)
+    """
+    registered = _registry.get(job_type)
+    if registered is None:
+        raise ValueError(f"Unknown job type {job_type!r}")
+
+    job = Job(
+        job_type=job_type,
+        status=JobStatus.QUEUED,
+        payload=registered.validate_payload(payload),
+        max_attempts=max_attempts or registered.max_attempts,
+        run_after=datetime.utcnow(),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def get_job(db: Session, job_id: int) -> Optional[Job]:
+    """
+    Get a job by ID.
+
+    Args:
+        db: Database session
+        job_id: Job ID
+
+    Returns:
+        Job object or None if not found
+    """
+    return db.query(Job).filter(Job.id == job_id).first()
+
+
+def list_jobs(
+    db: Session,
+    status: Optional[JobStatus] = None,
+    job_type: Optional[str] = None,
+    limit: int = 50,
+) -> List[Job]:
+    """
+    List jobs, newest first.
+
+    Args:
+        db: Database session
+        status: Optional status filter
+        job_type: Optional job type filter
+        limit: Maximum number of jobs
+
+    Returns:
+        List of Job objects
+    """
+    query = db.query(Job)
+    if status is not None:
+        query = query.filter(Job.status == status)
+    if job_type is not None:
+        query = query.filter(Job.job_type == job_type)
+    return query.order_by(Job.id.desc()).limit(limit).all()
+
+
+def cancel_job(db: Session, job_id: int) -> Optional[Job]:
+    """
+    Cancel a job that has not started yet.
+
+    Args:
+        db: Database session
+        job_id: Job ID
+
+    Returns:
+        The job (CANCELLED if it was still queued) or None if not found
+    """
+    db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JobStatus.QUEUED)
+        .values(status=JobStatus.CANCELLED, finished_at=datetime.utcnow())
+    )
+    db.commit()
+    return get_job(db, job_id)
+
+
+def retry_job(db: Session, job_id: int) -> Optional[Job]:
+    """
+    Queue a failed or cancelled job again with a fresh attempt budget.
+
+    Args:
+        db: Database session
+        job_id: Job ID
+
+    Returns:
+        The job (QUEUED if it had failed or was cancelled) or None if not found
+    """
+    db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status.in_([JobStatus.FAILED, JobStatus.CANCELLED]))
+        .values(
+            status=JobStatus.QUEUED,
+            attempts=0,
+            error=None,
+            progress=0,
+            progress_message=None,
+            run_after=datetime.utcnow(),
+            finished_at=None,
+        )
+    )
+    db.commit()
+    return get_job(db, job_id)
+
+
+def claim_next_job(
+    db: Session,
+    worker_id: str,
+    job_types: Optional[Sequence[str]] = None,
+) -> Optional[Job]:
+    """
+    Claim the oldest runnable job whose type is under its concurrency limit.
+
+    Args:
+        db: Database session
+        worker_id: Identifier of the claiming worker
+        job_types: Optional job types this worker handles
+
+    Returns:
+        The claimed Job (now RUNNING) or None if nothing is runnable
+    """
+    running = dict(
+        db.query(Job.job_type, func.count(Job.id))
+        .filter(Job.status == JobStatus.RUNNING)
+        .group_by(Job.job_type)
+        .all()
+    )
+    eligible = [
+        name for name, registered in _registry.items()
+        if running.get(name, 0) < registered.concurrency
+        and (job_types is None or name in job_types)
+    ]
+    if not eligible:
+        return None
+
+    now = datetime.utcnow()
+    candidates = (
+        db.query(Job.id, Job.job_type)
+        .filter(Job.status == JobStatus.QUEUED, Job.run_after <= now, Job.job_type.in_(eligible))
+        .order_by(Job.run_after, Job.id)
+        .limit(10)
+        .all()
+    )
+    for job_id, job_type in candidates:
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.QUEUED)
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                locked_by=worker_id,
+                started_at=now,
+                heartbeat_at=now,
+                progress=0,
+                progress_message=None,
+            )
+        ).rowcount
+        db.commit()
+        if not claimed:
+            continue
+        if _over_concurrency(db, job_id, job_type):
+            _release(db, job_id)
+            continue
+        return get_job(db, job_id)
+    return None
+
+
+def _over_concurrency(db: Session, job_id: int, job_type: str) -> bool:
+    """Whether a racing worker already filled the type's slots; earliest claims win."""
+    limit = _registry[job_type].concurrency
+    winners = [
+        running_id for (running_id,) in db.query(Job.id)
+        .filter(Job.job_type == job_type, Job.status == JobStatus.RUNNING)
+        .order_by(Job.started_at, Job.id)
+        .limit(limit)
+        .all()
+    ]
+    return job_id not in winners
+
+
+def _release(db: Session, job_id: int) -> None:
+    db.execute(
+        update(Job)
+        .where(Job.id == job_id)
+        .values(
+            status=JobStatus.QUEUED,
+            attempts=Job.attempts - 1,
+            locked_by=None,
+            started_at=None,
+            heartbeat_at=None,
+        )
+    )
+    db.commit()
+
+
+def _progress_reporter(session_factory: Callable[[], Session], job_id: int) -> Callable[..., None]:
+    """
+    Progress callback writing through its own session, outside the job's
+    transaction. Progress is informational: a failed write is logged and
+    the job carries on.
+    """
+    def report_progress(percent: int, message: Optional[str] = None) -> None:
+        db = session_factory()
+        try:
+            db.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(
+                    progress=max(0, min(100, int(percent))),
+                    progress_message=message[:255] if message else None,
+                    heartbeat_at=datetime.utcnow(),
+                )
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.warning("Could not record progress of job %s", job_id, exc_info=True)
+        finally:
+            db.close()
+
+    return report_progress
+
+
+def execute_job(session_factory: Callable[[], Session], job_id: int) -> Optional[JobStatus]:
+    """
+    Run a claimed job and record its outcome.
+
+    Invalid payloads and unknown job types fail immediately; any other
+    exception is retried with backoff until the attempt limit is reached.
+
+    Args:
+        session_factory: Callable returning a new Session
+        job_id: ID of a job claimed with ``claim_next_job``
+
+    Returns:
+        Status the job ended in, or None if the job no longer exists
+    """
+    db = session_factory()
+    try:
+        job = get_job(db, job_id)
+        if job is None:
+            return None
+        registered = _registry.get(job.job_type)
+        payload = job.payload
+
+        try:
+            if registered is None:
+                raise LookupError(f"Unknown job type {job.job_type!r}")
+            arguments = registered.build_arguments(payload)
+            if registered.accepts_progress:
+                arguments["report_progress"] = _progress_reporter(session_factory, job_id)
+            outcome = registered.func(db, **arguments)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            logger.exception("Job %s (%s) failed", job_id, job.job_type)
+            permanent = registered is None or isinstance(exc, ValidationError)
+            return _record_failure(db, job_id, registered, exc, permanent)
+
+        db.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(
+                status=JobStatus.SUCCEEDED,
+                result=None if outcome is None else json.loads(dumps(outcome)),
+                error=None,
+                progress=100,
+                locked_by=None,
+                finished_at=datetime.utcnow(),
+            )
+        )
+        db.commit()
+        return JobStatus.SUCCEEDED
+    finally:
+        db.close()
+
+
+def _record_failure(
+    db: Session,
+    job_id: int,
+    registered: Optional[JobType],
+    exc: Exception,
+    permanent: bool,
+) -> JobStatus:
+    job = get_job(db, job_id)
+    now = datetime.utcnow()
+    error = f"{type(exc).__name__}: {exc}"
+
+    if permanent or job.attempts >= job.max_attempts:
+        job.status = JobStatus.FAILED
+        job.finished_at = now
+    else:
+        job.status = JobStatus.QUEUED
+        job.run_after = now + registered.retry_delay(job.attempts)
+    job.error = error
+    job.locked_by = None
+    db.commit()
+    return job.status
+
+
+def touch_jobs(db: Session, job_ids: Sequence[int]) -> None:
+    """
+    Record a heartbeat for jobs a worker is still running.
+
+    Args:
+        db: Database session
+        job_ids: IDs of jobs held by the worker
+    """
+    if not job_ids:
+        return
+    db.execute(
+        update(Job)
+        .where(Job.id.in_(list(job_ids)), Job.status == JobStatus.RUNNING)
+        .values(heartbeat_at=datetime.utcnow())
+    )
+    db.commit()
+
+
+def requeue_stale_jobs(db: Session, stale_after_seconds: float) -> int:
+    """
+    Recover jobs whose worker stopped heartbeating.
+
+    Jobs with attempts left are queued again; the rest are marked FAILED.
+
+    Args:
+        db: Database session
+        stale_after_seconds: Heartbeat age after which a job counts as stale
+
+    Returns:
+        Number of jobs recovered
+    """
+    now = datetime.utcnow()
+    stale = [
+        Job.status == JobStatus.RUNNING,
+        Job.heartbeat_at < now - timedelta(seconds=stale_after_seconds),
+    ]
+    error = "Worker stopped responding"
+    failed = db.execute(
+        update(Job)
+        .where(*stale, Job.attempts >= Job.max_attempts)
+        .values(status=JobStatus.FAILED, error=error, locked_by=None, finished_at=now)
+    ).rowcount
+    requeued = db.execute(
+        update(Job)
+        .where(*stale)
+        .values(status=JobStatus.QUEUED, error=error, locked_by=None, run_after=now)
+    ).rowcount
+    db.commit()
+    return failed + requeued
+
+
+def _register_service_jobs() -> None:
+    """Register the heavy admin operations of the service layer."""
+    from app.schemas.academic_session import ColdArchiveRequest, SessionArchiveRequest
+    from app.schemas.attendance import AttendanceMarkBulkRequest
+    from app.schemas.fee import FeeBulkCreate
+    from app.schemas.student import StudentPromotionRequest, StudentWithdrawRequest
+    from app.services import (
+        academic_sessions, attendance, attendance_bitmap, calendar, cold_archive, dashboard, fees, pdfs, students,
+    )
+
+    register_job(
+        "fees.assign_fees_bulk",
+        fees.assign_fees_bulk,
+        payload_schema=FeeBulkCreate,
+        # Concurrent assignments of a term conflict on the unique term key
+        concurrency=1,
+    )
+    register_job(
+        "attendance.mark_attendance_bulk",
+        attendance.mark_attendance_bulk,
+        payload_schema=AttendanceMarkBulkRequest,
+        arguments=lambda request: {
+            "class_": request.class_,
+            "attendance_date": request.date,
+            "attendances_data": [
+                {"student_id": att.student_id, "status": att.status}
+                for att in request.attendances
+            ],
+        },
+        concurrency=4,
+    )
+    register_job(
+        "students.withdraw_students",
+        students.withdraw_students,
+        payload_schema=StudentWithdrawRequest,
+        max_attempts=1,
+    )
+    register_job(
+        "students.promote_students",
+        students.promote_students,
+        payload_schema=StudentPromotionRequest,
+        max_attempts=1,
+    )
+    register_job("fees.backfill_fee_ledger", fees.backfill_fee_ledger, max_attempts=1)
+    register_job("pdfs.normalize_legacy_pdf_paths", pdfs.normalize_legacy_pdf_paths, max_attempts=1)
+    register_job("calendar.collapse_uniform_holidays", calendar.collapse_uniform_holidays, max_attempts=1)
+    register_job(
+        "attendance.rebuild_attendance_months",
+        attendance_bitmap.rebuild_attendance_months,
+        max_attempts=1,
+    )
+    register_job(
+        "academic_sessions.archive_session",
+        academic_sessions.archive_session,
+        payload_schema=SessionArchiveRequest,
+        max_attempts=1,
+    )
+    register_job(
+        "cold_archive.archive_history",
+        cold_archive.archive_history,
+        payload_schema=ColdArchiveRequest,
+        # One run at a time; a failed run is simply started again
+        concurrency=1,
+        max_attempts=1,
+    )
+    register_job(
+        "academic_sessions.ensure_academic_sessions",
+        academic_sessions.ensure_academic_sessions,
+        max_attempts=1,
+    )
+    register_job(
+        "dashboard.get_admin_dashboard_summary",
+        dashboard.get_admin_dashboard_summary,
+        concurrency=2,
+    )
+
+
+_register_service_jobs()
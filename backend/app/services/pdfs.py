@@ -6,6 +6,7 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from app.models import PDF
+from app.services.writes import delete_by_id, update_by_id
 
 
 # Ensure uploads directory exists
@@ -156,6 +157,8 @@ def update_pdf(
     """
     Update PDF metadata.
     
+    One UPDATE ... RETURNING statement.
+    
     Args:
         db: Database session
         pdf_id: PDF ID
@@ -165,26 +168,30 @@ def update_pdf(
     Returns:
         Updated PDF object or None if not found
     """
-    pdf = db.query(PDF).filter(PDF.id == pdf_id).first()
-    
-    if not pdf:
-        return None
+    values = {}
     
     if title is not None:
-        pdf.title = title
+        values["title"] = title
     
     if is_public is not None:
-        pdf.is_public = is_public
+        values["is_public"] = is_public
+    
+    row = update_by_id(db, PDF, pdf_id, values)
+    
+    if not row:
+        return None
     
     db.commit()
-    db.refresh(pdf)
-    return pdf
+    return row[0]
 
 
 def delete_pdf(db: Session, pdf_id: int) -> bool:
     """
     Delete a PDF record and its file.
     
+    The row is deleted with one DELETE ... RETURNING statement; the file
+    is removed once the deletion has been committed.
+    
     Args:
         db: Database session
         pdf_id: PDF ID
@@ -192,20 +199,19 @@ def delete_pdf(db: Session, pdf_id: int) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    pdf = db.query(PDF).filter(PDF.id == pdf_id).first()
+    deleted = delete_by_id(db, PDF, pdf_id, PDF.file_path)
     
-    if not pdf:
+    if not deleted:
         return False
     
+    db.commit()
+    
     # Delete file if it exists
-    file_path = UPLOADS_DIR.parent / pdf.file_path
+    file_path = UPLOADS_DIR.parent / deleted.file_path
     if file_path.exists():
         try:
             file_path.unlink()
         except Exception:
             pass  # Continue even if file deletion fails
     
-    # Delete from database
-    db.delete(pdf)
-    db.commit()
     return True
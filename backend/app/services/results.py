@@ -1,10 +1,32 @@
 """Results management service"""
+from datetime import date
 from typing import Dict, List, Optional
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models import Result, Student
 from app.enums.subject_enum import SubjectEnum
+from app.services.academic_sessions import get_session_id_for_date, session_scope
+from app.services.cold_archive import archived_column_rows, archived_objects, archived_sessions
+from app.services.identifiers import (
+    get_columns_for_student_identifier,
+    get_rows_for_student_identifier,
+    resolve_student_pk,
+)
+from app.services.writes import delete_by_id, update_by_id
+
+# Column tuples for the fast serialization path, labelled with the JSON
+# field names of ResultResponse / StudentResultSummary.
+RESULT_COLUMNS = (
+    Result.id,
+    Result.student_id,
+    Result.class_.label("class"),
+    Result.subject,
+    Result.marks,
+    Result.exam_type,
+)
+RESULT_SUMMARY_COLUMNS = (Result.id, Result.subject, Result.marks, Result.exam_type)
 
 
 def create_result(
@@ -17,7 +39,10 @@ def create_result(
     """
     Create result records for a student across all 7 subjects.
     
-    Prevents duplicate entries (one subject per exam_type per student).
+    Prevents duplicate entries (one subject per exam_type per student per
+    academic session). Results are recorded in the current session.
+    Existing subjects are looked up with one query and new rows are
+    inserted with a single INSERT ... RETURNING.
     
     Args:
         db: Database session
@@ -28,6 +53,9 @@ def create_result(
         
     Returns:
         List of created Result objects or None if student doesn't exist
+
+    Raises:
+        ValueError: If the current academic session has been archived
     """
     resolved_class = class_
     if resolved_class is None:
@@ -38,38 +66,43 @@ def create_result(
         resolved_class = student.class_
     
     created_results = []
+    new_rows = []
     
     try:
-        for subject_name, subject_marks in marks.items():
-            subject = SubjectEnum(str(subject_name).upper())
-            
-            # Check if this subject already exists for this exam_type
-            existing = db.query(Result).filter(
+        session_id = get_session_id_for_date(db, date.today(), create=True)
+        existing_subjects = {
+            subject
+            for (subject,) in db.query(Result.subject).filter(
                 Result.student_id == student_id,
                 Result.class_ == resolved_class,
-                Result.subject == subject,
-                Result.exam_type == exam_type
-            ).first()
+                Result.exam_type == exam_type,
+                Result.session_id == session_id
+            ).all()
+        }
+
+        for subject_name, subject_marks in marks.items():
+            subject = SubjectEnum(str(subject_name).upper())
             
-            if existing:
+            if subject in existing_subjects:
                 # Skip or update (we'll skip to prevent duplicates)
                 continue
             
-            new_result = Result(
-                student_id=student_id,
-                class_=resolved_class,
-                subject=subject,
-                marks=subject_marks,
-                exam_type=exam_type
-            )
-            db.add(new_result)
-            created_results.append(new_result)
+            new_rows.append({
+                "student_id": student_id,
+                "class_": resolved_class,
+                "subject": subject,
+                "marks": subject_marks,
+                "exam_type": exam_type,
+                "session_id": session_id,
+            })
         
-        db.commit()
+        if new_rows:
+            created_results = db.scalars(
+                insert(Result).returning(Result),
+                new_rows
+            ).all()
         
-        # Refresh all created results
-        for result in created_results:
-            db.refresh(result)
+        db.commit()
         
         return created_results
     except Exception:
@@ -91,23 +124,142 @@ def get_result(db: Session, result_id: int) -> Optional[Result]:
     return db.query(Result).filter(Result.id == result_id).first()
 
 
-def get_student_results(db: Session, student_id: int) -> List[Result]:
+def get_student_results(
+    db: Session,
+    student_id: int,
+    session_id: Optional[int] = None,
+    all_sessions: bool = False
+) -> List[Result]:
     """
-    Get all results for a student grouped by exam_type.
+    Get a student's results for an academic session grouped by exam_type.
+    
+    Cold-archived sessions are read from their archive files when asked
+    for (by session_id or all_sessions).
     
     Args:
         db: Database session
         student_id: Student database ID
+        session_id: Academic session (default: the current session)
+        all_sessions: Return every session's results instead
         
     Returns:
         List of Result objects
     """
-    return db.query(Result).filter(
-        Result.student_id == student_id
+    results = db.query(Result).filter(
+        Result.student_id == student_id,
+        *session_scope(db, Result.session_id, session_id, all_sessions)
     ).order_by(Result.exam_type, Result.subject).all()
 
+    archived = archived_sessions(db, session_id, all_sessions)
+    if archived:
+        results += archived_objects(Result, archived, student_id=student_id)
+        results.sort(key=lambda result: (result.exam_type, result.subject.value))
+    return results
+
+
+def get_student_results_by_identifier(
+    db: Session,
+    identifier: str,
+    session_id: Optional[int] = None,
+    all_sessions: bool = False
+) -> List[Result]:
+    """
+    Get a student's results by database ID or student_id string.
+    
+    Args:
+        db: Database session
+        identifier: Database ID (digits) or student_id string (e.g. STU5001)
+        session_id: Academic session (default: the current session)
+        all_sessions: Return every session's results instead
+        
+    Returns:
+        List of Result objects (empty if the student doesn't exist)
+    """
+    results = get_rows_for_student_identifier(
+        db, identifier, Result, Result.exam_type, Result.subject,
+        filters=session_scope(db, Result.session_id, session_id, all_sessions)
+    )
+
+    archived = archived_sessions(db, session_id, all_sessions)
+    student_pk = resolve_student_pk(db, identifier) if archived else None
+    if student_pk is not None:
+        results += archived_objects(Result, archived, student_id=student_pk)
+        results.sort(key=lambda result: (result.exam_type, result.subject.value))
+    return results
 
-def get_class_results(db: Session, class_: int, exam_type: Optional[str] = None) -> List[Result]:
+
+def get_student_result_rows(
+    db: Session,
+    student_id: int,
+    session_id: Optional[int] = None,
+    all_sessions: bool = False
+) -> List[Dict]:
+    """
+    Get a student's results as dicts shaped like StudentResultSummary.
+    
+    Args:
+        db: Database session
+        student_id: Student database ID
+        session_id: Academic session (default: the current session)
+        all_sessions: Return every session's results instead
+        
+    Returns:
+        List of dicts keyed by response field name
+    """
+    rows = [
+        row._asdict()
+        for row in db.query(*RESULT_SUMMARY_COLUMNS).filter(
+            Result.student_id == student_id,
+            *session_scope(db, Result.session_id, session_id, all_sessions)
+        ).order_by(Result.exam_type, Result.subject)
+    ]
+
+    archived = archived_sessions(db, session_id, all_sessions)
+    if archived:
+        rows += archived_column_rows(Result, RESULT_SUMMARY_COLUMNS, archived, student_id=student_id)
+        rows.sort(key=lambda row: (row["exam_type"], row["subject"].value))
+    return rows
+
+
+def get_student_result_rows_by_identifier(
+    db: Session,
+    identifier: str,
+    session_id: Optional[int] = None,
+    all_sessions: bool = False
+) -> List[Dict]:
+    """
+    Get a student's results as dicts shaped like ResultResponse.
+    
+    Args:
+        db: Database session
+        identifier: Database ID (digits) or student_id string (e.g. STU5001)
+        session_id: Academic session (default: the current session)
+        all_sessions: Return every session's results instead
+        
+    Returns:
+        List of dicts keyed by response field name (empty if the student
+        doesn't exist)
+    """
+    rows = get_columns_for_student_identifier(
+        db, identifier, Result, RESULT_COLUMNS, Result.exam_type, Result.subject,
+        filters=session_scope(db, Result.session_id, session_id, all_sessions)
+    )
+
+    archived = archived_sessions(db, session_id, all_sessions)
+    student_pk = resolve_student_pk(db, identifier) if archived else None
+    if student_pk is not None:
+        rows += archived_column_rows(Result, RESULT_COLUMNS, archived, student_id=student_pk)
+        rows.sort(key=lambda row: (row["exam_type"], row["subject"].value))
+    return rows
+
+
+def get_class_results(
+    db: Session,
+    class_: int,
+    exam_type: Optional[str] = None,
+    session_id: Optional[int] = None,
+    all_sessions: bool = False
+) -> List[Result]:
     """
     Get results for all students in a class.
     
@@ -115,11 +267,16 @@ def get_class_results(db: Session, class_: int, exam_type: Optional[str] = None)
         db: Database session
         class_: Class number (1-10)
         exam_type: Optional filter by exam type
+        session_id: Academic session (default: the current session)
+        all_sessions: Return every session's results instead
         
     Returns:
         List of Result objects
     """
-    query = db.query(Result).filter(Result.class_ == class_)
+    query = db.query(Result).filter(
+        Result.class_ == class_,
+        *session_scope(db, Result.session_id, session_id, all_sessions)
+    )
     
     if exam_type:
         query = query.filter(Result.exam_type == exam_type)
@@ -127,6 +284,37 @@ def get_class_results(db: Session, class_: int, exam_type: Optional[str] = None)
     return query.order_by(Result.student_id, Result.subject).all()
 
 
+def get_class_result_rows(
+    db: Session,
+    class_: int,
+    exam_type: Optional[str] = None,
+    session_id: Optional[int] = None,
+    all_sessions: bool = False
+) -> List[Dict]:
+    """
+    Get results for a class as dicts shaped like ResultResponse.
+    
+    Args:
+        db: Database session
+        class_: Class number (1-10)
+        exam_type: Optional filter by exam type
+        session_id: Academic session (default: the current session)
+        all_sessions: Return every session's results instead
+        
+    Returns:
+        List of dicts keyed by response field name
+    """
+    query = db.query(*RESULT_COLUMNS).filter(
+        Result.class_ == class_,
+        *session_scope(db, Result.session_id, session_id, all_sessions)
+    )
+    
+    if exam_type:
+        query = query.filter(Result.exam_type == exam_type)
+    
+    return [row._asdict() for row in query.order_by(Result.student_id, Result.subject)]
+
+
 def update_result(
     db: Session,
     result_id: int,
@@ -135,6 +323,8 @@ def update_result(
     """
     Update marks for a result.
     
+    One UPDATE ... RETURNING statement.
+    
     Args:
         db: Database session
         result_id: Result ID
@@ -143,15 +333,13 @@ def update_result(
     Returns:
         Updated Result object or None if not found
     """
-    result = db.query(Result).filter(Result.id == result_id).first()
+    row = update_by_id(db, Result, result_id, {"marks": marks})
     
-    if not result:
+    if not row:
         return None
     
-    result.marks = marks
     db.commit()
-    db.refresh(result)
-    return result
+    return row[0]
 
 
 def delete_result(db: Session, result_id: int) -> bool:
@@ -165,11 +353,10 @@ def delete_result(db: Session, result_id: int) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    result = db.query(Result).filter(Result.id == result_id).first()
+    deleted = delete_by_id(db, Result, result_id)
     
-    if not result:
+    if not deleted:
         return False
     
-    db.delete(result)
     db.commit()
     return True
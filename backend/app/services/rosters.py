@@ -0,0 +1,95 @@
+"""Class roster service for attendance marking.
+
+Teachers reload the roster of their class many times during the morning,
+while students change class rarely. Rosters are cached per class as
+``(id, student_id, name)`` entries. Each class has a version counter in the
+cache backend that the students service bumps on create, update and
+delete, so with a shared backend every worker sees the invalidation. A
+reader that loaded a roster before an invalidation stores it under the old
+version, where nobody will look it up again.
+
+Attendance already marked for the requested date is always read fresh:
+with a cached roster it is one small query, and on a miss the roster and
+statuses come back together from one LEFT JOIN. On a holiday or closure in
+the school calendar, students without a mark are reported as HOLIDAY.
+"""
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_cache
+from app.enums.attendance_enum import AttendanceStatus
+from app.models import Attendance, Student
+from app.services.calendar import get_closure
+
+RosterEntry = Tuple[int, str, str]
+
+# (class_, version) -> list of (Student.id, student_id, name)
+# counter ("version", class_) -> current version of the class roster
+_roster_cache = get_cache("roster", maxsize=64)
+
+
+def invalidate_class_roster(class_: Optional[int]) -> None:
+    """
+    Invalidate the cached roster of a class.
+    
+    Called by the students service whenever a student joins, leaves or
+    changes within a class.
+    
+    Args:
+        class_: Class number (1-10)
+    """
+    if class_ is None:
+        return
+    _roster_cache.incr(("version", class_))
+
+
+def get_class_roster_with_status(db: Session, class_: int, attendance_date: date) -> List[Dict]:
+    """
+    Get a class roster with any attendance already marked for a date.
+    
+    Args:
+        db: Database session
+        class_: Class number (1-10)
+        attendance_date: Date of the register
+        
+    Returns:
+        List of dicts shaped like StudentAttendanceResponse, ordered by
+        student database ID; ``status`` is None where not yet marked, or
+        HOLIDAY when the calendar closes the class that day
+    """
+    unmarked = AttendanceStatus.HOLIDAY if get_closure(db, attendance_date, class_) else None
+    version = _roster_cache.counter(("version", class_))
+    roster = _roster_cache.get((class_, version))
+
+    if roster is None:
+        rows = db.query(
+            Student.id, Student.student_id, Student.name, Attendance.status
+        ).outerjoin(
+            Attendance,
+            and_(Attendance.student_id == Student.id, Attendance.date == attendance_date),
+        ).filter(
+            Student.class_ == class_
+        ).order_by(Student.id).all()
+
+        _roster_cache.set((class_, version), [(row[0], row[1], row[2]) for row in rows])
+        return [
+            {"id": pk, "student_id": student_id, "name": name, "class": class_, "status": status or unmarked}
+            for pk, student_id, name, status in rows
+        ]
+
+    statuses = {}
+    if roster:
+        statuses = dict(
+            db.query(Attendance.student_id, Attendance.status).filter(
+                Attendance.date == attendance_date,
+                Attendance.student_id.in_([pk for pk, _, _ in roster]),
+            ).all()
+        )
+
+    return [
+        {"id": pk, "student_id": student_id, "name": name, "class": class_, "status": statuses.get(pk, unmarked)}
+        for pk, student_id, name in roster
+    ]
@@ -0,0 +1,344 @@
+"""Student search service.
+
+The admin search box matches a few typed characters against student
+names, father's names, phone numbers and student_ids, tolerating typos,
+and shows the best matches as the user types.
+
+- On PostgreSQL with the ``pg_trgm`` extension (created at startup along
+  with GIN trigram indexes on the four columns), matching and ranking run
+  in the database: one indexed query returns the top matches.
+- Elsewhere (SQLite, or PostgreSQL without the extension) each worker
+  keeps an in-memory trigram index of the four columns, built with one
+  query the first time it is needed. The students service bumps a version
+  counter in the cache backend on every change, and a worker rebuilds its
+  index on its next search after the version moves, or once it is older
+  than ``CACHE_TTL_SECONDS`` (changes made by another process, e.g. a
+  script, reach a per-process cache no other way). Without a cache
+  backend (``CACHE_BACKEND=none``) changes cannot be seen, so searches
+  fall back to a LIKE scan instead.
+
+Both rank a student by how many of the query's trigrams appear in the
+best-matching column, the way pg_trgm's ``word_similarity`` does, so
+"kumaar" still finds "Kumar". A student_id starting with the query or a
+phone number containing it matches outright, so "STU50" finds every
+STU50xx and "3210" every phone number with those digits.
+"""
+import bisect
+import heapq
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import case, func, literal, or_, text
+from sqlalchemy.orm import Session
+
+from app.core.cache import NullCacheBackend, get_cache
+from app.core.config import settings
+from app.core.replicas import reads_from_replica
+from app.models import Student
+
+# Share of the query's trigrams a column must contain to match (the
+# default pg_trgm.word_similarity_threshold)
+MIN_SIMILARITY = 0.6
+
+# Searchable columns, in the order they follow the ID in a SearchRow
+SEARCH_COLUMNS = ("student_id", "name", "father_name", "phone")
+_STUDENT_ID_COLUMN = SEARCH_COLUMNS.index("student_id")
+_PHONE_COLUMN = SEARCH_COLUMNS.index("phone")
+# Columns before this one describe the student rather than the family
+_FAMILY_COLUMNS = SEARCH_COLUMNS.index("father_name")
+
+# (id, student_id, name, father_name, phone, class_)
+SearchRow = Tuple[int, str, str, Optional[str], Optional[str], int]
+
+_WORD = re.compile(r"[^\W_]+")
+
+# counter "version" -> bumped whenever a student is added, changed or removed
+_search_cache = get_cache("student_search", maxsize=1)
+
+
+def invalidate_student_search() -> None:
+    """
+    Invalidate every worker's in-memory search index.
+
+    Called by the students service whenever a student is added, changed
+    or removed.
+    """
+    _search_cache.incr("version")
+
+
+def trigrams(value: str, prefix: bool = False) -> Set[str]:
+    """
+    Trigrams of a string, as pg_trgm extracts them.
+
+    The string is lowercased and split into words of letters and digits;
+    each word is padded with two spaces in front and one behind.
+
+    Args:
+        value: Text to split
+        prefix: Treat the last word as a prefix still being typed, so
+            its end-of-word trigram is left out
+
+    Returns:
+        Set of trigrams
+    """
+    grams = set()
+    words = _WORD.findall(value.lower())
+    for position, word in enumerate(words):
+        padded = f"  {word}" if prefix and position == len(words) - 1 else f"  {word} "
+        grams.update(padded[index:index + 3] for index in range(len(padded) - 2))
+    return grams
+
+
+class StudentSearchIndex:
+    """
+    In-memory trigram index of the searchable student columns.
+
+    Each trigram maps to a list of postings ``row * 4 + column``, so one
+    count over the query's trigrams gives, for every row and column, how
+    many of them that column contains. Lowercased student_ids are also
+    kept sorted for prefix lookups, and phone numbers joined into one
+    string for substring lookups.
+    """
+
+    def __init__(self, rows: List[SearchRow], version: int):
+        self.rows = rows
+        self.version = version
+        self.built_at = time.monotonic()
+        self.student_ids = sorted((row[1].lower(), position) for position, row in enumerate(rows))
+        phones = [(row[4] or "").lower() for row in rows]
+        self.phones = "\n".join(phones)
+        self.phone_offsets: List[int] = []
+        offset = 0
+        for phone in phones:
+            self.phone_offsets.append(offset)
+            offset += len(phone) + 1
+        # Number of distinct trigrams of each posting's column, for tie-breaks
+        self.sizes: List[int] = [0] * (len(rows) * len(SEARCH_COLUMNS))
+
+        postings = defaultdict(list)
+        # Names repeat across a school; split each distinct value once
+        split: Dict[str, Set[str]] = {}
+        for position, row in enumerate(rows):
+            for column, value in enumerate(row[1:1 + len(SEARCH_COLUMNS)]):
+                if not value:
+                    continue
+                grams = split.get(value)
+                if grams is None:
+                    grams = split[value] = trigrams(value)
+                posting = position * len(SEARCH_COLUMNS) + column
+                self.sizes[posting] = len(grams)
+                for gram in grams:
+                    postings[gram].append(posting)
+        self.postings: Dict[str, List[int]] = dict(postings)
+
+    def search(self, query: str, limit: int) -> List[Dict]:
+        """
+        Rank the rows matching a query.
+
+        Args:
+            query: Search text
+            limit: Maximum number of matches
+
+        Returns:
+            Up to ``limit`` result dicts, best match first
+        """
+        wanted = trigrams(query, prefix=True)
+        if not wanted:
+            return []
+
+        counts = Counter()
+        for gram in wanted:
+            postings = self.postings.get(gram)
+            if postings:
+                counts.update(postings)
+
+        needed = math.ceil(MIN_SIMILARITY * len(wanted))
+        best: Dict[int, Tuple[float, bool, float]] = {}
+        for posting, shared in counts.items():
+            if shared < needed:
+                continue
+            position, column = divmod(posting, len(SEARCH_COLUMNS))
+            # Similarity to the query; on ties the student's own name and
+            # ID before the father's name and phone, then similarity to
+            # the whole column (so "Ram" ranks above "Ramesh" for "ram")
+            score = (shared / len(wanted), column < _FAMILY_COLUMNS, shared / self.sizes[posting])
+            if score > best.get(position, (0.0, False, 0.0)):
+                best[position] = score
+
+        # Prefix and substring matches, as the LIKE conditions on PostgreSQL
+        for position, column, length in self._literal_matches(query.lower()):
+            score = (1.0, column < _FAMILY_COLUMNS, len(query) / length)
+            if score > best.get(position, (0.0, False, 0.0)):
+                best[position] = score
+
+        top = heapq.nlargest(limit, best.items(), key=lambda item: (item[1], -item[0]))
+        return [_result(self.rows[position], score[0]) for position, score in top]
+
+    def _literal_matches(self, needle: str) -> Iterator[Tuple[int, int, int]]:
+        """(row, column, column length) of student_ids starting with and phones containing a string."""
+        index = bisect.bisect_left(self.student_ids, (needle,))
+        while index < len(self.student_ids) and self.student_ids[index][0].startswith(needle):
+            student_id, position = self.student_ids[index]
+            yield position, _STUDENT_ID_COLUMN, len(student_id)
+            index += 1
+
+        found = self.phones.find(needle)
+        while found != -1:
+            position = bisect.bisect_right(self.phone_offsets, found) - 1
+            length = len(self.rows[position][4])
+            yield position, _PHONE_COLUMN, length
+            # On to the next phone number
+            found = self.phones.find(needle, self.phone_offsets[position] + length)
+
+
+_index: Optional[StudentSearchIndex] = None
+_index_lock = Lock()
+# Whether the database has pg_trgm, checked once per process
+_trigram_sql: Optional[bool] = None
+
+
+def _result(row: SearchRow, score: float) -> Dict:
+    return {
+        "id": row[0],
+        "student_id": row[1],
+        "name": row[2],
+        "father_name": row[3],
+        "phone": row[4],
+        "class": row[5],
+        "score": round(score, 3),
+    }
+
+
+def _load_rows(db: Session) -> List[SearchRow]:
+    return [
+        tuple(row)
+        for row in db.query(
+            Student.id, Student.student_id, Student.name, Student.father_name, Student.phone, Student.class_
+        ).order_by(Student.id)
+    ]
+
+
+def _is_current(index: Optional[StudentSearchIndex], version: int) -> bool:
+    if index is None or index.version != version:
+        return False
+    ttl = settings.CACHE_TTL_SECONDS
+    return not ttl or time.monotonic() - index.built_at < ttl
+
+
+def _local_index(db: Session) -> Optional[StudentSearchIndex]:
+    """This worker's index, rebuilt if a student changed since it was built."""
+    global _index
+
+    if isinstance(_search_cache, NullCacheBackend):
+        return None
+
+    version = _search_cache.counter("version")
+    index = _index
+    if _is_current(index, version):
+        return index
+
+    with _index_lock:
+        index = _index
+        if _is_current(index, version):
+            return index
+        # Read the rows after the version, so a change made during the
+        # build bumps it again and the next search rebuilds
+        index = StudentSearchIndex(_load_rows(db), version)
+        # A replica may lag the primary; use its rows for this search only
+        if not reads_from_replica(db):
+            _index = index
+        return index
+
+
+def _has_trigram_sql(db: Session) -> bool:
+    global _trigram_sql
+
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    if _trigram_sql is None:
+        _trigram_sql = db.execute(
+            text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        ).scalar()
+    return _trigram_sql
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_trigram_sql(db: Session, query: str, limit: int) -> List[Dict]:
+    """Match and rank with pg_trgm, using the GIN trigram indexes."""
+    contains = f"%{_escape_like(query)}%"
+    starts = f"{_escape_like(query)}%"
+    father_name = func.coalesce(Student.father_name, "")
+    phone = func.coalesce(Student.phone, "")
+    score = func.greatest(
+        func.word_similarity(query, Student.name),
+        func.word_similarity(query, father_name),
+        case((Student.student_id.ilike(starts, escape="\\"), 1.0), else_=func.word_similarity(query, Student.student_id)),
+        case((phone.like(contains, escape="\\"), 1.0), else_=0.0),
+    ).label("score")
+
+    rows = db.query(
+        Student.id, Student.student_id, Student.name, Student.father_name, Student.phone, Student.class_, score
+    ).filter(
+        or_(
+            # "%>" is "word_similarity(query, column) >= pg_trgm.word_similarity_threshold"
+            Student.name.op("%>")(query),
+            Student.father_name.op("%>")(query),
+            Student.name.ilike(contains, escape="\\"),
+            Student.father_name.ilike(contains, escape="\\"),
+            Student.student_id.ilike(starts, escape="\\"),
+            Student.phone.like(contains, escape="\\"),
+        )
+    ).order_by(score.desc(), Student.name, Student.id).limit(limit).all()
+    return [_result(row[:6], float(row[6])) for row in rows]
+
+
+def _search_like(db: Session, query: str, limit: int) -> List[Dict]:
+    """Substring match without an index, for workers without a cache."""
+    contains = f"%{_escape_like(query)}%"
+    starts = f"{_escape_like(query)}%"
+    score = case(
+        (Student.student_id.ilike(starts, escape="\\"), literal(1.0)),
+        (Student.name.ilike(starts, escape="\\"), literal(1.0)),
+        else_=literal(0.9),
+    ).label("score")
+
+    rows = db.query(
+        Student.id, Student.student_id, Student.name, Student.father_name, Student.phone, Student.class_, score
+    ).filter(
+        or_(*(getattr(Student, column).ilike(contains, escape="\\") for column in SEARCH_COLUMNS))
+    ).order_by(score.desc(), Student.name, Student.id).limit(limit).all()
+    return [_result(row[:6], float(row[6])) for row in rows]
+
+
+def search_students(db: Session, query: str, limit: int = 20) -> List[Dict]:
+    """
+    Find students by name, father's name, phone number or student_id.
+
+    Args:
+        db: Database session
+        query: Search text; may be a prefix and may contain typos
+        limit: Maximum number of matches
+
+    Returns:
+        Up to ``limit`` dicts shaped like StudentSearchResult, best match
+        first; ``score`` is the share of the query's trigrams found in the
+        best-matching column (1.0 for a prefix or exact match)
+    """
+    query = " ".join(query.split())
+    if not query:
+        return []
+
+    if _has_trigram_sql(db):
+        return _search_trigram_sql(db, query, limit)
+
+    index = _local_index(db)
+    if index is None:
+        return _search_like(db, query, limit)
+    return index.search(query, limit)
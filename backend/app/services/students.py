@@ -1,10 +1,15 @@
 """Student management service"""
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 
+from sqlalchemy import delete, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models import Student
+from app.services.identifiers import invalidate_student_identifier
+from app.services.rosters import invalidate_class_roster
+from app.services.student_search import invalidate_student_search
+from app.services.writes import delete_by_id, update_by_id
 
 
 def _extract_roll_number(student_id: str, class_: int) -> Optional[int]:
@@ -85,6 +90,9 @@ def create_student(db: Session, student_data: dict) -> Optional[Student]:
             db.add(new_student)
             db.commit()
             db.refresh(new_student)
+            invalidate_student_identifier(new_student.student_id)
+            invalidate_class_roster(new_student.class_)
+            invalidate_student_search()
             return new_student
         except IntegrityError as error:
             db.rollback()
@@ -144,6 +152,9 @@ def update_student(
     """
     Update a student.
 
+    One UPDATE ... RETURNING statement, which also returns the previous
+    class and student_id for cache invalidation.
+
     Args:
         db: Database session
         student_id: Student database ID
@@ -152,18 +163,29 @@ def update_student(
     Returns:
         Updated Student object or None if not found
     """
-    student = db.query(Student).filter(Student.id == student_id).first()
-
-    if not student:
-        return None
-
     # Update only provided fields
-    for key, value in student_data.items():
-        if value is not None:
-            setattr(student, key, value)
-
-    db.commit()
-    db.refresh(student)
+    values = {key: value for key, value in student_data.items() if value is not None}
+
+    try:
+        row = update_by_id(
+            db, Student, student_id, values,
+            previous=(Student.class_, Student.student_id),
+        )
+        if not row:
+            return None
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    student, previous_class, previous_student_id = row
+    invalidate_student_identifier(previous_student_id)
+    if student.student_id != previous_student_id:
+        invalidate_student_identifier(student.student_id)
+    invalidate_class_roster(previous_class)
+    if student.class_ != previous_class:
+        invalidate_class_roster(student.class_)
+    invalidate_student_search()
     return student
 
 
@@ -171,6 +193,9 @@ def delete_student(db: Session, student_id: int) -> bool:
     """
     Delete a student.
 
+    One DELETE ... RETURNING statement; attendance, fees, results, ledger
+    entries and the balance go with it through ON DELETE CASCADE.
+
     Args:
         db: Database session
         student_id: Student database ID
@@ -178,11 +203,217 @@ def delete_student(db: Session, student_id: int) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    student = db.query(Student).filter(Student.id == student_id).first()
+    deleted = delete_by_id(db, Student, student_id, Student.student_id, Student.class_)
 
-    if not student:
+    if not deleted:
         return False
 
-    db.delete(student)
     db.commit()
+    invalidate_student_identifier(deleted.student_id)
+    invalidate_class_roster(deleted.class_)
+    invalidate_student_search()
     return True
+
+
+def withdraw_students(
+    db: Session,
+    class_: Optional[int] = None,
+    student_ids: Optional[List[int]] = None,
+    report_progress: Optional[Callable[[int, Optional[str]], None]] = None
+) -> dict:
+    """
+    Delete many students and their history with set-based statements.
+
+    Targets every student in a class or an explicit list of student IDs.
+    The students are removed with one DELETE ... RETURNING (a SELECT and a
+    DELETE on dialects without RETURNING); their attendance, fees, results,
+    ledger entries and balances go through ON DELETE CASCADE, so the
+    statement count does not grow with the size of their history.
+
+    Args:
+        db: Database session
+        class_: Optional class number (1-10)
+        student_ids: Optional list of student database IDs
+        report_progress: Optional callback taking a percentage and a
+            message, called before the delete and after the commit
+
+    Returns:
+        Dict with withdrawn count, withdrawn_ids and not_found_ids
+    """
+    if class_ is None and not student_ids:
+        raise ValueError("Provide either class_ or student_ids")
+
+    target = Student.class_ == class_ if class_ is not None else Student.id.in_(student_ids)
+    returned = (Student.id, Student.student_id, Student.class_)
+    if report_progress:
+        target_name = f"class {class_}" if class_ is not None else f"{len(student_ids)} students"
+        report_progress(0, f"Withdrawing {target_name}")
+
+    try:
+        if getattr(db.get_bind().dialect, "delete_returning", False):
+            rows = db.execute(delete(Student).where(target).returning(*returned)).all()
+        else:
+            rows = db.execute(select(*returned).where(target).with_for_update()).all()
+            if rows:
+                db.execute(delete(Student).where(target))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    for row in rows:
+        invalidate_student_identifier(row.student_id)
+    for withdrawn_class in {row.class_ for row in rows}:
+        invalidate_class_roster(withdrawn_class)
+    if rows:
+        invalidate_student_search()
+    if report_progress:
+        report_progress(100, f"Withdrew {len(rows)} students")
+
+    withdrawn_ids = sorted(row.id for row in rows)
+    return {
+        "withdrawn": len(rows),
+        "withdrawn_ids": withdrawn_ids,
+        "not_found_ids": sorted(set(student_ids or []) - set(withdrawn_ids)),
+    }
+
+
+FINAL_CLASS = 10
+
+
+def promote_students(
+    db: Session,
+    classes: Optional[Iterable[int]] = None,
+    detained_ids: Optional[Iterable[int]] = None,
+    reissue_student_ids: bool = False,
+    dry_run: bool = False,
+    report_progress: Optional[Callable[[int, Optional[str]], None]] = None
+) -> dict:
+    """
+    Move whole classes up one class with set-based statements.
+
+    Every student in the given classes moves to the next class with one
+    UPDATE, except detained students, who stay where they are. With
+    ``reissue_student_ids`` promoted students get a student_id of their
+    new class (STU{class}{roll:03d}), numbered in their previous order
+    after the highest roll already taken in that class, and written with
+    one batched UPDATE. Everything happens in one transaction, so the
+    statement count does not grow with the size of the school.
+
+    Args:
+        db: Database session
+        classes: Classes to promote (default: every class below the final one)
+        detained_ids: Student database IDs to keep in their class
+        reissue_student_ids: Give promoted students new student_id strings
+        dry_run: Build the report, then roll back instead of committing
+        report_progress: Optional callback taking a percentage and a
+            message, called before the updates and after the commit
+
+    Returns:
+        Dict with promoted and detained counts, a per-class breakdown,
+        reissued IDs and detained IDs that were not found in the
+        promoted classes
+
+    Raises:
+        ValueError: If a class is out of range or is the final class
+    """
+    classes = sorted(set(classes if classes is not None else range(1, FINAL_CLASS)))
+    invalid = [class_ for class_ in classes if not 1 <= class_ < FINAL_CLASS]
+    if invalid:
+        raise ValueError(
+            f"Only classes 1-{FINAL_CLASS - 1} can be promoted; withdraw class {FINAL_CLASS} leavers instead"
+        )
+    detained_ids = set(detained_ids or [])
+
+    try:
+        # Lock and read the whole school once; reissued numbers must not
+        # collide with any student_id, whatever class its holder is in
+        students = db.execute(
+            select(Student.id, Student.student_id, Student.class_).with_for_update()
+        ).all()
+
+        promoted = [row for row in students if row.class_ in classes and row.id not in detained_ids]
+        detained = [row for row in students if row.class_ in classes and row.id in detained_ids]
+        if report_progress:
+            report_progress(10, f"Promoting {len(promoted)} students, detaining {len(detained)}")
+
+        if promoted:
+            db.execute(
+                update(Student)
+                .where(Student.class_.in_(classes), Student.id.notin_(list(detained_ids)))
+                .values(class_=Student.class_ + 1)
+                .execution_options(synchronize_session=False)
+            )
+
+        reissued = []
+        if reissue_student_ids and promoted:
+            current_ids: Dict[int, str] = {row.id: row.student_id for row in students}
+            # Highest destination class first: its students' old IDs are the
+            # ones the next class down is renumbered into
+            for to_class in sorted({row.class_ + 1 for row in promoted}, reverse=True):
+                next_roll = max(
+                    (
+                        roll for roll in (
+                            _extract_roll_number(student_id, to_class)
+                            for student_id in current_ids.values()
+                        )
+                        if roll is not None
+                    ),
+                    default=0,
+                ) + 1
+                moving = sorted(
+                    (row for row in promoted if row.class_ + 1 == to_class),
+                    key=lambda row: (_extract_roll_number(row.student_id, row.class_) or 0, row.student_id),
+                )
+                for row in moving:
+                    new_student_id = f"STU{to_class}{next_roll:03d}"
+                    next_roll += 1
+                    current_ids[row.id] = new_student_id
+                    reissued.append({
+                        "id": row.id,
+                        "old_student_id": row.student_id,
+                        "new_student_id": new_student_id,
+                    })
+
+            # One executemany, in the order the numbers were freed
+            db.execute(
+                update(Student),
+                [{"id": entry["id"], "student_id": entry["new_student_id"]} for entry in reissued],
+            )
+
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if not dry_run:
+        for entry in reissued:
+            invalidate_student_identifier(entry["old_student_id"])
+            invalidate_student_identifier(entry["new_student_id"])
+        for class_ in set(classes) | {class_ + 1 for class_ in classes}:
+            invalidate_class_roster(class_)
+        invalidate_student_search()
+    if report_progress:
+        outcome = "Dry run: would promote" if dry_run else "Promoted"
+        report_progress(100, f"{outcome} {len(promoted)} students, reissuing {len(reissued)} IDs")
+
+    by_class = []
+    for class_ in classes:
+        by_class.append({
+            "from_class": class_,
+            "to_class": class_ + 1,
+            "promoted": sum(1 for row in promoted if row.class_ == class_),
+            "detained": sum(1 for row in detained if row.class_ == class_),
+        })
+
+    return {
+        "dry_run": dry_run,
+        "promoted": len(promoted),
+        "detained": len(detained),
+        "classes": by_class,
+        "reissued": reissued,
+        "detained_not_found_ids": sorted(detained_ids - {row.id for row in detained}),
+    }
@@ -0,0 +1,126 @@
+"""Single-statement writes by primary key.
+
+Edits used to SELECT the row, change it, commit and refresh it: three
+round trips and a second transaction per request. These helpers issue one
+``UPDATE ... RETURNING`` or ``DELETE ... RETURNING`` instead on dialects
+that support it (PostgreSQL, SQLite 3.35+). Values from before an update,
+needed for ledger deltas and cache invalidation, come back from the same
+statement through a self-join on the target row, read with ``FOR UPDATE``
+so a concurrent edit cannot slip between the read and the write.
+
+SQLite cannot return columns of the joined row, so there an update that
+needs previous values reads them first (two statements). Dialects without
+RETURNING lock the row with ``SELECT ... FOR UPDATE`` before writing and
+re-read it afterwards.
+
+Updated instances are returned detached from the session, so the caller's
+commit does not expire them and serializing them costs no further query.
+"""
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+
+def _returning_supported(db: Session, statement: str) -> bool:
+    return bool(getattr(db.get_bind().dialect, f"{statement}_returning", False))
+
+
+def _returns_joined_columns(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    # SQLite accepts UPDATE ... FROM ... RETURNING but only returns columns
+    # of the updated table.
+    return bool(dialect.update_returning_multifrom) and dialect.name != "sqlite"
+
+
+def update_by_id(
+    db: Session,
+    model,
+    pk: int,
+    values: Dict[str, Any],
+    previous: Sequence = (),
+) -> Optional[Tuple]:
+    """
+    Update one row by primary key and return it.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: Database session
+        model: Mapped class with an ``id`` primary key
+        pk: Primary key of the row
+        values: Attribute names mapped to new values or SQL expressions
+        previous: Columns whose values before the update are also returned
+
+    Returns:
+        Tuple of the updated instance followed by the previous values of
+        ``previous``, or None if no row has that key
+    """
+    if not values:
+        row = db.execute(select(model, *previous).where(model.id == pk)).first()
+    elif _returning_supported(db, "update") and (
+        not previous or _returns_joined_columns(db)
+    ):
+        old = select(
+            model.id.label("pk"),
+            *[column.label(f"previous_{n}") for n, column in enumerate(previous)],
+        ).where(model.id == pk).with_for_update().subquery()
+        statement = update(model).where(model.id == old.c.pk).values(values).returning(
+            model,
+            *[old.c[f"previous_{n}"] for n in range(len(previous))],
+        )
+        row = db.execute(statement).first()
+    elif _returning_supported(db, "update"):
+        locked = db.execute(
+            select(model.id, *previous).where(model.id == pk).with_for_update()
+        ).first()
+        if locked is None:
+            return None
+        instance = db.execute(
+            update(model).where(model.id == pk).values(values).returning(model)
+        ).scalar_one()
+        row = (instance, *locked[1:])
+    else:
+        locked = db.execute(
+            select(model.id, *previous).where(model.id == pk).with_for_update()
+        ).first()
+        if locked is None:
+            return None
+        db.execute(update(model).where(model.id == pk).values(values))
+        instance = db.execute(
+            select(model).where(model.id == pk).execution_options(populate_existing=True)
+        ).scalar_one()
+        row = (instance, *locked[1:])
+
+    if row is None:
+        return None
+    db.expunge(row[0])
+    return tuple(row)
+
+
+def delete_by_id(db: Session, model, pk: int, *columns) -> Optional[Row]:
+    """
+    Delete one row by primary key, returning some of its columns.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        db: Database session
+        model: Mapped class with an ``id`` primary key
+        pk: Primary key of the row
+        columns: Columns to return from the deleted row (default: ``id``)
+
+    Returns:
+        Row of the requested columns, or None if no row has that key
+    """
+    columns = columns or (model.id,)
+    statement = delete(model).where(model.id == pk)
+
+    if _returning_supported(db, "delete"):
+        return db.execute(statement.returning(*columns)).first()
+
+    row = db.execute(select(*columns).where(model.id == pk).with_for_update()).first()
+    if row is not None:
+        db.execute(statement)
+    return row
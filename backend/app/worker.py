@@ -0,0 +1,161 @@
+"""Background job worker.
+
+Claims jobs from the ``jobs`` table and runs them with the service
+functions registered in ``app.services.jobs``. Run one or more worker
+processes next to the API, from the backend directory:
+
+    python -m app.worker [--concurrency 2] [--types fees.assign_fees_bulk ...] [--once]
+
+SIGINT/SIGTERM stop claiming new jobs and let running ones finish.
+
+Jobs invalidate caches (student IDs, rosters, sessions) from this process,
+so the API must not keep per-process caches: the worker refuses to start
+unless the cache is shared (``CACHE_URL``) or disabled
+(``CACHE_BACKEND=none``), with the same setting on the API.
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+from typing import Optional, Sequence, Set
+
+from app.core.cache import configured_backend_name
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, engine
+from app.models import Job
+from app.services.jobs import (
+    claim_next_job,
+    execute_job,
+    get_job_types,
+    requeue_stale_jobs,
+    touch_jobs,
+)
+
+logger = logging.getLogger("app.worker")
+
+
+class Worker:
+    """Runs ``concurrency`` job slots in threads of one process."""
+
+    def __init__(
+        self,
+        concurrency: int = 1,
+        job_types: Optional[Sequence[str]] = None,
+        poll_interval: float = settings.JOB_POLL_INTERVAL_SECONDS,
+        once: bool = False,
+    ):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency = concurrency
+        self.job_types = job_types
+        self.poll_interval = poll_interval
+        self.once = once
+        self.stopping = threading.Event()
+        self._running: Set[int] = set()
+        self._running_lock = threading.Lock()
+
+    def run(self) -> None:
+        Base.metadata.create_all(bind=engine, tables=[Job.__table__])
+        logger.info(
+            "Worker %s started with %d slot(s) for %s",
+            self.worker_id, self.concurrency,
+            ", ".join(self.job_types or [job_type.name for job_type in get_job_types()]),
+        )
+
+        heartbeat = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        heartbeat.start()
+        slots = [
+            threading.Thread(target=self._slot, name=f"job-slot-{n}")
+            for n in range(self.concurrency)
+        ]
+        for slot in slots:
+            slot.start()
+        for slot in slots:
+            slot.join()
+        self.stopping.set()
+        logger.info("Worker %s stopped", self.worker_id)
+
+    def stop(self, *_args) -> None:
+        logger.info("Worker %s stopping after running jobs finish", self.worker_id)
+        self.stopping.set()
+
+    def _slot(self) -> None:
+        while not self.stopping.is_set():
+            job_id = self._claim()
+            if job_id is None:
+                if self.once:
+                    return
+                self.stopping.wait(self.poll_interval)
+                continue
+
+            with self._running_lock:
+                self._running.add(job_id)
+            try:
+                status = execute_job(SessionLocal, job_id)
+                logger.info("Job %s finished as %s", job_id, status.value if status else None)
+            except Exception:
+                logger.exception("Job %s could not be recorded", job_id)
+            finally:
+                with self._running_lock:
+                    self._running.discard(job_id)
+
+    def _claim(self) -> Optional[int]:
+        db = SessionLocal()
+        try:
+            recovered = requeue_stale_jobs(db, settings.JOB_STALE_SECONDS)
+            if recovered:
+                logger.warning("Recovered %d stale job(s)", recovered)
+            job = claim_next_job(db, self.worker_id, self.job_types)
+            return job.id if job is not None else None
+        except Exception:
+            db.rollback()
+            logger.exception("Claiming a job failed")
+            return None
+        finally:
+            db.close()
+
+    def _heartbeat(self) -> None:
+        while not self.stopping.wait(settings.JOB_HEARTBEAT_SECONDS):
+            with self._running_lock:
+                running = list(self._running)
+            db = SessionLocal()
+            try:
+                touch_jobs(db, running)
+            except Exception:
+                db.rollback()
+                logger.exception("Job heartbeat failed")
+            finally:
+                db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=1, help="Jobs run at once by this process")
+    parser.add_argument("--types", nargs="*", help="Only run these job types")
+    parser.add_argument("--poll-interval", type=float, default=settings.JOB_POLL_INTERVAL_SECONDS)
+    parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    args = parser.parse_args()
+
+    backend = configured_backend_name()
+    if backend not in ("redis", "none"):
+        parser.error(
+            f"the {backend!r} cache backend is per process, so the API would not see this "
+            "worker's cache invalidations; set CACHE_URL (or CACHE_BACKEND=none) for the "
+            "API and the workers"
+        )
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker = Worker(
+        concurrency=max(1, args.concurrency),
+        job_types=args.types or None,
+        poll_interval=args.poll_interval,
+        once=args.once,
+    )
+    signal.signal(signal.SIGINT, worker.stop)
+    signal.signal(signal.SIGTERM, worker.stop)
+    worker.run()
+
+
+if __name__ == "__main__":
+    main()
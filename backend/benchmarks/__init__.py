@@ -0,0 +1,5 @@
+"""Performance benchmarks for the backend.
+
+Run individual benchmarks as modules from the backend directory, e.g.
+``python -m benchmarks.bench_fee_sum``.
+"""
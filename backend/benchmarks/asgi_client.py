@@ -0,0 +1,130 @@
+"""Minimal in-process ASGI client used by the benchmark and budget runners.
+
+Calls the application directly, without sockets or an HTTP client
+library, so measurements include only the app's own work.
+"""
+import json
+import uuid
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+
+class Response:
+    """Collected ASGI response."""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], body: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class AsgiClient:
+    """Send requests to an ASGI app from within a running event loop."""
+
+    def __init__(self, app, headers: Optional[Dict[str, str]] = None):
+        self.app = app
+        self.headers = dict(headers or {})
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        json_body=None,
+        params: Optional[dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        files: Optional[Dict[str, Tuple[str, bytes, str]]] = None,
+        data: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        request_headers = {**self.headers, **(headers or {})}
+        body = b""
+
+        if json_body is not None:
+            body = json.dumps(json_body, default=str).encode()
+            request_headers["content-type"] = "application/json"
+        elif files is not None or data is not None:
+            body, content_type = _encode_multipart(data or {}, files or {})
+            request_headers["content-type"] = content_type
+
+        request_headers["content-length"] = str(len(body))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method.upper(),
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": urlencode(params or {}).encode(),
+            "headers": [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in request_headers.items()
+            ],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return {"type": "http.disconnect"}
+
+        status_code = 500
+        response_headers: Dict[str, str] = {}
+        chunks = []
+
+        async def send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", []):
+                    response_headers[name.decode("latin-1")] = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return Response(status_code, response_headers, b"".join(chunks))
+
+    async def get(self, path: str, **kwargs) -> Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, json_body=None, **kwargs) -> Response:
+        return await self.request("POST", path, json_body=json_body, **kwargs)
+
+    async def put(self, path: str, json_body=None, **kwargs) -> Response:
+        return await self.request("PUT", path, json_body=json_body, **kwargs)
+
+    async def delete(self, path: str, **kwargs) -> Response:
+        return await self.request("DELETE", path, **kwargs)
+
+
+def _encode_multipart(data: Dict[str, str], files: Dict[str, Tuple[str, bytes, str]]):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in data.items():
+        parts.append(
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"{name}\"\r\n\r\n{value}\r\n".encode()
+        )
+    for name, (filename, content, content_type) in files.items():
+        parts.append(
+            (
+                f"--{boundary}\r\nContent-Disposition: form-data; name=\"{name}\"; "
+                f"filename=\"{filename}\"\r\nContent-Type: {content_type}\r\n\r\n"
+            ).encode() + content + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+@asynccontextmanager
+async def running_app(app):
+    """Run the app's lifespan (startup/shutdown) around a block."""
+    async with app.router.lifespan_context(app):
+        yield AsgiClient(app)
@@ -0,0 +1,195 @@
+"""Benchmark: month bitmap attendance storage against attendance rows.
+
+Generates a school with ``--years`` of daily attendance in a scratch
+SQLite file, builds the month bitmaps (``attendance_months``) from the
+rows and reports:
+
+- storage: rows and bytes (table plus indexes, from ``dbstat``) of each
+  representation, and the time to build the bitmaps;
+- latency (median of ``--repeat`` runs) of
+  - ``student_history``: a student's monthly summaries and streaks over
+    the whole history;
+  - ``class_month``: one class register's totals for a month;
+  - ``school_year``: attendance percentage of the whole school over the
+    last twelve months.
+
+Each case runs against the rows (``rows``, the service with
+ATTENDANCE_BITMAP_ENABLED off, or a plain SQL aggregate) and against the
+bitmaps with bit operations (``bitmap``).
+
+Usage:
+    python -m benchmarks.bench_attendance_bitmap [--years 3] [--students 40] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import case, create_engine, func, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, install_sqlite_pragmas  # noqa: E402
+from app.enums.attendance_enum import AttendanceStatus  # noqa: E402
+from app.models import Attendance, AttendanceMonth, Student  # noqa: E402
+from app.services.attendance_bitmap import (  # noqa: E402
+    get_class_monthly_attendance,
+    get_student_monthly_attendance,
+    month_start,
+    rebuild_attendance_months,
+)
+from benchmarks.datagen import SchoolSpec, generate_school  # noqa: E402
+
+CLASSES = 10
+
+
+def _median_ms(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+def _storage(db, table: str) -> dict:
+    rows = db.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+    size = db.execute(text(
+        "SELECT COALESCE(SUM(s.pgsize), 0) FROM dbstat s "
+        "JOIN sqlite_master m ON s.name = m.name WHERE m.tbl_name = :table"
+    ), {"table": table}).scalar()
+    return {"rows": rows, "bytes": size, "bytes_per_student": None}
+
+
+def _school_year_rows(db, start: date, end: date) -> float:
+    present, marked = db.query(
+        func.sum(case((Attendance.status == AttendanceStatus.PRESENT, 1), else_=0)),
+        func.count(Attendance.id),
+    ).filter(
+        Attendance.date >= start,
+        Attendance.date <= end,
+        Attendance.status != AttendanceStatus.HOLIDAY,
+    ).one()
+    return present / marked * 100.0 if marked else 0.0
+
+
+def _school_year_bitmap(db, start: date, end: date) -> float:
+    present = absent = 0
+    for present_days, absent_days in db.query(
+        AttendanceMonth.present_days, AttendanceMonth.absent_days
+    ).filter(AttendanceMonth.month >= start, AttendanceMonth.month <= end):
+        present += present_days.bit_count()
+        absent += absent_days.bit_count()
+    return present / (present + absent) * 100.0 if present + absent else 0.0
+
+
+def _student_history_sql(db, student_id: int) -> list:
+    return db.query(
+        func.strftime("%Y-%m", Attendance.date), Attendance.status, func.count(Attendance.id)
+    ).filter(Attendance.student_id == student_id).group_by(
+        func.strftime("%Y-%m", Attendance.date), Attendance.status
+    ).all()
+
+
+def run(years: int, students: int, repeat: int) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="bench_bitmap_"))
+    try:
+        engine = create_engine(f"sqlite:///{workdir / 'school.db'}")
+        install_sqlite_pragmas(engine)
+        Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+        Base.metadata.create_all(bind=engine)
+        db = Session()
+
+        end = date.today()
+        counts = generate_school(db, SchoolSpec(
+            classes=CLASSES, students_per_class=students, years=years, pdfs=0, end_date=end,
+        ))
+
+        started = time.perf_counter()
+        rebuilt = rebuild_attendance_months(db)
+        build_seconds = time.perf_counter() - started
+        db.execute(text("ANALYZE"))
+
+        total_students = counts["students"]
+        storage = {
+            "rows": _storage(db, "attendances"),
+            "bitmap": _storage(db, "attendance_months"),
+        }
+        for entry in storage.values():
+            entry["bytes_per_student"] = round(entry["bytes"] / total_students)
+        storage["bitmap_to_rows_ratio"] = round(
+            storage["bitmap"]["bytes"] / storage["rows"]["bytes"], 4
+        )
+
+        student_id = db.query(Student.id).filter(Student.class_ == CLASSES).order_by(Student.id).first().id
+        last_month = month_start(end.replace(day=1) - timedelta(days=1))
+        year_start = end.replace(year=end.year - 1)
+
+        def with_bitmap(enabled: bool, func):
+            def call():
+                settings.ATTENDANCE_BITMAP_ENABLED = enabled
+                return func()
+            return call
+
+        cases = {
+            "student_history": {
+                "rows_sql_group_by": lambda: _student_history_sql(db, student_id),
+                "rows": with_bitmap(False, lambda: get_student_monthly_attendance(db, student_id, end=end)),
+                "bitmap": with_bitmap(True, lambda: get_student_monthly_attendance(db, student_id, end=end)),
+            },
+            "class_month": {
+                "rows": with_bitmap(False, lambda: get_class_monthly_attendance(db, CLASSES, last_month)),
+                "bitmap": with_bitmap(True, lambda: get_class_monthly_attendance(db, CLASSES, last_month)),
+            },
+            "school_year": {
+                "rows": lambda: _school_year_rows(db, month_start(year_start), end),
+                "bitmap": lambda: _school_year_bitmap(db, month_start(year_start), end),
+            },
+        }
+
+        # Both representations must give the same answers
+        consistent = {
+            "student_history": cases["student_history"]["rows"]() == cases["student_history"]["bitmap"](),
+            "class_month": cases["class_month"]["rows"]() == cases["class_month"]["bitmap"](),
+        }
+
+        latency_ms = {
+            name: {variant: _median_ms(func, repeat) for variant, func in variants.items()}
+            for name, variants in cases.items()
+        }
+
+        db.close()
+        engine.dispose()
+        return {
+            "years": years,
+            "students": total_students,
+            "attendance_rows": counts["attendances"],
+            "months_built": rebuilt["months"],
+            "build_seconds": round(build_seconds, 3),
+            "storage": storage,
+            "consistent": consistent,
+            "latency_ms": latency_ms,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--students", type=int, default=40, help="Students per class")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.years, args.students, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
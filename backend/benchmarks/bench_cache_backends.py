@@ -0,0 +1,108 @@
+"""Benchmark: cache backend latency and cross-worker coherence.
+
+Times get/set/incr for each cache backend, then checks coherence the way
+two workers would see it: two independent backend instances for the same
+namespace, where "worker A" caches a roster and bumps its version and
+"worker B" must stop serving the old roster.
+
+The ``redis`` backend runs against ``--cache-url`` when given (a local
+Redis, Valkey or KeyDB) or, without one, an in-memory ``fakeredis`` server
+when that package is installed.
+
+Usage:
+    python -m benchmarks.bench_cache_backends [--ops 20000] [--cache-url redis://localhost:6379/15]
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+import uuid
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.core.cache import (  # noqa: E402
+    CacheBackend,
+    LocalCacheBackend,
+    NullCacheBackend,
+    RedisCacheBackend,
+)
+
+ROSTER = [[pk, f"STU{5000 + pk}", f"Student {pk}"] for pk in range(40)]
+
+
+def redis_factory(cache_url: str):
+    """Return a callable creating a client per simulated worker, or None."""
+    if cache_url:
+        import redis
+
+        return lambda: redis.Redis.from_url(cache_url)
+    try:
+        import fakeredis
+    except ImportError:
+        return None
+    server = fakeredis.FakeServer()
+    return lambda: fakeredis.FakeStrictRedis(server=server)
+
+
+def time_ops(backend: CacheBackend, ops: int) -> dict:
+    def per_op_us(fn) -> float:
+        started = time.perf_counter()
+        for i in range(ops):
+            fn(i)
+        return (time.perf_counter() - started) / ops * 1e6
+
+    return {
+        "set_us": round(per_op_us(lambda i: backend.set(("class", i % 64), ROSTER)), 2),
+        "get_us": round(per_op_us(lambda i: backend.get(("class", i % 64))), 2),
+        "incr_us": round(per_op_us(lambda i: backend.incr(("version", i % 64))), 2),
+    }
+
+
+def check_coherence(worker_a: CacheBackend, worker_b: CacheBackend) -> dict:
+    """Cache a roster in both workers, invalidate from A, read from B."""
+    class_ = 7
+    version = worker_b.counter(("version", class_))
+    worker_b.set((class_, version), ROSTER)
+    worker_a.set((class_, worker_a.counter(("version", class_))), ROSTER)
+
+    worker_a.incr(("version", class_))
+    new_version = worker_b.counter(("version", class_))
+    stale = worker_b.get((class_, new_version)) is not None
+    return {"invalidation_seen": new_version != version, "served_stale": stale}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--cache-url", default="", help="Redis-compatible server to test against")
+    args = parser.parse_args()
+
+    # Namespaced per run so a shared server is left as it was found.
+    namespace = f"bench-{uuid.uuid4().hex[:8]}"
+    factories = {
+        "local": lambda: LocalCacheBackend(maxsize=1024),
+        "none": NullCacheBackend,
+    }
+    make_client = redis_factory(args.cache_url)
+    if make_client is not None:
+        factories["redis"] = lambda: RedisCacheBackend(make_client(), namespace, ttl=60)
+
+    report = {}
+    for name, factory in factories.items():
+        backend = factory()
+        timings = [time_ops(backend, args.ops) for _ in range(3)]
+        report[name] = {
+            key: statistics.median(run[key] for run in timings) for key in timings[0]
+        }
+        report[name].update(check_coherence(factory(), factory()))
+        backend.clear()
+    if make_client is None:
+        report["redis"] = {"skipped": "pass --cache-url or install fakeredis"}
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark: cold archive of past academic sessions.
+
+Generates a school with several years of history in a scratch SQLite
+file, then for each archive format (on a fresh copy of the database):
+
+- archives every session before the current one with ``archive_history``;
+- reports the rows moved, the archive size on disk against the SQLite
+  file size before and after (VACUUMed), and the archive time;
+- times a student's all-sessions attendance history read before and
+  after archiving, and checks both return the same rows.
+
+Requires pyarrow.
+
+Usage:
+    python -m benchmarks.bench_cold_archive [--students 40] [--years 3] [--reads 50]
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, install_sqlite_pragmas  # noqa: E402
+from app.models import Student  # noqa: E402
+from app.services.attendance import get_student_attendance_rows  # noqa: E402
+from app.services.cold_archive import ARCHIVE_FORMATS, archive_history  # noqa: E402
+from benchmarks.datagen import SchoolSpec, generate_school  # noqa: E402
+
+
+def _session_factory(path: Path):
+    engine = create_engine(f"sqlite:///{path}")
+    install_sqlite_pragmas(engine)
+    return engine, sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+def _vacuumed_size(engine, path: Path) -> int:
+    with engine.connect() as conn:
+        conn.exec_driver_sql("VACUUM")
+    return path.stat().st_size
+
+
+def _read(db, student_ids, reads: int):
+    started = time.perf_counter()
+    for n in range(reads):
+        rows = get_student_attendance_rows(db, student_ids[n % len(student_ids)], all_sessions=True)
+    return rows, (time.perf_counter() - started) / reads
+
+
+def run(students: int, years: int, reads: int) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="bench_cold_archive_"))
+    seeded = workdir / "seeded.db"
+    try:
+        engine, Session = _session_factory(seeded)
+        Base.metadata.create_all(bind=engine)
+        db = Session()
+        try:
+            generate_school(db, SchoolSpec(
+                students_per_class=students, years=years, pdfs=0, end_date=date.today(),
+            ))
+        finally:
+            db.close()
+        database_bytes = _vacuumed_size(engine, seeded)
+        engine.dispose()
+
+        report = {"students_per_class": students, "years": years, "database_bytes": database_bytes, "formats": {}}
+        for archive_format in ARCHIVE_FORMATS:
+            copy = workdir / f"{archive_format}.db"
+            shutil.copyfile(seeded, copy)
+            settings.ARCHIVE_DIR = str(workdir / f"archive-{archive_format}")
+            settings.ARCHIVE_FORMAT = archive_format
+            engine, Session = _session_factory(copy)
+            db = Session()
+            try:
+                student_ids = [student_id for (student_id,) in db.query(Student.id).order_by(Student.id)]
+                live_rows, live_seconds = _read(db, student_ids, reads)
+
+                started = time.perf_counter()
+                archived = archive_history(db, date.today())
+                seconds = time.perf_counter() - started
+
+                archived_rows, archived_seconds = _read(db, student_ids, reads)
+                report["formats"][archive_format] = {
+                    "sessions": len(archived["sessions"]),
+                    "rows": sum(sum(entry["rows"].values()) for entry in archived["sessions"]),
+                    "archive_bytes": sum(entry["bytes"] for entry in archived["sessions"]),
+                    "database_bytes_after": _vacuumed_size(engine, copy),
+                    "archive_seconds": round(seconds, 4),
+                    "history_read_ms_live": round(live_seconds * 1000, 3),
+                    "history_read_ms_archived": round(archived_seconds * 1000, 3),
+                    "same_rows": live_rows == archived_rows,
+                }
+            finally:
+                db.close()
+                engine.dispose()
+        return report
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=40, help="Students per class")
+    parser.add_argument("--years", type=int, default=3, help="Years of history")
+    parser.add_argument("--reads", type=int, default=50, help="History reads timed per phase")
+    args = parser.parse_args()
+    print(json.dumps(run(args.students, args.years, args.reads), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark: cold start time to the first successful ``/health``.
+
+Starts uvicorn in a fresh process against a scratch SQLite database and
+polls until ``/health`` answers 200, then until ``/ready`` does, then
+measures how long the first real request (``/public/pdfs``) takes on top. Each run uses a new
+process so nothing is cached in the interpreter; run both modes to see
+what ``LIGHTWEIGHT_BOOT`` buys.
+
+Usage:
+    python -m benchmarks.bench_cold_start [--runs 5] [--database-url URL]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, Optional
+
+POLL_INTERVAL = 0.005
+TIMEOUT_SECONDS = 60
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url: str) -> Optional[int]:
+    try:
+        with urllib.request.urlopen(url, timeout=TIMEOUT_SECONDS) as response:
+            return response.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+    except (ConnectionError, urllib.error.URLError):
+        return None
+
+
+def _wait_for(url: str, server: subprocess.Popen, started: float) -> float:
+    while _get(url) != 200:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with {server.returncode}")
+        if time.perf_counter() - started > TIMEOUT_SECONDS:
+            raise TimeoutError(f"{url} did not answer 200")
+        time.sleep(POLL_INTERVAL)
+    return time.perf_counter() - started
+
+
+def cold_start(lightweight: bool, database_url: Optional[str]) -> Dict[str, float]:
+    """
+    Time one server start.
+
+    Args:
+        lightweight: Set LIGHTWEIGHT_BOOT for the server process
+        database_url: Database to boot against; a new SQLite file if None
+
+    Returns:
+        Seconds until the first 200 from /health, /ready and /public/pdfs
+    """
+    scratch = None
+    if database_url is None:
+        scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        scratch.close()
+        database_url = f"sqlite:///{scratch.name}"
+
+    port = _free_port()
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": database_url,
+        "SECRET_KEY": env.get("SECRET_KEY", "benchmark"),
+        "LIGHTWEIGHT_BOOT": "true" if lightweight else "false",
+    })
+
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        health = _wait_for(f"http://127.0.0.1:{port}/health", server, started)
+        ready = _wait_for(f"http://127.0.0.1:{port}/ready", server, started)
+
+        if _get(f"http://127.0.0.1:{port}/public/pdfs") != 200:
+            raise RuntimeError("first request failed")
+        first_request = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+        if scratch is not None:
+            os.unlink(scratch.name)
+
+    return {"health_s": health, "ready_s": ready, "first_request_s": first_request}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-url", default=None, help="Defaults to a new SQLite file per run")
+    args = parser.parse_args()
+
+    report = {}
+    for lightweight in (False, True):
+        runs = [cold_start(lightweight, args.database_url) for _ in range(args.runs)]
+        report["lightweight" if lightweight else "default"] = {
+            key: {
+                "median_ms": round(statistics.median(run[key] for run in runs) * 1000, 1),
+                "max_ms": round(max(run[key] for run in runs) * 1000, 1),
+            }
+            for key in ("health_s", "ready_s", "first_request_s")
+        }
+    report["runs"] = args.runs
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
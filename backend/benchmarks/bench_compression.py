@@ -0,0 +1,102 @@
+"""Benchmark: bytes on the wire vs CPU for response compression levels.
+
+Builds real response payloads from a generated school (the full
+``/admin/students`` listing, one class's results and one student's
+attendance history) and compresses each with gzip levels 1/6/9 and, when
+the ``brotli`` package is installed, brotli qualities 1/4/11. Reports the
+compressed size, compression time and the estimated transfer time on a
+slow mobile link, so ``GZIP_LEVEL``/``BROTLI_QUALITY`` can be chosen.
+
+Usage:
+    python -m benchmarks.bench_compression [--classes 10] [--students 40] [--link-kbps 512]
+"""
+import argparse
+import gzip
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.core.compression import brotli  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.core.serialization import dumps  # noqa: E402
+from app.models import Student  # noqa: E402
+from app.schemas.student import StudentResponse  # noqa: E402
+from app.services.attendance import get_student_attendance_rows  # noqa: E402
+from app.services.results import get_class_result_rows  # noqa: E402
+from app.services.students import get_all_students  # noqa: E402
+from benchmarks.datagen import SchoolSpec, generate_school  # noqa: E402
+
+REPEAT = 5
+
+
+def build_payloads(spec: SchoolSpec) -> dict:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        generate_school(db, spec)
+        first_student = db.query(Student.id).order_by(Student.id).first().id
+        return {
+            "/admin/students": dumps([
+                StudentResponse.model_validate(student).model_dump(mode="json", by_alias=True)
+                for student in get_all_students(db)
+            ]),
+            "/admin/results/class/{class_}": dumps(get_class_result_rows(db, 1)),
+            "/student/attendance": dumps(get_student_attendance_rows(db, first_student)),
+        }
+    finally:
+        db.close()
+
+
+def codecs() -> dict:
+    available = {
+        f"gzip-{level}": (lambda body, level=level: gzip.compress(body, compresslevel=level, mtime=0))
+        for level in (1, 6, 9)
+    }
+    if brotli is not None:
+        available.update({
+            f"br-{quality}": (lambda body, quality=quality: brotli.compress(body, quality=quality))
+            for quality in (1, 4, 11)
+        })
+    return available
+
+
+def measure(body: bytes, compress) -> dict:
+    samples = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        encoded = compress(body)
+        samples.append(time.perf_counter() - started)
+    return {"bytes": len(encoded), "cpu_ms": round(statistics.median(samples) * 1000, 3)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--students", type=int, default=40, help="Students per class")
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--link-kbps", type=int, default=512, help="Link speed for transfer estimates")
+    args = parser.parse_args()
+
+    spec = SchoolSpec(classes=args.classes, students_per_class=args.students, years=args.years, pdfs=0)
+    payloads = build_payloads(spec)
+    bytes_per_ms = args.link_kbps * 1000 / 8 / 1000
+
+    report = {"link_kbps": args.link_kbps, "brotli_available": brotli is not None, "payloads": {}}
+    for route, body in payloads.items():
+        entry = {"identity": {"bytes": len(body), "cpu_ms": 0.0}}
+        for name, compress in codecs().items():
+            entry[name] = measure(body, compress)
+        for result in entry.values():
+            result["ratio"] = round(len(body) / result["bytes"], 2)
+            result["transfer_ms"] = round(result["bytes"] / bytes_per_ms, 1)
+        report["payloads"][route] = entry
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: bulk fee assignment throughput.
+
+Seeds N students into a scratch SQLite database and raises a term fee for
+the whole school with ``assign_fees_bulk``, then repeats the call to
+confirm it is idempotent. Reports rows per second for the first run.
+
+Usage:
+    python -m benchmarks.bench_fee_bulk [--students 10000]
+"""
+import argparse
+import json
+import os
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine, func, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models import Fees, Student, StudentBalance  # noqa: E402
+from app.services.fees import assign_fees_bulk  # noqa: E402
+
+
+def run(students: int) -> dict:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Student.__table__), [
+            {
+                "student_id": f"STU{i % 10 + 1}{i:05d}",
+                "name": f"Student {i}",
+                "class_": i % 10 + 1,
+                "dob": date(2012, 1, 1),
+                "aadhaar_number": f"{i:012d}",
+                "created_at": datetime(2024, 1, 1),
+            }
+            for i in range(students)
+        ])
+
+    db = Session()
+    try:
+        started = time.perf_counter()
+        first = assign_fees_bulk(db, Decimal("4500.00"), "2025-T1")
+        first_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        second = assign_fees_bulk(db, Decimal("4500.00"), "2025-T1")
+        second_seconds = time.perf_counter() - started
+
+        fee_rows = db.query(func.count(Fees.id)).scalar()
+        total_due_paise = db.query(func.sum(StudentBalance.total_due_paise)).scalar()
+    finally:
+        db.close()
+
+    return {
+        "benchmark": "fee_bulk",
+        "students": students,
+        "first_run": first,
+        "first_run_seconds": round(first_seconds, 4),
+        "rows_per_second": round(first["created"] / first_seconds) if first_seconds else None,
+        "second_run": second,
+        "second_run_seconds": round(second_seconds, 4),
+        "fee_rows": fee_rows,
+        "balances_consistent": total_due_paise == students * 450000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.students), indent=2))
+
+
+if __name__ == "__main__":
+    main()
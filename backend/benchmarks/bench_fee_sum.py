@@ -0,0 +1,105 @@
+"""Benchmark: exact summation of fee amounts.
+
+Inserts N fee rows with random two-decimal rupee amounts into a scratch
+SQLite database and compares the SQL ``SUM`` over the integer paise
+columns with an exact Decimal reference. The same total computed with
+floats is reported to show the drift the paise representation avoids.
+
+Usage:
+    python -m benchmarks.bench_fee_sum [--rows 1000000] [--seed 42]
+"""
+import argparse
+import json
+import os
+import random
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine, func, insert, select  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.core.money import from_paise, to_paise  # noqa: E402
+from app.models import Fees, Student  # noqa: E402
+
+
+def run(rows: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+
+    # Random amounts with paise, e.g. 12345.67 rupees
+    amounts = [rng.randint(1, 5_000_000) for _ in range(rows)]
+    paid = [rng.randint(0, amount) for amount in amounts]
+
+    with engine.begin() as conn:
+        conn.execute(insert(Student.__table__), [{
+            "id": 1,
+            "student_id": "STU1001",
+            "name": "Benchmark Student",
+            "class_": 1,
+            "dob": date(2010, 1, 1),
+            "aadhaar_number": "000000000000",
+            "created_at": datetime(2024, 1, 1),
+        }])
+
+        started = time.perf_counter()
+        batch_size = 50_000
+        for offset in range(0, rows, batch_size):
+            conn.execute(insert(Fees.__table__), [
+                {
+                    "student_id": 1,
+                    "amount": amounts[i],
+                    "paid_amount": paid[i],
+                    "due_amount": amounts[i] - paid[i],
+                    "created_at": datetime(2024, 1, 1),
+                }
+                for i in range(offset, min(offset + batch_size, rows))
+            ])
+        insert_seconds = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        started = time.perf_counter()
+        total_paid_paise, total_due_paise = conn.execute(
+            select(func.sum(Fees.paid_amount_paise), func.sum(Fees.due_amount_paise))
+        ).one()
+        sql_sum_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    decimal_due = sum((Decimal(value) / 100 for value in amounts), Decimal("0")) - sum(
+        (Decimal(value) / 100 for value in paid), Decimal("0")
+    )
+    decimal_seconds = time.perf_counter() - started
+
+    float_due = 0.0
+    for amount, paid_value in zip(amounts, paid):
+        float_due += from_paise(amount) - from_paise(paid_value)
+
+    return {
+        "benchmark": "fee_sum",
+        "rows": rows,
+        "insert_seconds": round(insert_seconds, 3),
+        "sql_sum_seconds": round(sql_sum_seconds, 4),
+        "decimal_reference_seconds": round(decimal_seconds, 4),
+        "total_paid": str(Decimal(total_paid_paise) / 100),
+        "total_due": str(Decimal(total_due_paise) / 100),
+        "exact": to_paise(decimal_due) == total_due_paise,
+        "float_total_due": repr(float_due),
+        "float_drift_rupees": str(Decimal(repr(float_due)) - Decimal(total_due_paise) / 100),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.rows, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
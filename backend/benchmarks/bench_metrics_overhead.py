@@ -0,0 +1,100 @@
+"""Benchmark: per-request overhead of the metrics middleware.
+
+Drives a minimal FastAPI app in-process through the ASGI interface, with
+and without ``MetricsMiddleware``, and reports the mean cost per request.
+Each request executes one SQL statement on an in-memory SQLite engine so
+the query hooks are exercised as well.
+
+Usage:
+    python -m benchmarks.bench_metrics_overhead [--requests 20000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from app.core.metrics import MetricsMiddleware, MetricsRegistry, install_query_hooks  # noqa: E402
+
+
+def build_app(instrumented: bool) -> FastAPI:
+    engine = create_engine("sqlite://")
+    if instrumented:
+        install_query_hooks(engine)
+
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        with engine.connect() as conn:
+            value = conn.execute(text("SELECT :v"), {"v": item_id}).scalar()
+        return {"item_id": value}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware, server_timing=True, registry=MetricsRegistry())
+    return app
+
+
+async def drive(app, requests: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for i in range(requests):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": f"/items/{i}",
+            "raw_path": f"/items/{i}".encode(),
+            "query_string": b"",
+            "headers": [],
+            "client": ("127.0.0.1", 1234),
+            "server": ("testserver", 80),
+            "app": app,
+        }
+        await app(scope, receive, send)
+    return time.perf_counter() - started
+
+
+def run(requests: int) -> dict:
+    results = {}
+    for instrumented in (False, True):
+        app = build_app(instrumented)
+        # Warm up routing, validation and the SQLite connection
+        asyncio.run(drive(app, 200))
+        seconds = asyncio.run(drive(app, requests))
+        results["instrumented" if instrumented else "baseline"] = seconds
+
+    overhead = results["instrumented"] - results["baseline"]
+    return {
+        "benchmark": "metrics_overhead",
+        "requests": requests,
+        "baseline_us_per_request": round(results["baseline"] / requests * 1e6, 2),
+        "instrumented_us_per_request": round(results["instrumented"] / requests * 1e6, 2),
+        "overhead_us_per_request": round(overhead / requests * 1e6, 2),
+        "overhead_percent": round(overhead / results["baseline"] * 100, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.requests), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Benchmark: year-end promotion of a whole school.
+
+Generates a school in a scratch SQLite file and moves classes 1-9 up one
+class three ways, each on a fresh copy of the database:
+
+- ``update_student``: the previous tool, one ``update_student`` (the
+  ``PUT /admin/students/{id}`` service) per student.
+- ``promote_students``: one set-based UPDATE for the whole school.
+- ``promote_students_reissue``: the same, also reissuing student IDs of
+  the new class in one batched UPDATE.
+
+Two students per class are detained in the set-based runs. Reports wall
+time, SQL statements, students per class afterwards and whether every
+student_id is still unique (and, when reissued, matches its class).
+
+Usage:
+    python -m benchmarks.bench_promotion [--students 40]
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.database import Base, install_sqlite_pragmas  # noqa: E402
+from app.core.query_counter import QueryCounter  # noqa: E402
+from app.models import Student  # noqa: E402
+from app.services.students import FINAL_CLASS, promote_students, update_student  # noqa: E402
+from benchmarks.datagen import SchoolSpec, generate_school  # noqa: E402
+
+DETAINED_PER_CLASS = 2
+
+
+def _session_factory(path: Path):
+    engine = create_engine(f"sqlite:///{path}")
+    install_sqlite_pragmas(engine)
+    return engine, sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+def per_student(db, students, detained_ids) -> None:
+    for student_id, class_ in students:
+        if class_ < FINAL_CLASS:
+            update_student(db, student_id, {"class_": class_ + 1})
+
+
+def set_based(db, students, detained_ids) -> None:
+    promote_students(db, detained_ids=detained_ids)
+
+
+def set_based_reissue(db, students, detained_ids) -> None:
+    promote_students(db, detained_ids=detained_ids, reissue_student_ids=True)
+
+
+STRATEGIES = {
+    "update_student": per_student,
+    "promote_students": set_based,
+    "promote_students_reissue": set_based_reissue,
+}
+
+
+def _check(db, reissued: bool, detained_ids) -> dict:
+    rows = db.query(Student.id, Student.student_id, Student.class_).all()
+    student_ids = [row.student_id for row in rows]
+    check = {
+        "class_sizes": dict(sorted(Counter(row.class_ for row in rows).items())),
+        "unique_student_ids": len(set(student_ids)) == len(student_ids),
+    }
+    if reissued:
+        check["ids_match_class"] = all(
+            row.student_id.startswith(f"STU{row.class_}") and len(row.student_id) == len(f"STU{row.class_}") + 3
+            for row in rows
+            if row.id not in detained_ids
+        )
+    return check
+
+
+def run(students: int) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="bench_promotion_"))
+    seeded = workdir / "seeded.db"
+    try:
+        engine, Session = _session_factory(seeded)
+        Base.metadata.create_all(bind=engine)
+        db = Session()
+        try:
+            generate_school(db, SchoolSpec(
+                classes=FINAL_CLASS, students_per_class=students, years=1, pdfs=0, end_date=date.today(),
+            ))
+        finally:
+            db.close()
+            engine.dispose()
+
+        report = {"students_per_class": students, "strategies": {}}
+        for name, strategy in STRATEGIES.items():
+            copy = workdir / f"{name}.db"
+            shutil.copyfile(seeded, copy)
+            engine, Session = _session_factory(copy)
+            db = Session()
+            try:
+                school = db.query(Student.id, Student.class_).order_by(Student.id).all()
+                detained_ids = set()
+                if name != "update_student":
+                    for class_ in range(1, FINAL_CLASS):
+                        detained_ids.update(
+                            [row.id for row in school if row.class_ == class_][:DETAINED_PER_CLASS]
+                        )
+                db.expire_all()
+
+                with QueryCounter(engine) as counter:
+                    started = time.perf_counter()
+                    strategy(db, school, detained_ids)
+                    seconds = time.perf_counter() - started
+
+                report["strategies"][name] = {
+                    "students": len(school),
+                    "seconds": round(seconds, 4),
+                    "statements": counter.count,
+                    **_check(db, name.endswith("reissue"), detained_ids),
+                }
+            finally:
+                db.close()
+                engine.dispose()
+        return report
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=40, help="Students per class")
+    args = parser.parse_args()
+    print(json.dumps(run(args.students), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Benchmark: read-replica routing.
+
+Runs the app against a primary SQLite file and replicas that are copies
+of it taken after seeding (so they "lag" every later write), plus one
+replica that cannot be opened, and counts the statements each database
+serves:
+
+- portal reads are spread round-robin over the reachable replicas, and
+  the unreachable one is skipped after its first failed connection;
+- right after an admin records results, that admin's reads go to the
+  primary and see them (read-your-writes), while another client's read
+  still comes from a replica;
+- once ``REPLICA_STICKY_SECONDS`` have passed the admin reads from the
+  replicas again.
+
+The same checks apply to PostgreSQL replicas: pass their URLs with
+``--primary-url`` and ``--replica-urls`` (the primary must be empty).
+
+Usage:
+    python -m benchmarks.bench_read_replicas [--reads 12] [--students 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import ExitStack
+from datetime import date
+from pathlib import Path
+
+STICKY_SECONDS = 1.0
+SUBJECTS = ("HINDI", "ENGLISH", "MATHS", "SCIENCE", "SOCIAL_STUDIES", "PHYSICAL_EDUCATION", "ART")
+
+
+def _seed(SessionLocal, students: int) -> None:
+    from sqlalchemy import insert
+
+    from app.models import Student
+
+    db = SessionLocal()
+    try:
+        db.execute(insert(Student), [
+            {
+                "student_id": f"STU5{roll:03d}",
+                "name": f"Student {roll}",
+                "class_": 5,
+                "dob": date(2013, 1, 1),
+                "aadhaar_number": f"5{roll:011d}",
+                "father_name": "Parent",
+                "phone": f"98{roll:08d}",
+            }
+            for roll in range(1, students + 1)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _scenario(app, engines, reads: int) -> dict:
+    from app.core.query_counter import QueryCounter
+    from benchmarks.asgi_client import running_app
+
+    async with running_app(app) as client:
+        async def call(method, path, token=None, **kwargs):
+            headers = {"Authorization": f"Bearer {token}"} if token else None
+            with ExitStack() as stack:
+                counters = {name: stack.enter_context(QueryCounter(engine)) for name, engine in engines.items()}
+                response = await client.request(method, path, headers=headers, **kwargs)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{method} {path} returned {response.status_code}: {response.body[:300]!r}")
+            served_by = [name for name, counter in counters.items() if counter.count]
+            return response, served_by
+
+        admin = (await call("POST", "/auth/admin/login", json_body={
+            "username": "admin", "password": "Admin@123",
+        }))[0].json()["access_token"]
+        student = (await call("POST", "/auth/student/login", json_body={
+            "student_id": "STU5001", "dob": "2013-01-01",
+        }))[0].json()["access_token"]
+
+        served = {name: 0 for name in engines}
+        for _ in range(reads):
+            for name in (await call("GET", "/student/results", token=student))[1]:
+                served[name] += 1
+
+        profile = (await call("GET", "/student/me", token=student))[0].json()
+        await call("POST", "/admin/results", token=admin, json_body={
+            "student_id": profile["id"], "student_class": 5, "exam_type": "Final",
+            "marks": {subject: 70 for subject in SUBJECTS},
+        })
+        writer_read, writer_served_by = await call("GET", "/admin/results/student/STU5001", token=admin)
+        other_read, other_served_by = await call("GET", "/student/results", token=student)
+
+        time.sleep(STICKY_SECONDS + 0.1)
+        _, later_served_by = await call("GET", "/admin/results/student/STU5001", token=admin)
+
+    return {
+        "portal_reads": reads,
+        "statements_served_by": served,
+        "after_write": {
+            "writer_served_by": writer_served_by,
+            "writer_sees_results": len(writer_read.json()),
+            "other_client_served_by": other_served_by,
+            "other_client_sees_results": len(other_read.json()),
+            f"writer_served_by_after_{STICKY_SECONDS:g}s": later_served_by,
+        },
+    }
+
+
+def run(reads: int, students: int, primary_url=None, replica_urls=None) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="bench_read_replicas_"))
+    try:
+        copies = []
+        if primary_url is None:
+            primary = workdir / "primary.db"
+            primary_url = f"sqlite:///{primary}"
+            copies = [workdir / "replica1.db", workdir / "replica2.db"]
+            replica_urls = [f"sqlite:///{copy}" for copy in copies]
+            # A replica that cannot be reached: its directory does not exist
+            replica_urls.append(f"sqlite:///{workdir / 'missing' / 'replica3.db'}")
+
+        os.environ["DATABASE_URL"] = primary_url
+        os.environ["DATABASE_REPLICA_URLS"] = ",".join(replica_urls)
+        os.environ["REPLICA_STICKY_SECONDS"] = str(STICKY_SECONDS)
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+
+        from app.core.database import SessionLocal, engine
+        from app.core.replicas import replica_engines
+        from app.main import app
+        from benchmarks.asgi_client import running_app
+
+        async def seed():
+            async with running_app(app):
+                _seed(SessionLocal, students)
+
+        asyncio.run(seed())
+        engine.dispose()
+        for copy in copies:
+            shutil.copyfile(primary, copy)
+
+        engines = {"primary": engine}
+        engines.update({f"replica{n}": replica for n, replica in enumerate(replica_engines, start=1)})
+        report = asyncio.run(_scenario(app, engines, reads))
+        for replica in replica_engines:
+            replica.dispose()
+        return report
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reads", type=int, default=12, help="Portal reads to spread over replicas")
+    parser.add_argument("--students", type=int, default=20)
+    parser.add_argument("--primary-url", default=None)
+    parser.add_argument("--replica-urls", default=None, help="Comma-separated replica URLs")
+    args = parser.parse_args()
+    replica_urls = args.replica_urls.split(",") if args.replica_urls else None
+    print(json.dumps(run(args.reads, args.students, args.primary_url, replica_urls), indent=2))
+
+
+if __name__ == "__main__":
+    main()
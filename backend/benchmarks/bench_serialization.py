@@ -0,0 +1,141 @@
+"""Benchmark: list response serialization, ORM + Pydantic vs column rows.
+
+Times three ways of turning N result rows into a JSON response body:
+
+- ``orm_pydantic``: load ORM objects, ``ResultResponse.from_orm`` per row,
+  then FastAPI's second validation against ``list[ResultResponse]`` and
+  JSON encoding (the previous route behaviour).
+- ``rows_type_adapter``: labelled column tuples as dicts, validated once
+  through a cached ``TypeAdapter`` and dumped by Pydantic.
+- ``rows_orjson``: labelled column tuples as dicts encoded directly.
+
+Query time is included in every path. Rows live in an in-memory SQLite
+database so the numbers isolate Python-side cost.
+
+Usage:
+    python -m benchmarks.bench_serialization [--rows 1000 --rows 100000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import warnings
+from datetime import date
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.core.serialization import rows_response  # noqa: E402
+from app.enums.subject_enum import SubjectEnum  # noqa: E402
+from app.models import Result, Student  # noqa: E402
+from app.schemas.result import ResultResponse  # noqa: E402
+from app.services.results import get_class_result_rows, get_class_results  # noqa: E402
+
+
+def build_session(rows: int):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+
+    subjects = list(SubjectEnum)
+    students = max(1, rows // len(subjects))
+    db.execute(insert(Student), [
+        {
+            "student_id": f"STU1{i:06d}",
+            "name": f"Student {i}",
+            "class_": 1,
+            "dob": date(2015, 1, 1),
+            "aadhaar_number": f"{i:012d}",
+        }
+        for i in range(1, students + 1)
+    ])
+    db.execute(insert(Result), [
+        {
+            "student_id": 1 + i // len(subjects),
+            "class_": 1,
+            "subject": subjects[i % len(subjects)],
+            "marks": float(i % 100),
+            "exam_type": "Final",
+        }
+        for i in range(rows)
+    ])
+    db.commit()
+    return db
+
+
+async def orm_pydantic(db, field) -> bytes:
+    warnings.filterwarnings("ignore", message=".*from_orm.*")
+    objects = [ResultResponse.from_orm(r) for r in get_class_results(db, 1)]
+    content = await serialize_response(field=field, response_content=objects)
+    db.expunge_all()
+    return JSONResponse(content).body
+
+
+async def rows_type_adapter(db, field) -> bytes:
+    return rows_response(get_class_result_rows(db, 1), schema=ResultResponse).body
+
+
+async def rows_orjson(db, field) -> bytes:
+    return rows_response(get_class_result_rows(db, 1)).body
+
+
+PATHS = {
+    "orm_pydantic": orm_pydantic,
+    "rows_type_adapter": rows_type_adapter,
+    "rows_orjson": rows_orjson,
+}
+
+
+async def measure(rows: int, repeat: int) -> dict:
+    db = build_session(rows)
+    field = create_response_field(name="response", type_=list[ResultResponse])
+    report = {}
+    bodies = {}
+    for name, path in PATHS.items():
+        bodies[name] = await path(db, field)  # warm caches
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await path(db, field)
+            samples.append(time.perf_counter() - started)
+        report[name] = {
+            "median_ms": round(statistics.median(samples) * 1000, 2),
+            "min_ms": round(min(samples) * 1000, 2),
+        }
+    db.close()
+
+    decoded = {name: json.loads(body) for name, body in bodies.items()}
+    if any(value != decoded["orm_pydantic"] for value in decoded.values()):
+        raise AssertionError("serialization paths produced different JSON")
+
+    baseline = report["orm_pydantic"]["median_ms"]
+    for name in PATHS:
+        report[name]["speedup"] = round(baseline / report[name]["median_ms"], 2)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, action="append", help="Row counts (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {}
+    for rows in args.rows or [1000, 100000]:
+        results[str(rows)] = asyncio.run(measure(rows, args.repeat))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""Benchmark: embedded SQLite under concurrent portal users.
+
+Seeds a school in a SQLite file, then for the stock SQLite settings
+(``SQLITE_TUNING=false``: rollback journal, full sync, default cache)
+and the tuned profile, each on a fresh copy:
+
+- starts uvicorn (one worker, pinned to one core where supported);
+- runs ``--users`` concurrent student portal users, each requesting a
+  random portal page and pausing ``--think`` seconds, for ``--seconds``;
+- meanwhile ten teachers mark their class's attendance through the API
+  every few seconds, and a separate process (standing in for the job
+  worker) writes bulk attendance in a loop, so the database file has
+  writers in two processes while it serves readers;
+- then, in one process, runs readers and writers as coroutines on one
+  event loop (calling the services directly, as the ``async def`` routes
+  do) while a thread (standing in for the threadpool) writes too, and
+  times how long the loop stalls.
+
+Reports portal throughput and latency percentiles, failed requests, the
+writer's commits, lock errors and slowest write, and for the shared
+loop its read latencies, longest stall and write counts.
+
+Usage:
+    python -m benchmarks.bench_sqlite_profile [--users 300] [--seconds 20] [--think 1.0]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+PORTAL_PATHS = ("/student/me", "/student/attendance", "/student/results", "/student/fees", "/student/pdfs")
+PROFILES = {"stock": "false", "tuned": "true"}
+CLASSES = 10
+TEACHER_INTERVAL_SECONDS = 3.0
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _pin_to_one_core() -> None:
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})
+
+
+def _seed(path: Path, students: int) -> list:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.database import Base, install_sqlite_pragmas
+    from app.models import Student
+    from benchmarks.datagen import SchoolSpec, generate_school
+
+    engine = create_engine(f"sqlite:///{path}")
+    # Leave the file in SQLite's default journal mode for the stock run
+    install_sqlite_pragmas(engine, tuned=False)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        generate_school(db, SchoolSpec(
+            classes=CLASSES, students_per_class=students, years=1, pdfs=50, end_date=date.today(),
+        ))
+        return [(row.id, row.student_id, row.class_) for row in db.query(Student.id, Student.student_id, Student.class_)]
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def _tokens(students: list) -> dict:
+    from app.core.security import create_access_token
+
+    return {
+        "students": [
+            create_access_token({"sub": str(pk), "student_id": student_id, "role": "student"})
+            for pk, student_id, _ in students
+        ],
+        "admin": create_access_token({"sub": "1", "username": "admin", "role": "admin"}),
+    }
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+async def _load(base_url: str, students: list, tokens: dict, users: int, seconds: float, think: float) -> dict:
+    import httpx
+
+    latencies = []
+    failures = {"portal": 0, "attendance": 0}
+    marked = []
+    deadline = time.perf_counter() + seconds
+    by_class = {}
+    for pk, _, class_ in students:
+        by_class.setdefault(class_, []).append(pk)
+
+    async def user(client, token):
+        headers = {"Authorization": f"Bearer {token}"}
+        await asyncio.sleep(random.random() * think)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await client.get(random.choice(PORTAL_PATHS), headers=headers)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                failures["portal"] += 1
+            await asyncio.sleep(think)
+
+    async def teacher(client, class_):
+        headers = {"Authorization": f"Bearer {tokens['admin']}"}
+        await asyncio.sleep(random.random() * TEACHER_INTERVAL_SECONDS)
+        while time.perf_counter() < deadline:
+            day = date.today() - timedelta(days=random.randint(0, 60))
+            try:
+                response = await client.post("/admin/attendance/mark", headers=headers, json={
+                    "class": class_,
+                    "date": day.isoformat(),
+                    "attendances": [
+                        {"student_id": pk, "status": random.choice(("PRESENT", "ABSENT"))}
+                        for pk in by_class[class_]
+                    ],
+                })
+                ok = response.status_code == 201
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                marked.append(class_)
+            else:
+                failures["attendance"] += 1
+            await asyncio.sleep(TEACHER_INTERVAL_SECONDS)
+
+    limits = httpx.Limits(max_connections=users + CLASSES)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(user(client, tokens["students"][n % len(tokens["students"])]) for n in range(users)),
+            *(teacher(client, class_) for class_ in by_class),
+        )
+        elapsed = time.perf_counter() - started
+
+    return {
+        "portal_requests": len(latencies),
+        "portal_rps": round(len(latencies) / elapsed, 1),
+        "portal_p50_ms": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        "portal_p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+        "portal_p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+        "failed_portal_requests": failures["portal"],
+        "attendance_marks": len(marked),
+        "failed_attendance_marks": failures["attendance"],
+    }
+
+
+def _wait_ready(base_url: str, server: subprocess.Popen) -> None:
+    import httpx
+
+    deadline = time.perf_counter() + 60
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/ready").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError("server did not become ready")
+
+
+def writer(seconds: float) -> None:
+    """Bulk attendance writes in a loop, like a job worker process."""
+    from sqlalchemy.exc import OperationalError
+
+    from app.core.database import SessionLocal
+    from app.models import Student
+    from app.services.attendance import mark_attendance_bulk
+
+    db = SessionLocal()
+    by_class = {}
+    for pk, class_ in db.query(Student.id, Student.class_):
+        by_class.setdefault(class_, []).append(pk)
+
+    commits = lock_errors = 0
+    slowest = 0.0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        class_ = random.choice(list(by_class))
+        day = date.today() - timedelta(days=random.randint(61, 300))
+        started = time.perf_counter()
+        try:
+            mark_attendance_bulk(db, class_, day, [
+                {"student_id": pk, "status": random.choice(("PRESENT", "ABSENT"))} for pk in by_class[class_]
+            ])
+            commits += 1
+        except OperationalError:
+            db.rollback()
+            lock_errors += 1
+        slowest = max(slowest, time.perf_counter() - started)
+        time.sleep(0.05)
+    db.close()
+    print(json.dumps({
+        "writer_commits": commits,
+        "writer_lock_errors": lock_errors,
+        "writer_slowest_ms": round(slowest * 1000, 1),
+    }))
+
+
+def loop_mix(seconds: float, readers: int = 20) -> None:
+    """Readers and writers on one event loop, with a writer thread alongside."""
+    import threading
+
+    from sqlalchemy.exc import OperationalError
+
+    from app.core.database import SessionLocal
+    from app.models import Student
+    from app.services.attendance import get_student_attendance_rows_by_identifier, mark_attendance_bulk
+
+    db = SessionLocal()
+    by_class = {}
+    student_ids = []
+    for pk, student_id, class_ in db.query(Student.id, Student.student_id, Student.class_):
+        by_class.setdefault(class_, []).append(pk)
+        student_ids.append(student_id)
+    db.close()
+
+    counts = {"loop_writes": 0, "loop_write_errors": 0, "thread_writes": 0, "thread_write_errors": 0}
+    latencies = []
+    stalls = []
+    deadline = time.perf_counter() + seconds
+
+    def write(prefix: str, days: tuple) -> None:
+        class_ = random.choice(list(by_class))
+        day = date.today() - timedelta(days=random.randint(*days))
+        db = SessionLocal()
+        try:
+            mark_attendance_bulk(db, class_, day, [
+                {"student_id": pk, "status": random.choice(("PRESENT", "ABSENT"))} for pk in by_class[class_]
+            ])
+            counts[f"{prefix}_writes"] += 1
+        except OperationalError:
+            db.rollback()
+            counts[f"{prefix}_write_errors"] += 1
+        finally:
+            db.close()
+
+    def thread_writer() -> None:
+        while time.perf_counter() < deadline:
+            write("thread", (61, 300))
+            time.sleep(0.01)
+
+    async def heartbeat():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stalls.append(time.perf_counter() - started - 0.005)
+
+    async def reader():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            db = SessionLocal()
+            try:
+                get_student_attendance_rows_by_identifier(db, random.choice(student_ids))
+            finally:
+                db.close()
+            latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0.01)
+
+    async def loop_writer():
+        await asyncio.sleep(random.random() * 0.2)
+        while time.perf_counter() < deadline:
+            write("loop", (0, 60))
+            await asyncio.sleep(0.2)
+
+    async def main():
+        await asyncio.gather(heartbeat(), *(reader() for _ in range(readers)),
+                             *(loop_writer() for _ in range(CLASSES)))
+
+    background = threading.Thread(target=thread_writer)
+    background.start()
+    asyncio.run(main())
+    background.join()
+    print(json.dumps({
+        "loop_read_p50_ms": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        "loop_read_p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+        "loop_p99_stall_ms": round(_percentile(stalls, 0.99) * 1000, 1),
+        "loop_max_stall_ms": round(max(stalls, default=0.0) * 1000, 1),
+        **counts,
+    }))
+
+
+def run(users: int, seconds: float, think: float, students: int) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="bench_sqlite_profile_"))
+    try:
+        seeded = workdir / "seeded.db"
+        school = _seed(seeded, students)
+        tokens = _tokens(school)
+
+        report = {"users": users, "seconds": seconds, "think_seconds": think, "students": len(school), "profiles": {}}
+        for profile, tuning in PROFILES.items():
+            copy = workdir / f"{profile}.db"
+            shutil.copyfile(seeded, copy)
+            env = dict(os.environ)
+            env.update({
+                "DATABASE_URL": f"sqlite:///{copy}",
+                "SQLITE_TUNING": tuning,
+                "METRICS_ENABLED": "false",
+            })
+            port = _free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            server = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app",
+                 "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+                 "--backlog", str(users * 2)],
+                env=env, preexec_fn=_pin_to_one_core,
+            )
+            try:
+                _wait_ready(base_url, server)
+                background = subprocess.Popen(
+                    [sys.executable, "-m", "benchmarks.bench_sqlite_profile", "--writer", "--seconds", str(seconds)],
+                    env=env, stdout=subprocess.PIPE, text=True,
+                )
+                result = asyncio.run(_load(base_url, school, tokens, users, seconds, think))
+                output, _ = background.communicate()
+                result.update(json.loads(output.strip().splitlines()[-1]))
+                mixed = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_sqlite_profile", "--loop-mix", "--seconds", str(seconds)],
+                    env=env, stdout=subprocess.PIPE, text=True, check=True,
+                )
+                result.update(json.loads(mixed.stdout.strip().splitlines()[-1]))
+            finally:
+                server.terminate()
+                try:
+                    server.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    # A server whose event loop is stuck never handles SIGTERM
+                    server.kill()
+                    server.wait()
+            report["profiles"][profile] = result
+        return report
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=300, help="Concurrent portal users")
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--think", type=float, default=1.0, help="Pause between a user's requests")
+    parser.add_argument("--students", type=int, default=40, help="Students per class")
+    parser.add_argument("--writer", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--loop-mix", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.writer:
+        writer(args.seconds)
+        return
+    if args.loop_mix:
+        loop_mix(args.seconds)
+        return
+    print(json.dumps(run(args.users, args.seconds, args.think, args.students), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Benchmark: deleting students with five years of history.
+
+Generates a school with ``--years`` of attendance, fees, results and
+ledger entries in a scratch SQLite file, then removes one class of
+students three ways, each on a fresh copy of the database:
+
+- ``orm_cascade``: the previous behaviour. Each student's collections
+  are loaded into the session and the ORM deletes the rows.
+- ``delete_student``: ``delete_student`` per student, one DELETE each,
+  with history removed by ON DELETE CASCADE.
+- ``withdraw_students``: the whole class in one set-based DELETE.
+
+Reports wall time, SQL statements and history rows removed.
+
+Usage:
+    python -m benchmarks.bench_student_delete [--years 5] [--students 40]
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine, func  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.database import Base, install_sqlite_pragmas  # noqa: E402
+from app.core.query_counter import QueryCounter  # noqa: E402
+from app.models import Attendance, FeePayment, Fees, Result, Student  # noqa: E402
+from app.services.students import delete_student, withdraw_students  # noqa: E402
+from benchmarks.datagen import SchoolSpec, generate_school  # noqa: E402
+
+TARGET_CLASS = 10
+HISTORY_MODELS = (Attendance, Fees, Result, FeePayment)
+
+
+def _session_factory(path: Path):
+    engine = create_engine(f"sqlite:///{path}")
+    install_sqlite_pragmas(engine)
+    return engine, sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+def _history_rows(db) -> int:
+    return sum(db.query(func.count(model.id)).scalar() for model in HISTORY_MODELS)
+
+
+def orm_cascade(db, student_ids) -> None:
+    for student_id in student_ids:
+        student = db.get(Student, student_id)
+        for collection in (student.attendances, student.fees, student.results, student.fee_payments):
+            for row in list(collection):
+                db.delete(row)
+        if student.balance is not None:
+            db.delete(student.balance)
+        db.delete(student)
+        db.commit()
+
+
+def per_student(db, student_ids) -> None:
+    for student_id in student_ids:
+        delete_student(db, student_id)
+
+
+def set_based(db, student_ids) -> None:
+    withdraw_students(db, class_=TARGET_CLASS)
+
+
+STRATEGIES = {
+    "orm_cascade": orm_cascade,
+    "delete_student": per_student,
+    "withdraw_students": set_based,
+}
+
+
+def run(years: int, students: int) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="bench_delete_"))
+    seeded = workdir / "seeded.db"
+    try:
+        engine, Session = _session_factory(seeded)
+        Base.metadata.create_all(bind=engine)
+        db = Session()
+        try:
+            counts = generate_school(db, SchoolSpec(
+                classes=TARGET_CLASS, students_per_class=students, years=years, pdfs=0,
+            ))
+        finally:
+            db.close()
+            engine.dispose()
+
+        report = {"years": years, "students_per_class": students, "seeded_rows": counts, "strategies": {}}
+        for name, strategy in STRATEGIES.items():
+            copy = workdir / f"{name}.db"
+            shutil.copyfile(seeded, copy)
+            engine, Session = _session_factory(copy)
+            db = Session()
+            try:
+                student_ids = [
+                    row.id for row in db.query(Student.id).filter(Student.class_ == TARGET_CLASS)
+                ]
+                history_before = _history_rows(db)
+                db.expire_all()
+
+                with QueryCounter(engine) as counter:
+                    started = time.perf_counter()
+                    strategy(db, student_ids)
+                    seconds = time.perf_counter() - started
+
+                report["strategies"][name] = {
+                    "students": len(student_ids),
+                    "seconds": round(seconds, 4),
+                    "statements": counter.count,
+                    "history_rows_removed": history_before - _history_rows(db),
+                    "students_left_in_class": db.query(func.count(Student.id)).filter(
+                        Student.class_ == TARGET_CLASS
+                    ).scalar(),
+                }
+            finally:
+                db.close()
+                engine.dispose()
+        return report
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--students", type=int, default=40, help="Students per class")
+    args = parser.parse_args()
+    print(json.dumps(run(args.years, args.students), indent=2))
+
+
+if __name__ == "__main__":
+    main()
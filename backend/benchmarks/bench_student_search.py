@@ -0,0 +1,135 @@
+"""Benchmark: admin student search over a large school.
+
+Seeds ``--students`` students (names from the data generator, so common
+names match thousands of rows) in a scratch SQLite file and runs a mix of
+search-box queries (name prefixes, a full name, a misspelt surname, a
+student_id prefix and a phone fragment):
+
+- ``trigram_index``: ``search_students`` with the in-memory trigram
+  index (SQLite, or PostgreSQL without pg_trgm), after it is built;
+- ``like_scan``: the LIKE scan used without a cache backend.
+
+Reports the index build time and size, latency percentiles per
+strategy, and each query's top match.
+
+Usage:
+    python -m benchmarks.bench_student_search [--students 50000] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.database import Base, install_sqlite_pragmas  # noqa: E402
+from app.models import Student  # noqa: E402
+from app.services import student_search  # noqa: E402
+from benchmarks.datagen import FIRST_NAMES, LAST_NAMES  # noqa: E402
+
+QUERIES = ("aa", "kum", "arjun", "riya sharma", "kumaar", "STU5012", "43210", "3210", "pari kh")
+CLASSES = 10
+
+
+def _seed(db, students: int) -> None:
+    rng = random.Random(42)
+    per_class = students // CLASSES
+    rows = [
+        {
+            "student_id": f"STU{class_}{roll:04d}",
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "class_": class_,
+            "dob": date(2012, 1 + roll % 12, 1 + roll % 28),
+            "aadhaar_number": f"{class_:02d}{roll:010d}",
+            "father_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "phone": f"9{rng.randrange(10 ** 9):09d}",
+        }
+        for class_ in range(1, CLASSES + 1)
+        for roll in range(1, per_class + 1)
+    ]
+    for start in range(0, len(rows), 5000):
+        db.execute(insert(Student), rows[start:start + 5000])
+    db.commit()
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _time_queries(search, repeat: int) -> dict:
+    latencies = []
+    top = {}
+    for _ in range(repeat):
+        for query in QUERIES:
+            started = time.perf_counter()
+            matches = search(query)
+            latencies.append(time.perf_counter() - started)
+            top[query] = f"{matches[0]['name']} ({matches[0]['student_id']}, {matches[0]['score']})" if matches else None
+    return {
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+        "top_match": top,
+    }
+
+
+def run(students: int, repeat: int, limit: int) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="bench_student_search_"))
+    engine = create_engine(f"sqlite:///{workdir / 'school.db'}")
+    install_sqlite_pragmas(engine)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        _seed(db, students)
+        report = {"students": db.query(Student).count(), "limit": limit, "queries": list(QUERIES)}
+
+        started = time.perf_counter()
+        student_search.invalidate_student_search()
+        student_search.search_students(db, "warm", limit)
+        build_seconds = time.perf_counter() - started
+
+        rows = student_search._load_rows(db)
+        tracemalloc.start()
+        index = student_search.StudentSearchIndex(rows, 0)
+        index_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del index
+        report["index_build_ms"] = round(build_seconds * 1000, 1)
+        report["index_mib"] = round(index_bytes / 2 ** 20, 1)
+
+        report["trigram_index"] = _time_queries(
+            lambda query: student_search.search_students(db, query, limit), repeat
+        )
+        report["like_scan"] = _time_queries(
+            lambda query: student_search._search_like(db, query, limit), max(1, repeat // 4)
+        )
+        return report
+    finally:
+        db.close()
+        engine.dispose()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the query mix")
+    parser.add_argument("--limit", type=int, default=20, help="Matches returned per query")
+    args = parser.parse_args()
+    print(json.dumps(run(args.students, args.repeat, args.limit), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Deterministic synthetic school data generator.
+
+Builds a school of ``classes`` x ``students_per_class`` students with
+``years`` of history ending at ``end_date``: daily attendance on school
+days, three fee terms per year with partial payments, four exams per year
+across all current subjects, and a library of PDF notices. Rows are
+written through the application models in batches, and the fee ledger
+and balances are derived with the fees service so every invariant the
+app maintains also holds for generated data.
+
+The same arguments always produce the same rows.
+"""
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.enums.attendance_enum import AttendanceStatus
+from app.enums.pdf_enum import PdfCategory
+from app.enums.subject_enum import SubjectEnum
+from app.models import PDF, Attendance, Fees, Result, Student
+from app.services.academic_sessions import ensure_academic_sessions
+from app.services.fees import backfill_fee_ledger
+
+BATCH_SIZE = 5000
+
+CURRENT_SUBJECTS = [
+    SubjectEnum.HINDI,
+    SubjectEnum.ENGLISH,
+    SubjectEnum.MATHS,
+    SubjectEnum.SCIENCE,
+    SubjectEnum.SOCIAL_STUDIES,
+    SubjectEnum.PHYSICAL_EDUCATION,
+    SubjectEnum.ART,
+]
+EXAM_TYPES = ["Unit Test 1", "Midterm", "Unit Test 2", "Final"]
+FIRST_NAMES = [
+    "Aarav", "Vivaan", "Aditya", "Arjun", "Sai", "Reyansh", "Krishna", "Ishaan",
+    "Ananya", "Diya", "Saanvi", "Aadhya", "Pari", "Myra", "Kiara", "Riya",
+]
+LAST_NAMES = [
+    "Sharma", "Verma", "Gupta", "Singh", "Kumar", "Yadav", "Patel", "Mishra",
+    "Ali", "Khan", "Reddy", "Das", "Joshi", "Chauhan", "Pandey", "Tiwari",
+]
+
+
+@dataclass
+class SchoolSpec:
+    """Shape of the generated data set."""
+    classes: int = 10
+    students_per_class: int = 40
+    years: int = 1
+    pdfs: int = 200
+    end_date: date = date(2025, 3, 31)
+    seed: int = 42
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "classes": self.classes,
+            "students_per_class": self.students_per_class,
+            "years": self.years,
+            "pdfs": self.pdfs,
+            "end_date": self.end_date.isoformat(),
+            "seed": self.seed,
+        }
+
+
+def school_days(start: date, end: date) -> Iterator[date]:
+    """Monday to Saturday between two dates (inclusive)."""
+    day = start
+    while day <= end:
+        if day.weekday() < 6:
+            yield day
+        day += timedelta(days=1)
+
+
+def _insert_batches(db: Session, model, rows: Iterator[dict]) -> int:
+    written = 0
+    batch: List[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            db.execute(insert(model), batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(model), batch)
+        written += len(batch)
+    return written
+
+
+def generate_school(db: Session, spec: SchoolSpec) -> Dict[str, int]:
+    """
+    Populate an empty database with a synthetic school.
+    
+    Args:
+        db: Database session bound to an empty schema
+        spec: Size and seed of the data set
+        
+    Returns:
+        Dict with the number of rows written per table
+    """
+    if db.query(func.count(Student.id)).scalar():
+        raise ValueError("generate_school expects an empty database")
+
+    rng = random.Random(spec.seed)
+    start_date = spec.end_date.replace(year=spec.end_date.year - spec.years) + timedelta(days=1)
+    counts: Dict[str, int] = {}
+
+    counts["students"] = _insert_batches(db, Student, (
+        {
+            "student_id": f"STU{class_}{roll:03d}",
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "class_": class_,
+            "dob": date(spec.end_date.year - 5 - class_, 1 + roll % 12, 1 + roll % 28),
+            "aadhaar_number": f"{class_:02d}{roll:010d}",
+            "father_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "mother_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "phone": f"9{rng.randrange(10 ** 9):09d}",
+            "address": f"House {roll}, Ward {class_}",
+            "created_at": datetime.combine(start_date, datetime.min.time()),
+        }
+        for class_ in range(1, spec.classes + 1)
+        for roll in range(1, spec.students_per_class + 1)
+    ))
+    db.flush()
+
+    students = db.query(Student.id, Student.class_).order_by(Student.id).all()
+
+    def class_in_year(current_class: int, years_ago: int) -> int:
+        return max(1, current_class - years_ago)
+
+    days = list(school_days(start_date, spec.end_date))
+    statuses = [AttendanceStatus.PRESENT] * 9 + [AttendanceStatus.ABSENT]
+
+    counts["attendances"] = _insert_batches(db, Attendance, (
+        {
+            "student_id": student_id,
+            "class_": class_in_year(current_class, (spec.end_date - day).days // 365),
+            "date": day,
+            "status": rng.choice(statuses),
+        }
+        for day in days
+        for student_id, current_class in students
+    ))
+
+    fee_rows = []
+    exam_rows = []
+    for years_ago in range(spec.years - 1, -1, -1):
+        session_year = spec.end_date.year - 1 - years_ago
+        for student_id, current_class in students:
+            class_ = class_in_year(current_class, years_ago)
+            for term in range(1, 4):
+                amount_paise = (3000 + 250 * class_) * 100
+                paid_paise = rng.choice([amount_paise, amount_paise, amount_paise // 2, 0])
+                issued = datetime(session_year, 4 * term, 1)
+                fee_rows.append({
+                    "student_id": student_id,
+                    "amount_paise": amount_paise,
+                    "paid_amount_paise": paid_paise,
+                    "due_amount_paise": amount_paise - paid_paise,
+                    "payment_date": issued + timedelta(days=10) if paid_paise else None,
+                    "term_key": f"{session_year}-T{term}",
+                    "created_at": issued,
+                })
+            for exam_type in EXAM_TYPES:
+                for subject in CURRENT_SUBJECTS:
+                    exam_rows.append({
+                        "student_id": student_id,
+                        "class_": class_,
+                        "subject": subject,
+                        "marks": float(rng.randint(35, 100)),
+                        "exam_type": f"{exam_type} {session_year}",
+                    })
+
+    counts["fees"] = _insert_batches(db, Fees, iter(fee_rows))
+    counts["results"] = _insert_batches(db, Result, iter(exam_rows))
+
+    categories = list(PdfCategory)
+    counts["pdfs"] = _insert_batches(db, PDF, (
+        {
+            "title": f"{category.value.title()} #{index}",
+            "category": category,
+            "file_path": f"uploads/{category.value.lower()}/generated-{index}.pdf",
+            "upload_date": datetime.combine(start_date, datetime.min.time()) + timedelta(
+                days=index * max(1, (spec.end_date - start_date).days) // max(1, spec.pdfs)
+            ),
+            "is_public": index % 5 != 0,
+        }
+        for index, category in ((i, categories[i % len(categories)]) for i in range(spec.pdfs))
+    ))
+
+    db.commit()
+
+    # Ledger and balances exactly as the app derives them
+    backfill_fee_ledger(db)
+    # Academic sessions, as startup assigns them to legacy rows
+    ensure_academic_sessions(db, today=spec.end_date)
+    return counts
@@ -0,0 +1,74 @@
+"""Profile the import cost of the application.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter
+and reports the slowest modules by cumulative import time, so the effect
+of ``LIGHTWEIGHT_BOOT`` and of deferred imports can be checked.
+
+Usage:
+    python -m benchmarks.importtime [--top 25] [--lightweight]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+
+def profile_imports(lightweight: bool) -> List[Dict[str, object]]:
+    """
+    Import ``app.main`` in a subprocess with ``-X importtime``.
+
+    Args:
+        lightweight: Set LIGHTWEIGHT_BOOT for the child process
+
+    Returns:
+        One dict per imported module with self and cumulative microseconds
+    """
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SECRET_KEY", "benchmark")
+    env["LIGHTWEIGHT_BOOT"] = "true" if lightweight else "false"
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, env=env, check=True,
+    )
+
+    modules = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    return modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--lightweight", action="store_true", help="Profile with LIGHTWEIGHT_BOOT")
+    args = parser.parse_args()
+
+    modules = profile_imports(args.lightweight)
+    total = next(m for m in modules if m["module"] == "app.main")["cumulative_us"]
+    slowest = sorted(modules, key=lambda m: m["cumulative_us"], reverse=True)[:args.top]
+
+    print(json.dumps({
+        "lightweight_boot": args.lightweight,
+        "app_main_ms": round(total / 1000, 1),
+        "modules": len(modules),
+        "slowest": [
+            {"module": m["module"], "cumulative_ms": round(m["cumulative_us"] / 1000, 1)}
+            for m in slowest
+        ],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
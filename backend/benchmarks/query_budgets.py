@@ -0,0 +1,449 @@
+"""Per-endpoint SQL query budgets.
+
+Seeds a scratch database, calls every API route once through the ASGI
+app and counts the SQL statements each request issues. The run fails
+(exit status 1) when a route exceeds its budget, repeats a statement
+shape often enough to look like an N+1 loop, or has no budget at all.
+
+Budgets are upper bounds for the seeded data set: a class of
+``CLASS_SIZE`` students with attendance, fees and results. A route whose
+statement count grows with the class size cannot stay within budget.
+
+Usage:
+    python -m benchmarks.query_budgets [--database-url sqlite:///budget.db] [--json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+CLASS_SIZE = 60
+N_PLUS_ONE_THRESHOLD = 5
+
+# (method, route template) -> maximum statements per request
+BUDGETS: Dict[Tuple[str, str], int] = {
+    # Auth
+    ("POST", "/auth/admin/login"): 1,
+    ("POST", "/auth/student/login"): 1,
+    # Students
+    ("GET", "/admin/students"): 1,
+    ("POST", "/admin/students"): 4,
+    ("GET", "/admin/students/{student_id}"): 1,
+    ("GET", "/admin/students/class/{class_}"): 1,
+    # Index rebuild after a change (none when current), or one pg_trgm
+    # query after a once-per-process extension check on PostgreSQL
+    ("GET", "/admin/students/search"): 2,
+    # Previous class is read first on SQLite; one UPDATE ... RETURNING on PostgreSQL
+    ("PUT", "/admin/students/{student_id}"): 2,
+    # History rows go through ON DELETE CASCADE
+    ("DELETE", "/admin/students/{student_id}"): 1,
+    ("POST", "/admin/students/withdraw"): 1,
+    # Lock and read students, promote, reissue IDs (one executemany)
+    ("POST", "/admin/students/promote"): 3,
+    # Attendance
+    # Calendar lookup for the date, then roster and marks
+    ("GET", "/admin/attendance/students/{class_}/{date}"): 2,
+    # Two more (month bitmap lookup and write) with ATTENDANCE_BITMAP_ENABLED
+    ("POST", "/admin/attendance/mark"): 5,
+    ("GET", "/admin/attendance/student/{student_identifier}"): 1,
+    # Student, totals over working days, calendar dates
+    ("GET", "/admin/attendance/summary/{student_identifier}"): 4,
+    # Student, month masks, calendar; class masks, calendar, names
+    ("GET", "/admin/attendance/monthly/{student_identifier}"): 4,
+    ("GET", "/admin/attendance/monthly/class/{class_}/{year}/{month}"): 3,
+    # School calendar
+    ("GET", "/admin/calendar"): 1,
+    ("POST", "/admin/calendar"): 2,
+    ("GET", "/admin/calendar/working-days"): 1,
+    ("DELETE", "/admin/calendar/{day_id}"): 1,
+    # Academic sessions
+    ("GET", "/admin/sessions"): 1,
+    # Lookup, insert inside a savepoint (three statements), reload
+    ("POST", "/admin/sessions"): 5,
+    # Session, one DELETE per history table, mark archived
+    ("POST", "/admin/sessions/{session_id}/archive"): 5,
+    # Dry run over one past session: sessions, one COUNT per archived table
+    ("POST", "/admin/sessions/cold-archive"): 4,
+    # Fees
+    ("POST", "/admin/fees"): 5,
+    ("POST", "/admin/fees/bulk"): 4,
+    ("GET", "/admin/fees/student/{student_identifier}"): 1,
+    ("GET", "/admin/fees/balance/{student_id}"): 1,
+    ("GET", "/admin/fees/defaulters"): 1,
+    ("GET", "/admin/fees/payments/{student_id}"): 1,
+    ("GET", "/admin/fees/{fee_id}"): 1,
+    ("PUT", "/admin/fees/{fee_id}"): 4,
+    ("DELETE", "/admin/fees/{fee_id}"): 3,
+    # Dashboard
+    ("GET", "/admin/dashboard/summary"): 7,
+    # Background jobs
+    ("POST", "/admin/jobs"): 2,
+    ("GET", "/admin/jobs"): 1,
+    ("GET", "/admin/jobs/types"): 0,
+    ("GET", "/admin/jobs/{job_id}"): 1,
+    ("POST", "/admin/jobs/{job_id}/cancel"): 2,
+    ("POST", "/admin/jobs/{job_id}/retry"): 2,
+    # Results
+    ("POST", "/admin/results"): 3,
+    ("GET", "/admin/results/{result_id}"): 1,
+    ("GET", "/admin/results/student/{student_identifier}"): 1,
+    ("GET", "/admin/results/class/{class_}"): 1,
+    ("PUT", "/admin/results/{result_id}"): 1,
+    ("DELETE", "/admin/results/{result_id}"): 1,
+    # PDFs
+    ("POST", "/pdfs/upload"): 2,
+    ("GET", "/pdfs"): 1,
+    ("GET", "/pdfs/admin/all"): 1,
+    ("GET", "/pdfs/download/{filename}"): 0,
+    ("GET", "/pdfs/{pdf_id}"): 1,
+    ("PUT", "/pdfs/{pdf_id}"): 1,
+    ("DELETE", "/pdfs/{pdf_id}"): 1,
+    # Student portal
+    ("GET", "/student/me"): 1,
+    ("GET", "/student/attendance"): 1,
+    ("GET", "/student/attendance/summary"): 3,
+    ("GET", "/student/fees"): 1,
+    ("GET", "/student/results"): 1,
+    ("GET", "/student/pdfs"): 1,
+    # Public
+    ("GET", "/public/pdfs"): 1,
+    ("GET", "/public/school-info"): 0,
+    ("GET", "/test/admin-only"): 0,
+    ("GET", "/test/student-only"): 0,
+    ("GET", "/health"): 0,
+    ("GET", "/ready"): 0,
+}
+
+
+def _configure_environment(database_url: str) -> None:
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "query-budgets")
+
+
+def _seed(SessionLocal) -> Dict[str, object]:
+    from decimal import Decimal
+
+    from sqlalchemy import insert
+
+    from app.models import Student
+    from app.services.fees import assign_fees_bulk
+
+    db = SessionLocal()
+    try:
+        db.execute(insert(Student), [
+            {
+                "student_id": f"STU5{roll:03d}",
+                "name": f"Student {roll}",
+                "class_": 5,
+                "dob": date(2013, 1, 1),
+                "aadhaar_number": f"5{roll:011d}",
+                "father_name": "Parent",
+                "phone": f"98{roll:08d}",
+            }
+            for roll in range(1, CLASS_SIZE + 1)
+        ])
+        db.commit()
+        student_ids = [row.id for row in db.query(Student.id).order_by(Student.id).all()]
+        assign_fees_bulk(db, Decimal("1500.00"), "2025-T1", class_=5)
+    finally:
+        db.close()
+
+    return {"student_ids": student_ids}
+
+
+async def _run_routes(app, engine, seed) -> List[dict]:
+    from app.core.query_counter import QueryCounter
+    from benchmarks.asgi_client import running_app
+
+    student_ids = seed["student_ids"]
+    first_id = student_ids[0]
+    marks = {
+        subject: 70
+        for subject in (
+            "HINDI", "ENGLISH", "MATHS", "SCIENCE",
+            "SOCIAL_STUDIES", "PHYSICAL_EDUCATION", "ART",
+        )
+    }
+    today = date.today().isoformat()
+    measurements = []
+
+    async with running_app(app) as client:
+        async def call(method, template, path, expected=(200, 201, 204), token=None, **kwargs):
+            headers = {"Authorization": f"Bearer {token}"} if token else None
+            with QueryCounter(engine, f"{method} {template}") as counter:
+                response = await client.request(method, path, headers=headers, **kwargs)
+            if response.status_code not in expected:
+                raise RuntimeError(
+                    f"{method} {path} returned {response.status_code}: {response.body[:300]!r}"
+                )
+            measurements.append({
+                "method": method,
+                "route": template,
+                "statements": counter.count,
+                "n_plus_one": counter.n_plus_one_candidates(N_PLUS_ONE_THRESHOLD),
+            })
+            return response
+
+        admin = (await call(
+            "POST", "/auth/admin/login", "/auth/admin/login",
+            json_body={"username": "admin", "password": "Admin@123"}
+        )).json()["access_token"]
+        student = (await call(
+            "POST", "/auth/student/login", "/auth/student/login",
+            json_body={"student_id": "STU5001", "dob": "2013-01-01"}
+        )).json()["access_token"]
+
+        # Students
+        created = (await call(
+            "POST", "/admin/students", "/admin/students", token=admin,
+            json_body={
+                "name": "Budget Student", "class": 5, "dob": "2013-02-02",
+                "aadhaar_number": "999999999999",
+            }
+        )).json()
+        await call("GET", "/admin/students", "/admin/students", token=admin)
+        await call("GET", "/admin/students/{student_id}", f"/admin/students/{first_id}", token=admin)
+        await call("GET", "/admin/students/class/{class_}", "/admin/students/class/5", token=admin)
+        await call(
+            "PUT", "/admin/students/{student_id}", f"/admin/students/{created['id']}",
+            token=admin, json_body={"phone": "9000000000"}
+        )
+        await call("GET", "/admin/students/search", "/admin/students/search", token=admin,
+                   params={"q": "budget stu"})
+
+        # Attendance
+        await call(
+            "GET", "/admin/attendance/students/{class_}/{date}",
+            f"/admin/attendance/students/5/{today}", token=admin
+        )
+        attendance_payload = {
+            "class": 5,
+            "date": today,
+            "attendances": [
+                {"student_id": student_id, "status": "PRESENT"} for student_id in student_ids
+            ],
+        }
+        await call("POST", "/admin/attendance/mark", "/admin/attendance/mark",
+                   token=admin, json_body=attendance_payload)
+        # Second submission for the same day exercises the update path
+        await call("POST", "/admin/attendance/mark", "/admin/attendance/mark",
+                   token=admin, json_body=attendance_payload)
+        await call(
+            "GET", "/admin/attendance/student/{student_identifier}",
+            "/admin/attendance/student/STU5001", token=admin
+        )
+        await call(
+            "GET", "/admin/attendance/summary/{student_identifier}",
+            "/admin/attendance/summary/STU5001", token=admin
+        )
+        await call(
+            "GET", "/admin/attendance/monthly/{student_identifier}",
+            "/admin/attendance/monthly/STU5001", token=admin
+        )
+        await call(
+            "GET", "/admin/attendance/monthly/class/{class_}/{year}/{month}",
+            f"/admin/attendance/monthly/class/5/{date.today().year}/{date.today().month}", token=admin
+        )
+
+        # School calendar
+        holidays = (await call(
+            "POST", "/admin/calendar", "/admin/calendar", token=admin,
+            json_body={"date": "2025-12-24", "end_date": "2025-12-31",
+                       "day_type": "HOLIDAY", "title": "Winter break"}
+        )).json()
+        await call("GET", "/admin/calendar", "/admin/calendar", token=admin, params={"class": 5})
+        await call("GET", "/admin/calendar/working-days", "/admin/calendar/working-days", token=admin,
+                   params={"start": "2025-12-01", "end": "2025-12-31", "class": 5})
+        await call("DELETE", "/admin/calendar/{day_id}", f"/admin/calendar/{holidays[0]['id']}", token=admin)
+
+        # Academic sessions
+        past_session = (await call(
+            "POST", "/admin/sessions", "/admin/sessions", token=admin,
+            json_body={"start_year": date.today().year - 5}, expected=(201,)
+        )).json()
+        await call("GET", "/admin/sessions", "/admin/sessions", token=admin)
+        await call("POST", "/admin/sessions/cold-archive", "/admin/sessions/cold-archive", token=admin,
+                   json_body={"before": f"{date.today().year - 3}-01-01", "dry_run": True})
+        await call("POST", "/admin/sessions/{session_id}/archive",
+                   f"/admin/sessions/{past_session['id']}/archive", token=admin)
+
+        # Fees
+        fee = (await call(
+            "POST", "/admin/fees", "/admin/fees", token=admin,
+            json_body={"student_id": first_id, "amount": 2000, "paid_amount": 500}
+        )).json()
+        await call("POST", "/admin/fees/bulk", "/admin/fees/bulk", token=admin,
+                   json_body={"amount": 300, "term_key": "2025-SPORTS", "class": 5})
+        await call("GET", "/admin/fees/student/{student_identifier}",
+                   "/admin/fees/student/STU5002", token=admin)
+        await call("GET", "/admin/fees/balance/{student_id}",
+                   f"/admin/fees/balance/{first_id}", token=admin)
+        await call("GET", "/admin/fees/defaulters", "/admin/fees/defaulters", token=admin)
+        await call("GET", "/admin/fees/payments/{student_id}",
+                   f"/admin/fees/payments/{first_id}", token=admin)
+        await call("GET", "/admin/fees/{fee_id}", f"/admin/fees/{fee['id']}", token=admin)
+        await call("PUT", "/admin/fees/{fee_id}", f"/admin/fees/{fee['id']}",
+                   token=admin, json_body={"paid_amount": 1500})
+
+        # Results
+        for student_id in student_ids[:3]:
+            await call("POST", "/admin/results", "/admin/results", token=admin, json_body={
+                "student_id": student_id, "student_class": 5,
+                "exam_type": "Final", "marks": marks,
+            })
+        class_results = (await call(
+            "GET", "/admin/results/class/{class_}", "/admin/results/class/5", token=admin
+        )).json()
+        result_id = class_results[0]["id"]
+        await call("GET", "/admin/results/{result_id}", f"/admin/results/{result_id}", token=admin)
+        await call("GET", "/admin/results/student/{student_identifier}",
+                   "/admin/results/student/STU5001", token=admin)
+        await call("PUT", "/admin/results/{result_id}", f"/admin/results/{result_id}",
+                   token=admin, json_body={"marks": 88})
+
+        # PDFs
+        pdf = (await call(
+            "POST", "/pdfs/upload", "/pdfs/upload", token=admin,
+            data={"title": "Budget Circular", "category": "CIRCULAR", "is_public": "true"},
+            files={"file": ("circular.pdf", b"%PDF-1.4 budget", "application/pdf")},
+        )).json()
+        await call("GET", "/pdfs", "/pdfs")
+        await call("GET", "/pdfs/admin/all", "/pdfs/admin/all", token=admin)
+        await call("GET", "/pdfs/{pdf_id}", f"/pdfs/{pdf['id']}")
+        await call("PUT", "/pdfs/{pdf_id}", f"/pdfs/{pdf['id']}", token=admin,
+                   json_body={"title": "Budget Circular (revised)"})
+        await call("GET", "/pdfs/download/{filename}", "/pdfs/download/missing.pdf",
+                   expected=(404,))
+
+        # Dashboard, student portal and public pages
+        await call("GET", "/admin/dashboard/summary", "/admin/dashboard/summary", token=admin)
+        job = (await call("POST", "/admin/jobs", "/admin/jobs", token=admin,
+                          json_body={"job_type": "dashboard.get_admin_dashboard_summary"},
+                          expected=(202,))).json()
+        await call("GET", "/admin/jobs", "/admin/jobs", token=admin)
+        await call("GET", "/admin/jobs/types", "/admin/jobs/types", token=admin)
+        await call("GET", "/admin/jobs/{job_id}", f"/admin/jobs/{job['id']}", token=admin)
+        await call("POST", "/admin/jobs/{job_id}/cancel", f"/admin/jobs/{job['id']}/cancel", token=admin)
+        await call("POST", "/admin/jobs/{job_id}/retry", f"/admin/jobs/{job['id']}/retry", token=admin)
+        for path in ("/student/me", "/student/attendance", "/student/attendance/summary", "/student/fees",
+                     "/student/results", "/student/pdfs"):
+            await call("GET", path, path, token=student)
+        await call("GET", "/public/pdfs", "/public/pdfs")
+        await call("GET", "/public/school-info", "/public/school-info")
+        await call("GET", "/test/admin-only", "/test/admin-only", token=admin)
+        await call("GET", "/test/student-only", "/test/student-only", token=student)
+        await call("GET", "/health", "/health")
+        await call("GET", "/ready", "/ready")
+
+        # Deletes last
+        await call("DELETE", "/pdfs/{pdf_id}", f"/pdfs/{pdf['id']}", token=admin)
+        await call("DELETE", "/admin/results/{result_id}", f"/admin/results/{result_id}", token=admin)
+        await call("DELETE", "/admin/fees/{fee_id}", f"/admin/fees/{fee['id']}", token=admin)
+        await call("DELETE", "/admin/students/{student_id}",
+                   f"/admin/students/{student_ids[-1]}", token=admin)
+        await call("POST", "/admin/students/withdraw", "/admin/students/withdraw", token=admin,
+                   json_body={"student_ids": student_ids[-3:-1]})
+        await call("POST", "/admin/students/promote", "/admin/students/promote", token=admin,
+                   json_body={"detained_ids": student_ids[:2], "reissue_student_ids": True})
+
+    return measurements
+
+
+def _registered_routes(app) -> List[Tuple[str, str]]:
+    from fastapi.routing import APIRoute
+
+    routes = []
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.include_in_schema:
+            for method in sorted(route.methods):
+                routes.append((method, route.path))
+    return routes
+
+
+def check(database_url: str) -> dict:
+    """Run every route once and compare statement counts with BUDGETS."""
+    _configure_environment(database_url)
+
+    from app.core.database import SessionLocal, engine
+    from app.main import app
+    from app.services import pdfs
+
+    async def run():
+        # Startup creates the schema; seed inside the running app
+        from benchmarks.asgi_client import running_app
+        async with running_app(app):
+            seed = _seed(SessionLocal)
+        return await _run_routes(app, engine, seed)
+
+    # Uploads go to a scratch directory too, so a failed run leaves no
+    # files in the working tree
+    uploads_dir = pdfs.UPLOADS_DIR
+    with tempfile.TemporaryDirectory(prefix="query_budgets_") as scratch:
+        pdfs.UPLOADS_DIR = Path(scratch) / "uploads"
+        pdfs.UPLOADS_DIR.mkdir()
+        try:
+            measurements = asyncio.run(run())
+        finally:
+            pdfs.UPLOADS_DIR = uploads_dir
+
+    failures = []
+    worst: Dict[Tuple[str, str], int] = {}
+    for measurement in measurements:
+        key = (measurement["method"], measurement["route"])
+        worst[key] = max(worst.get(key, 0), measurement["statements"])
+        budget = BUDGETS.get(key)
+        if budget is not None and measurement["statements"] > budget:
+            failures.append(
+                f"{key[0]} {key[1]}: {measurement['statements']} statements (budget {budget})"
+            )
+        for shape, executions in measurement["n_plus_one"]:
+            failures.append(f"{key[0]} {key[1]}: possible N+1 ({executions}x) {shape}")
+
+    for key in _registered_routes(app):
+        if key not in BUDGETS:
+            failures.append(f"{key[0]} {key[1]}: no query budget defined")
+        elif key not in worst:
+            failures.append(f"{key[0]} {key[1]}: budget defined but route not exercised")
+
+    return {
+        "class_size": CLASS_SIZE,
+        "routes": [
+            {"method": method, "route": route, "statements": count, "budget": BUDGETS.get((method, route))}
+            for (method, route), count in sorted(worst.items(), key=lambda item: (item[0][1], item[0][0]))
+        ],
+        "failures": failures,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        scratch.close()
+        database_url = f"sqlite:///{scratch.name}"
+
+    report = check(database_url)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for route in report["routes"]:
+            print(f"{route['statements']:>4} / {route['budget'] or '-':>3}  {route['method']:<6} {route['route']}")
+        for failure in report["failures"]:
+            print(f"FAIL {failure}")
+
+    sys.exit(1 if report["failures"] else 0)
+
+
+if __name__ == "__main__":
+    main()
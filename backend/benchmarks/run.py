@@ -0,0 +1,207 @@
+"""Reproducible benchmark runner.
+
+Generates a synthetic school (see ``benchmarks.datagen``), starts the app
+in-process and times each scenario in ``benchmarks.scenarios``. Results
+are written as JSON together with the commit, database dialect and data
+set parameters, so runs can be compared across commits.
+
+Usage:
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --database-url postgresql://localhost/sms_bench --reset \\
+        --classes 10 --students 40 --years 3 --output pg.json --baseline before.json
+
+Against PostgreSQL the target database is emptied only with ``--reset``;
+use a dedicated database.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+
+def _configure_environment(database_url: str) -> None:
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _percentile(samples: List[float], percentile: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(percentile / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _summarize(samples: List[float], statements: List[int]) -> Dict[str, float]:
+    to_ms = 1000.0
+    return {
+        "iterations": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * to_ms, 3),
+        "p50_ms": round(_percentile(samples, 50) * to_ms, 3),
+        "p95_ms": round(_percentile(samples, 95) * to_ms, 3),
+        "p99_ms": round(_percentile(samples, 99) * to_ms, 3),
+        "min_ms": round(min(samples) * to_ms, 3),
+        "max_ms": round(max(samples) * to_ms, 3),
+        "statements_per_iteration": round(statistics.fmean(statements), 2),
+    }
+
+
+async def _run(args, spec) -> dict:
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.query_counter import QueryCounter
+    from app.main import app
+    from app.models import Student
+    from benchmarks.asgi_client import running_app
+    from benchmarks.datagen import generate_school
+    from benchmarks.scenarios import SCENARIOS, ScenarioContext
+
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "dialect": engine.dialect.name,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "spec": spec.to_dict(),
+            "warmup": args.warmup,
+        },
+        "scenarios": {},
+    }
+
+    async with running_app(app) as client:
+        db = SessionLocal()
+        try:
+            started = time.perf_counter()
+            report["rows"] = generate_school(db, spec)
+            report["generation_seconds"] = round(time.perf_counter() - started, 3)
+
+            logins = {}
+            for class_ in range(1, spec.classes + 1):
+                student = db.query(Student).filter(Student.class_ == class_).order_by(Student.id).first()
+                logins[class_] = (student.student_id, student.dob.isoformat())
+        finally:
+            db.close()
+
+        admin_token = (await client.post(
+            "/auth/admin/login", {"username": "admin", "password": "Admin@123"}
+        )).json()["access_token"]
+        student_tokens = []
+        for student_id, dob in logins.values():
+            student_tokens.append((await client.post(
+                "/auth/student/login", {"student_id": student_id, "dob": dob}
+            )).json()["access_token"])
+
+        ctx = ScenarioContext(
+            client=client,
+            admin_token=admin_token,
+            student_tokens=student_tokens,
+            classes=spec.classes,
+            today=date.today(),
+            logins=logins,
+        )
+
+        selected = args.scenario or list(SCENARIOS)
+        for name in selected:
+            scenario = SCENARIOS[name]
+            for iteration in range(args.warmup):
+                ctx.iteration = iteration
+                await scenario(ctx)
+
+            samples: List[float] = []
+            statements: List[int] = []
+            for iteration in range(args.iterations):
+                ctx.iteration = iteration
+                with QueryCounter(engine) as counter:
+                    started = time.perf_counter()
+                    await scenario(ctx)
+                    samples.append(time.perf_counter() - started)
+                statements.append(counter.count)
+
+            report["scenarios"][name] = _summarize(samples, statements)
+
+    return report
+
+
+def _compare(report: dict, baseline_path: str) -> None:
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    report["baseline"] = {"commit": baseline["meta"].get("commit"), "path": baseline_path}
+    for name, current in report["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous and previous["p50_ms"]:
+            current["p50_change"] = round(current["p50_ms"] / previous["p50_ms"], 3)
+
+
+def main() -> None:
+    from benchmarks.scenarios import SCENARIOS  # noqa: F401  (validates names early)
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=None, help="Defaults to a scratch SQLite file")
+    parser.add_argument("--reset", action="store_true", help="Drop all tables before generating")
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--students", type=int, default=40, help="Students per class")
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--pdfs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Run only this scenario (repeatable)")
+    parser.add_argument("--output", default=None, help="Write JSON here instead of stdout")
+    parser.add_argument("--baseline", default=None, help="Earlier JSON output to compare with")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        scratch.close()
+        database_url = f"sqlite:///{scratch.name}"
+    _configure_environment(database_url)
+
+    from benchmarks.datagen import SchoolSpec
+
+    spec = SchoolSpec(
+        classes=args.classes,
+        students_per_class=args.students,
+        years=args.years,
+        pdfs=args.pdfs,
+        seed=args.seed,
+    )
+    report = asyncio.run(_run(args, spec))
+
+    if args.baseline:
+        _compare(report, args.baseline)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+
+    if not report["scenarios"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark scenarios driven through the ASGI app.
+
+Each scenario is an async callable taking a ``ScenarioContext`` and
+performing one iteration of a user-visible operation (one or more
+requests). The runner times iterations and counts SQL statements.
+"""
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from benchmarks.asgi_client import AsgiClient
+
+
+@dataclass
+class ScenarioContext:
+    """State shared by scenarios during a run."""
+    client: AsgiClient
+    admin_token: str
+    student_tokens: List[str]
+    classes: int
+    today: date
+    iteration: int = 0
+    # class -> (student_id string, dob) of a student who can log in
+    logins: Dict[int, Tuple[str, str]] = field(default_factory=dict)
+
+    def admin(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.admin_token}"}
+
+    def student(self) -> Dict[str, str]:
+        token = self.student_tokens[self.iteration % len(self.student_tokens)]
+        return {"Authorization": f"Bearer {token}"}
+
+    def class_for_iteration(self) -> int:
+        return self.iteration % self.classes + 1
+
+
+async def _expect(response, *statuses):
+    if response.status_code not in statuses:
+        raise RuntimeError(f"Unexpected {response.status_code}: {response.body[:300]!r}")
+    return response
+
+
+async def admin_login(ctx: ScenarioContext) -> None:
+    await _expect(await ctx.client.post(
+        "/auth/admin/login", {"username": "admin", "password": "Admin@123"}
+    ), 200)
+
+
+async def student_login(ctx: ScenarioContext) -> None:
+    student_id, dob = ctx.logins[ctx.class_for_iteration()]
+    await _expect(await ctx.client.post(
+        "/auth/student/login", {"student_id": student_id, "dob": dob}
+    ), 200)
+
+
+async def attendance_marking(ctx: ScenarioContext) -> None:
+    """Load a class roster, then submit the whole class."""
+    class_ = ctx.class_for_iteration()
+    roster = (await _expect(await ctx.client.get(
+        f"/admin/attendance/students/{class_}/{ctx.today.isoformat()}", headers=ctx.admin()
+    ), 200)).json()
+    await _expect(await ctx.client.post(
+        "/admin/attendance/mark",
+        {
+            "class": class_,
+            "date": ctx.today.isoformat(),
+            "attendances": [
+                {"student_id": student["id"], "status": "PRESENT" if i % 10 else "ABSENT"}
+                for i, student in enumerate(roster)
+            ],
+        },
+        headers=ctx.admin(),
+    ), 201)
+
+
+async def class_results(ctx: ScenarioContext) -> None:
+    await _expect(await ctx.client.get(
+        f"/admin/results/class/{ctx.class_for_iteration()}", headers=ctx.admin()
+    ), 200)
+
+
+async def dashboard_summary(ctx: ScenarioContext) -> None:
+    await _expect(await ctx.client.get("/admin/dashboard/summary", headers=ctx.admin()), 200)
+
+
+async def student_portal(ctx: ScenarioContext) -> None:
+    """The pages a student opens after logging in."""
+    headers = ctx.student()
+    for path in ("/student/me", "/student/attendance", "/student/fees", "/student/results"):
+        await _expect(await ctx.client.get(path, headers=headers), 200)
+
+
+async def pdf_listing(ctx: ScenarioContext) -> None:
+    await _expect(await ctx.client.get("/public/pdfs"), 200)
+
+
+SCENARIOS: Dict[str, Callable[[ScenarioContext], Awaitable[None]]] = {
+    "admin_login": admin_login,
+    "student_login": student_login,
+    "attendance_marking": attendance_marking,
+    "class_results": class_results,
+    "dashboard_summary": dashboard_summary,
+    "student_portal": student_portal,
+    "pdf_listing": pdf_listing,
+}
@@ -0,0 +1,146 @@
+"""Per-function SQL statement budgets for the update and delete write paths.
+
+Calls each ``update_*``/``delete_*`` service function on a seeded scratch
+database and counts the statements it issues, including serializing the
+returned object through its response schema (which would trigger a
+refresh if the commit had expired it). A missing ID must cost a single
+statement and keep the None/False result the routes turn into a 404.
+Exits non-zero when a function exceeds its budget.
+
+Budgets are for SQLite. On PostgreSQL ``update_fee`` and
+``update_student`` need one statement less, because the previous values
+come back from the same ``UPDATE ... RETURNING``.
+
+Usage:
+    python -m benchmarks.write_budgets [--database-url sqlite:///writes.db] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from decimal import Decimal
+from typing import Callable, Dict, List
+
+# Function -> maximum statements for an existing row
+BUDGETS: Dict[str, int] = {
+    # SELECT previous paid, UPDATE ... RETURNING, ledger INSERT, balance UPDATE
+    "fees.update_fee": 4,
+    # DELETE ... RETURNING, ledger INSERT, balance UPDATE
+    "fees.delete_fee": 3,
+    "results.update_result": 1,
+    "results.delete_result": 1,
+    "pdfs.update_pdf": 1,
+    "pdfs.delete_pdf": 1,
+    # SELECT previous class/student_id, UPDATE ... RETURNING
+    "students.update_student": 2,
+}
+MISSING_ID = 10 ** 9
+
+
+def _configure_environment(database_url: str) -> None:
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "write-budgets")
+
+
+def check(database_url: str) -> dict:
+    """Run every write path once for an existing and a missing row."""
+    _configure_environment(database_url)
+
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.query_counter import QueryCounter
+    from app.models import PDF, Result, Student
+    from app.schemas.fee import FeeResponse
+    from app.schemas.pdf import PdfResponse
+    from app.schemas.result import ResultResponse
+    from app.schemas.student import StudentResponse
+    from app.services import fees, pdfs, results, students
+    from benchmarks.datagen import SchoolSpec, generate_school
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        generate_school(db, SchoolSpec(classes=1, students_per_class=5))
+        student_id = db.query(Student.id).order_by(Student.id).first().id
+        fee_id = fees.create_fee(db, student_id, Decimal("1500.00"), Decimal("500.00")).id
+        result_id = db.query(Result.id).order_by(Result.id).first().id
+        pdf_id = db.query(PDF.id).order_by(PDF.id).first().id
+        db.expire_all()
+
+        def serialized(schema) -> Callable[[object], object]:
+            return lambda value: schema.model_validate(value).model_dump()
+
+        cases = [
+            ("fees.update_fee", lambda pk: fees.update_fee(db, pk, paid_amount=Decimal("900.00"), remark="Second instalment"),
+             fee_id, serialized(FeeResponse)),
+            ("results.update_result", lambda pk: results.update_result(db, pk, 88.5),
+             result_id, serialized(ResultResponse)),
+            ("pdfs.update_pdf", lambda pk: pdfs.update_pdf(db, pk, title="Revised circular"),
+             pdf_id, serialized(PdfResponse)),
+            ("students.update_student", lambda pk: students.update_student(db, pk, {"phone": "9800000000"}),
+             student_id, serialized(StudentResponse)),
+            ("fees.delete_fee", lambda pk: fees.delete_fee(db, pk), fee_id, None),
+            ("results.delete_result", lambda pk: results.delete_result(db, pk), result_id, None),
+            ("pdfs.delete_pdf", lambda pk: pdfs.delete_pdf(db, pk), pdf_id, None),
+        ]
+
+        measurements: List[dict] = []
+        failures: List[str] = []
+        for name, call, pk, serialize in cases:
+            with QueryCounter(engine, label=name) as counter:
+                value = call(pk)
+                if serialize is not None and value:
+                    serialize(value)
+            with QueryCounter(engine, label=f"{name} (missing)") as missing_counter:
+                missing = call(MISSING_ID)
+
+            measurements.append({
+                "function": name,
+                "statements": counter.count,
+                "missing_statements": missing_counter.count,
+                "budget": BUDGETS[name],
+            })
+            if not value:
+                failures.append(f"{name}: returned {value!r} for an existing row")
+            if missing not in (None, False):
+                failures.append(f"{name}: returned {missing!r} for a missing row")
+            if counter.count > BUDGETS[name]:
+                failures.append(f"{name}: {counter.count} statements (budget {BUDGETS[name]})")
+            if missing_counter.count > 1:
+                failures.append(f"{name}: {missing_counter.count} statements for a missing row (budget 1)")
+    finally:
+        db.close()
+
+    return {"dialect": engine.dialect.name, "functions": measurements, "failures": failures}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        scratch.close()
+        database_url = f"sqlite:///{scratch.name}"
+
+    report = check(database_url)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for function in report["functions"]:
+            print(
+                f"{function['statements']:>4} / {function['budget']:>3}  "
+                f"(missing: {function['missing_statements']})  {function['function']}"
+            )
+        for failure in report["failures"]:
+            print(f"FAIL {failure}")
+
+    sys.exit(1 if report["failures"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Gunicorn settings for running several Uvicorn workers.
+
+Usage (from the backend directory):
+    gunicorn app.main:app -c gunicorn.conf.py
+
+``WEB_CONCURRENCY`` sets the number of workers. The database is prepared
+once in the master after the port is bound and before any worker starts,
+so workers don't race each other through ``create_all`` and the startup
+migrations. With ``LIGHTWEIGHT_BOOT`` the master leaves it to the workers'
+background boot (they take turns on a database lock) so that ``/health``
+answers as soon as they are up. Set ``CACHE_URL``
+to a Redis-compatible server so cache invalidations reach every worker;
+without it, caching is disabled when more than one worker runs (see
+``app.core.cache``).
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+accesslog = "-"
+
+
+def on_starting(server):
+    # Runs before the port is bound: keep it cheap. Caches are created when
+    # the services are imported; make sure they see the real worker count,
+    # including a -w override.
+    os.environ["WEB_CONCURRENCY"] = str(server.cfg.workers)
+
+
+def when_ready(server):
+    # Runs once the port is bound and before any worker is forked, so the
+    # host sees the service listening while the database is prepared.
+    from app.core.config import settings
+
+    if settings.LIGHTWEIGHT_BOOT or not settings.DATABASE_INIT_ON_STARTUP:
+        return
+
+    from app.core.database import engine
+    from app.main import _initialize_database
+
+    _initialize_database()
+    settings.DATABASE_INIT_ON_STARTUP = False
+    # Forked workers must open their own connections.
+    engine.dispose()
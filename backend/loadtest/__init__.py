@@ -0,0 +1,5 @@
+"""Load-test scenarios for capacity planning.
+
+See ``loadtest/locustfile.py`` and the "Load Testing" section of the
+README.
+"""
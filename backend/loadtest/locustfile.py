@@ -0,0 +1,275 @@
+"""Locust load-test scenarios modelling a school day.
+
+Four kinds of users drive the real API routes with think times taken from
+how the school actually uses the app:
+
+- ``TeacherUser``: opens a class roster, takes the register, submits it.
+- ``StudentUser``: logs in with student ID and date of birth, then browses
+  results, attendance, fees and the profile page.
+- ``ParentCircularUser``: checks the public notice board and downloads a
+  notice.
+- ``AdminDeskUser``: office desk work: fee lookups, balances, defaulters
+  and the dashboard.
+
+Requests are named by route template (``/admin/fees/student/{id}``) so
+locust reports throughput and latency percentiles per endpoint rather
+than per URL.
+
+Without ``LOADTEST_PROFILE`` the usual ``-u``/``-r`` options run a mix of
+all four users by weight. Setting ``LOADTEST_PROFILE`` to one of
+``PROFILES`` replays that traffic shape instead, scaled by
+``LOADTEST_SCALE`` (default 1.0):
+
+- ``morning_attendance``: every class teacher marking between 8 and 9am.
+- ``result_day``: a student login storm when results are published.
+- ``circular_burst``: parents fetching a notice right after an announcement.
+
+Usage (seed first with ``python -m loadtest.seed``, then start uvicorn):
+    LOADTEST_PROFILE=result_day locust -f loadtest/locustfile.py \\
+        --host http://localhost:8000 --headless --csv reports/result_day
+"""
+import math
+import os
+import random
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from gevent.lock import Semaphore
+from locust import HttpUser, LoadTestShape, between, task
+
+ADMIN_USERNAME = os.getenv("LOADTEST_ADMIN_USERNAME", "admin")
+ADMIN_PASSWORD = os.getenv("LOADTEST_ADMIN_PASSWORD", "Admin@123")
+PROFILE = os.getenv("LOADTEST_PROFILE", "")
+SCALE = float(os.getenv("LOADTEST_SCALE", "1.0"))
+
+
+class _School:
+    """Students known to the server, fetched once per locust process."""
+
+    def __init__(self) -> None:
+        self._lock = Semaphore()
+        self.students: List[dict] = []
+        self.classes: List[int] = []
+
+    def load(self, client) -> None:
+        with self._lock:
+            if self.students:
+                return
+            headers = _admin_login(client)
+            response = client.get("/admin/students", headers=headers, name="/admin/students")
+            response.raise_for_status()
+            self.students = response.json()
+            self.classes = sorted({student["class"] for student in self.students})
+            if not self.students:
+                raise RuntimeError("No students on the server; run python -m loadtest.seed first")
+
+    def random_student(self) -> dict:
+        return random.choice(self.students)
+
+
+def _bearer(response) -> Dict[str, str]:
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _admin_login(client) -> Dict[str, str]:
+    return _bearer(client.post(
+        "/auth/admin/login",
+        json={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD},
+        name="/auth/admin/login",
+    ))
+
+
+school = _School()
+
+
+class AdminSession(HttpUser):
+    """Base for users working through the admin login."""
+    abstract = True
+
+    def on_start(self) -> None:
+        self.headers = _admin_login(self.client)
+        school.load(self.client)
+
+
+class TeacherUser(AdminSession):
+    """A class teacher taking the morning register."""
+    weight = 1
+    wait_time = between(30, 90)
+
+    def on_start(self) -> None:
+        super().on_start()
+        self.class_ = random.choice(school.classes)
+
+    @task
+    def take_register(self) -> None:
+        today = date.today().isoformat()
+        with self.client.get(
+            f"/admin/attendance/students/{self.class_}/{today}",
+            headers=self.headers,
+            name="/admin/attendance/students/{class_}/{date}",
+            catch_response=True,
+        ) as response:
+            if response.status_code != 200:
+                response.failure(f"roster returned {response.status_code}")
+                return
+            roster = response.json()
+
+        # Calling out the register takes a couple of seconds per student.
+        time.sleep(min(120.0, len(roster) * random.uniform(0.5, 1.5)))
+
+        self.client.post(
+            "/admin/attendance/mark",
+            json={
+                "class": self.class_,
+                "date": today,
+                "attendances": [
+                    {
+                        "student_id": student["id"],
+                        "status": "ABSENT" if random.random() < 0.08 else "PRESENT",
+                    }
+                    for student in roster
+                ],
+            },
+            headers=self.headers,
+            name="/admin/attendance/mark",
+        )
+
+
+class StudentUser(HttpUser):
+    """A student (or parent on their behalf) using the portal."""
+    weight = 6
+    wait_time = between(3, 15)
+
+    def on_start(self) -> None:
+        school.load(self.client)
+        student = school.random_student()
+        self.headers = _bearer(self.client.post(
+            "/auth/student/login",
+            json={"student_id": student["student_id"], "dob": student["dob"]},
+            name="/auth/student/login",
+        ))
+
+    @task(5)
+    def results(self) -> None:
+        self.client.get("/student/results", headers=self.headers, name="/student/results")
+
+    @task(2)
+    def profile(self) -> None:
+        self.client.get("/student/me", headers=self.headers, name="/student/me")
+
+    @task(2)
+    def attendance(self) -> None:
+        self.client.get("/student/attendance", headers=self.headers, name="/student/attendance")
+
+    @task(1)
+    def fees(self) -> None:
+        self.client.get("/student/fees", headers=self.headers, name="/student/fees")
+
+
+class ParentCircularUser(HttpUser):
+    """A parent checking the notice board after an announcement."""
+    weight = 3
+    wait_time = between(10, 60)
+
+    @task
+    def read_latest_notice(self) -> None:
+        with self.client.get("/public/pdfs", name="/public/pdfs", catch_response=True) as response:
+            if response.status_code != 200:
+                response.failure(f"listing returned {response.status_code}")
+                return
+            notices = [
+                pdf for pdf in response.json()
+                if pdf["file_path"].startswith("uploads/notice/")
+            ]
+        if not notices:
+            return
+
+        time.sleep(random.uniform(2, 8))
+        # Most parents open one of the newest notices.
+        notices.sort(key=lambda pdf: pdf["upload_date"], reverse=True)
+        notice = random.choice(notices[:5])
+        self.client.get(
+            f"/pdfs/download/{notice['file_path'].rsplit('/', 1)[-1]}",
+            name="/pdfs/download/{filename}",
+        )
+
+
+class AdminDeskUser(AdminSession):
+    """Office staff handling fee queries at the front desk."""
+    weight = 1
+    wait_time = between(10, 40)
+
+    @task(4)
+    def fee_lookup(self) -> None:
+        student = school.random_student()
+        self.client.get(
+            f"/admin/fees/student/{student['student_id']}",
+            headers=self.headers,
+            name="/admin/fees/student/{student_identifier}",
+        )
+        self.client.get(
+            f"/admin/fees/balance/{student['id']}",
+            headers=self.headers,
+            name="/admin/fees/balance/{student_id}",
+        )
+
+    @task(2)
+    def dashboard(self) -> None:
+        self.client.get("/admin/dashboard/summary", headers=self.headers, name="/admin/dashboard/summary")
+
+    @task(1)
+    def defaulters(self) -> None:
+        self.client.get("/admin/fees/defaulters?limit=50", headers=self.headers, name="/admin/fees/defaulters")
+
+    @task(1)
+    def class_results(self) -> None:
+        class_ = random.choice(school.classes)
+        self.client.get(
+            f"/admin/results/class/{class_}",
+            headers=self.headers,
+            name="/admin/results/class/{class_}",
+        )
+
+
+# Stages as (duration seconds, users at scale 1.0, spawn rate per second, user classes).
+Stage = Tuple[int, int, float, List[type]]
+
+PROFILES: Dict[str, List[Stage]] = {
+    "morning_attendance": [
+        (120, 10, 0.2, [TeacherUser, AdminDeskUser]),
+        (900, 30, 0.5, [TeacherUser, AdminDeskUser]),
+        (1800, 30, 0.5, [TeacherUser, AdminDeskUser, StudentUser]),
+        (300, 5, 1.0, [AdminDeskUser, StudentUser]),
+    ],
+    "result_day": [
+        (60, 20, 2.0, [StudentUser, AdminDeskUser]),
+        (120, 400, 20.0, [StudentUser, AdminDeskUser]),
+        (600, 400, 20.0, [StudentUser, AdminDeskUser]),
+        (300, 100, 5.0, [StudentUser, AdminDeskUser]),
+    ],
+    "circular_burst": [
+        (60, 10, 1.0, [ParentCircularUser]),
+        (60, 300, 30.0, [ParentCircularUser, StudentUser]),
+        (300, 300, 30.0, [ParentCircularUser, StudentUser]),
+        (300, 50, 5.0, [ParentCircularUser, StudentUser]),
+    ],
+}
+
+
+if PROFILE:
+    if PROFILE not in PROFILES:
+        raise ValueError(f"Unknown LOADTEST_PROFILE {PROFILE!r}; choose from {sorted(PROFILES)}")
+
+    class SchoolDayShape(LoadTestShape):
+        """Replays the stages of ``LOADTEST_PROFILE``, then stops."""
+        stages = PROFILES[PROFILE]
+
+        def tick(self) -> Optional[Tuple[int, float, List[type]]]:
+            elapsed = self.get_run_time()
+            for duration, users, spawn_rate, user_classes in self.stages:
+                if elapsed < duration:
+                    return max(1, math.ceil(users * SCALE)), spawn_rate * max(SCALE, 0.1), user_classes
+                elapsed -= duration
+            return None
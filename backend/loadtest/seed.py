@@ -0,0 +1,87 @@
+"""Seed a database for load testing.
+
+Creates the schema and default admin the same way the app does on
+startup, generates a synthetic school with ``benchmarks.datagen`` and
+writes placeholder files for generated notices so the download route
+serves real files.
+
+Usage (from the backend directory, against the database uvicorn will use):
+    python -m loadtest.seed --database-url postgresql://localhost/sms_load --reset \\
+        --classes 10 --students 40 --years 1
+
+The target database is emptied only with ``--reset``; use a dedicated
+database.
+"""
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+
+PLACEHOLDER_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 595 842]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+async def _seed(args) -> dict:
+    from app.core.database import Base, SessionLocal, engine
+    from app.enums.pdf_enum import PdfCategory
+    from app.main import app
+    from app.models import PDF
+    from benchmarks.asgi_client import running_app
+    from benchmarks.datagen import SchoolSpec, generate_school
+
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+
+    spec = SchoolSpec(
+        classes=args.classes,
+        students_per_class=args.students,
+        years=args.years,
+        pdfs=args.pdfs,
+        seed=args.seed,
+    )
+    # Run the app lifespan once so tables, migrations and the admin exist.
+    async with running_app(app):
+        pass
+
+    db = SessionLocal()
+    try:
+        rows = generate_school(db, spec)
+        notice_paths = [
+            path for (path,) in db.query(PDF.file_path).filter(PDF.category == PdfCategory.NOTICE)
+        ]
+    finally:
+        db.close()
+
+    for path in notice_paths:
+        file_path = Path(path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        if not file_path.exists():
+            file_path.write_bytes(PLACEHOLDER_PDF)
+
+    return {"spec": spec.to_dict(), "rows": rows, "notice_files": len(notice_paths)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=None, help="Defaults to DATABASE_URL")
+    parser.add_argument("--reset", action="store_true", help="Drop all tables before generating")
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--students", type=int, default=40, help="Students per class")
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--pdfs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    print(json.dumps(asyncio.run(_seed(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()